@@ -2,19 +2,115 @@
 
 # Import required libraries
 import tkinter as tk  # Tkinter for GUI components
-from tkinter import messagebox  # Message boxes for feedback
-from PIL import Image, ImageTk  # For displaying images in Tkinter
 import random  # For generating random math questions
-from pygame import mixer  # For playing sound effects
+import csv  # Response time log
+import sys  # Optional --seed argument
+import os  # Asset cache files
+import tempfile  # Fallback cache folder when images/ is read-only
+import threading  # Guarding the sound table while it loads
+from concurrent.futures import ThreadPoolExecutor  # Background asset preloading
+from quiz_engine import DIFFICULTY, QuestionTimer, make_round  # Questions and the countdown (no Tk needed)
+# PIL and pygame are imported only when an asset is first made or a sound first loaded
+
+# ASSET MANAGER
+# Backgrounds are resized once with PIL and cached as PPM files (which Tk reads natively, with no decoding work),
+# keyed by the source file's mtime. Each screen's background is turned into a PhotoImage on first use, and the
+# next screen's is prepared in the background while the current one is showing.
+SCREEN_SIZE = (800, 600)  # Window and background size
+CACHE_DIR = "images/.cache"  # Resized backgrounds
+BACKGROUNDS = {  # Screen name -> source image
+    "start": "images/1.jpg",
+    "how": "images/2.jpg",
+    "difficulty": "images/3.jpg",
+    "quiz": "images/4.jpg",
+    "gameover": "images/5.jpg",
+}
+NEXT_SCREEN = {"start": "how", "how": "difficulty", "difficulty": "quiz", "quiz": "gameover", "gameover": "difficulty"}
+SOUNDS = {  # Sound name -> file
+    "correct": "sounds/correct.wav",  # Sound for correct answers
+    "wrong": "sounds/error.wav",  # Sound for wrong answers
+    "timeup": "sounds/timerup.wav",  # Sound when time is up
+    "click": "sounds/buttonclick.wav",  # Sound when buttons are clicked
+}
+
+preloader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="quiz-assets")  # Runs PIL and pygame work
+photos = {}  # Screen name -> PhotoImage (kept here so Tk does not drop them)
+pending = {}  # Screen name -> Future for its cached background file
+sounds = {}  # Sound name -> pygame Sound, filled in once the mixer is ready
+sound_lock = threading.Lock()
+
+
+def cached_background(path):  # Path of a resized copy of path, made with PIL if missing or stale (any thread)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    key = f"{stem}_{SCREEN_SIZE[0]}x{SCREEN_SIZE[1]}_{os.stat(path).st_mtime_ns}.ppm"  # New mtime, new file
+    for folder in (CACHE_DIR, os.path.join(tempfile.gettempdir(), "maths-quiz")):
+        if os.path.exists(os.path.join(folder, key)):
+            return os.path.join(folder, key)
+    from PIL import Image  # Only needed the first time (or after an image changes)
+    img = Image.open(path).convert("RGB").resize(SCREEN_SIZE)
+    for folder in (CACHE_DIR, os.path.join(tempfile.gettempdir(), "maths-quiz")):
+        target = os.path.join(folder, key)
+        try:
+            os.makedirs(folder, exist_ok=True)
+            img.save(target + ".tmp", "PPM")
+            os.replace(target + ".tmp", target)  # The lookup above only checks the name, so it must appear complete
+        except OSError:
+            continue  # images/.cache not writable: the temp folder is also searched on later runs
+        for old in os.listdir(folder):  # Drop copies made from older versions of the image
+            if old.startswith(stem + "_") and old.endswith(".ppm") and old != key:
+                try:
+                    os.remove(os.path.join(folder, old))
+                except OSError:
+                    pass
+        return target
+    raise OSError(f"could not cache a resized copy of {path}")
+
+
+def background(name):  # PhotoImage for a screen's background, made on first use (main thread)
+    photo = photos.get(name)
+    if photo is None:
+        future = pending.pop(name, None)
+        path = future.result() if future is not None else cached_background(BACKGROUNDS[name])
+        photo = photos[name] = tk.PhotoImage(file=path)
+    return photo
+
+
+def preload(name):  # Prepare a screen's background off the main thread, then adopt it when idle
+    if name in photos or name in pending:
+        return
+    pending[name] = preloader.submit(cached_background, BACKGROUNDS[name])
+    window.after(50, adopt, name)
+
+
+def adopt(name):  # Turn a finished preload into a PhotoImage while the player is looking at another screen
+    future = pending.get(name)
+    if future is None:
+        return  # Already used
+    if future.done():
+        background(name)
+    else:
+        window.after(50, adopt, name)
+
+
+def show_background(name):  # Draw a screen's background and start preparing the screen that usually follows
+    canvas.create_image(0, 0, image=background(name), anchor="nw")
+    preload(NEXT_SCREEN[name])
+
+
+def load_sounds():  # Start the mixer and load every effect (preload thread)
+    from pygame import mixer  # Importing pygame and opening the audio device is slow: keep it off startup
+    mixer.init()
+    loaded = {name: mixer.Sound(path) for name, path in SOUNDS.items()}
+    with sound_lock:
+        sounds.update(loaded)
 
-# SOUND SETUP
-mixer.init()  # Initialize pygame mixer to enable sound playback
 
-# Load sound effects from local folder
-correct_sound = mixer.Sound("sounds/correct.wav")  # Sound for correct answers
-wrong_sound = mixer.Sound("sounds/error.wav")  # Sound for wrong answers
-timeup_sound = mixer.Sound("sounds/timerup.wav")  # Sound when time is up
-click_sound = mixer.Sound("sounds/buttonclick.wav")  # Sound when buttons are clicked
+def play(name):  # Play a sound effect; silently skipped if the sounds are still loading
+    with sound_lock:
+        sound = sounds.get(name)
+    if sound is not None:
+        sound.play()
+
 
 # WINDOW SETUP
 window = tk.Tk()  # Create main Tkinter window
@@ -22,18 +118,18 @@ window.title("Math Quiz")  # Set window title
 window.geometry("800x600")  # Set fixed window size
 window.resizable(False, False)  # Disable resizing to keep layout fixed
 
-# LOAD BACKGROUND IMAGES
-# Loading images for different screens and resize them to fit window
-bg_start_photo = ImageTk.PhotoImage(Image.open("images/1.jpg").resize((800, 600)))
-bg_how_photo = ImageTk.PhotoImage(Image.open("images/2.jpg").resize((800, 600)))
-bg_difficulty_photo = ImageTk.PhotoImage(Image.open("images/3.jpg").resize((800, 600)))
-bg_quiz_photo = ImageTk.PhotoImage(Image.open("images/4.jpg").resize((800, 600)))
-gameover_bg_photo = ImageTk.PhotoImage(Image.open("images/5.jpg").resize((800, 600)))
-
 # CANVAS SETUP
 canvas = tk.Canvas(window, width=800, height=600, highlightthickness=0)  # Canvas for graphics
 canvas.pack(fill="both", expand=True)  # Fill entire window
-canvas.create_image(0, 0, image=bg_start_photo, anchor="nw")  # Display start screen background
+canvas.create_image(0, 0, image=background("start"), anchor="nw")  # Display start screen background
+
+
+def start_preloading():  # Once the start screen is up: sounds first, then the next screen's background
+    preloader.submit(load_sounds)
+    preload(NEXT_SCREEN["start"])
+
+
+window.after_idle(start_preloading)
 
 # BLINKING START TEXT
 press_text_id = canvas.create_text(
@@ -56,9 +152,9 @@ blink_text()  # Start blinking effect
 
 # HOW TO PLAY SCREEN
 def show_how_to_play():  # Function to show instructions
-    click_sound.play()  # Play button click sound
+    play("click")  # Play button click sound
     canvas.delete("all")  # Clear current canvas
-    canvas.create_image(0, 0, image=bg_how_photo, anchor="nw")  # Show background
+    show_background("how")  # Show background
 
     instructions = (  # Instruction text
         "1.  Choose your difficulty level.\n"
@@ -86,15 +182,15 @@ def show_how_to_play():  # Function to show instructions
         font=("Pixel Emulator", 18, "bold"),
         bg="#FFD93D",
         activebackground="#FFEA7A",
-        command=lambda: (click_sound.play(), show_difficulty_screen())  # On click, play sound and show difficulty screen
+        command=lambda: (play("click"), show_difficulty_screen())  # On click, play sound and show difficulty screen
     )
     canvas.create_window(400, 520, window=start_btn)  # Place button on canvas
 
 # DIFFICULTY SELECTION SCREEN
 def show_difficulty_screen():  # Function to show difficulty options
-    click_sound.play()  # Play click sound
+    play("click")  # Play click sound
     canvas.delete("all")  # Clear canvas
-    canvas.create_image(0, 0, image=bg_difficulty_photo, anchor="nw")  # Background
+    show_background("difficulty")  # Background
 
     # Display difficulty options as text
     canvas.create_text(210, 470, text="Easy", fill="black", font=("Pixel Emulator", 18, "bold"), tags="easy")
@@ -102,45 +198,163 @@ def show_difficulty_screen():  # Function to show difficulty options
     canvas.create_text(560, 470, text="Advanced", fill="black", font=("Pixel Emulator", 18, "bold"), tags="advanced")
 
     # Bind mouse clicks to start quiz at chosen difficulty
-    canvas.tag_bind("easy", "<Button-1>", lambda e: (click_sound.play(), start_quiz("Easy")))
-    canvas.tag_bind("moderate", "<Button-1>", lambda e: (click_sound.play(), start_quiz("Moderate")))
-    canvas.tag_bind("advanced", "<Button-1>", lambda e: (click_sound.play(), start_quiz("Advanced")))
+    canvas.tag_bind("easy", "<Button-1>", lambda e: (play("click"), start_quiz("Easy")))
+    canvas.tag_bind("moderate", "<Button-1>", lambda e: (play("click"), start_quiz("Moderate")))
+    canvas.tag_bind("advanced", "<Button-1>", lambda e: (play("click"), start_quiz("Advanced")))
+
+    # Fast mode toggle: next question straight after each answer
+    canvas.create_text(400, 540, text=fast_mode_label(), fill="black", font=("Pixel Emulator", 14), tags="fast")
+    canvas.tag_bind("fast", "<Button-1>", lambda e: (play("click"), toggle_fast_mode()))
+
+def fast_mode_label():
+    return f"Fast mode: {'ON' if fast_mode else 'OFF'}"
+
+def toggle_fast_mode():
+    global fast_mode
+    fast_mode = not fast_mode
+    canvas.itemconfigure("fast", text=fast_mode_label())
+
+# QUESTION ENGINE
+# Questions and the timer live in quiz_engine.py; this file only keeps the random source for the session.
+SEED = int(sys.argv[sys.argv.index("--seed") + 1]) if "--seed" in sys.argv[:-1] else None  # Same seed, same rounds
+rng = random.Random(SEED)  # Every question in the session comes from here
+
+
+# RESPONSE TIMES
+LATENCY_FILE = "quiz_latency.csv"  # Every answer's response time, appended after each round
+latencies = []  # (level, question number, question, outcome, seconds) for the current round
+
+def record_latency(outcome):  # Log how long the player took on the current question
+    latencies.append((quiz_level, question_number, current_question_text, outcome, round(timer.stop(), 3)))
+
+def save_latencies():  # Append the round's response times to LATENCY_FILE
+    if not latencies:
+        return
+    try:
+        new = not os.path.exists(LATENCY_FILE)
+        with open(LATENCY_FILE, "a", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            if new:
+                writer.writerow(["level", "question", "text", "outcome", "seconds"])
+            writer.writerows(latencies)
+    except OSError:
+        pass  # Read-only folder: the quiz itself still works
+    latencies.clear()
+
+
+# FEEDBACK OVERLAY
+# Answer results are drawn on the canvas and faded in and out with after() steps, so nothing ever blocks the
+# event loop. The next question follows on its own after FEEDBACK_DELAY, or at once in fast mode.
+FEEDBACK_COLOURS = {"correct": "#1B8A2E", "wrong": "#C62828", "skip": "#E07B00", "timeout": "#C62828"}
+FEEDBACK_SOUNDS = {"correct": "correct", "wrong": "wrong", "skip": "wrong", "timeout": "timeup"}
+FADE_FROM = (255, 255, 255)  # Colour the text fades in from and out to
+FADE_STEPS = 6  # Colour steps each way
+FADE_MS = 40  # Time between steps
+FEEDBACK_HOLD = 600  # Time fully shown before fading out
+FEEDBACK_DELAY = 900  # Pause before the next question, so the result can be read
+fast_mode = "--fast" in sys.argv  # Also toggled on the difficulty screen
+fade_ids = []  # Pending fade steps of the overlay on screen
+advance_id = None  # Pending move to the next question
+
+def fade_colour(colour, k):  # Colour k/FADE_STEPS of the way from FADE_FROM to colour
+    target = [int(colour[i:i + 2], 16) for i in (1, 3, 5)]
+    return "#" + "".join(f"{round(a + (b - a) * k / FADE_STEPS):02x}" for a, b in zip(FADE_FROM, target))
+
+def stop_feedback():  # Cancel any fade or pending question still scheduled
+    global advance_id
+    for after_id in fade_ids:
+        window.after_cancel(after_id)
+    fade_ids.clear()
+    if advance_id is not None:
+        window.after_cancel(advance_id)
+        advance_id = None
+
+def show_feedback(kind, message):  # Play the result's sound and fade its message in, hold it, then fade it out
+    stop_feedback()
+    play(FEEDBACK_SOUNDS[kind])
+    item = quiz_items["feedback"]
+    canvas.itemconfigure(item, text=message, fill=fade_colour(FEEDBACK_COLOURS[kind], 0), state="normal")
+    ramp = list(range(1, FADE_STEPS + 1))
+    for n, k in enumerate(ramp + ramp[::-1][1:] + [0]):  # Up to full colour and back down
+        delay = n * FADE_MS + (FEEDBACK_HOLD if n >= FADE_STEPS else 0)
+        fade_ids.append(window.after(delay, canvas.itemconfigure, item, {"fill": fade_colour(FEEDBACK_COLOURS[kind], k)}))
+    fade_ids.append(window.after(2 * FADE_STEPS * FADE_MS + FEEDBACK_HOLD, canvas.itemconfigure, item, {"state": "hidden"}))
+
+def answered(kind, message, level):  # Show the result and move on without waiting for a click
+    global advance_id
+    show_feedback(kind, message)
+    if fast_mode:
+        show_question(level)  # Overlay keeps fading over the next question
+    else:
+        advance_id = window.after(FEEDBACK_DELAY, next_question, level)
+
+def next_question(level):
+    global advance_id
+    advance_id = None
+    show_question(level)
+
 
 # QUIZ VARIABLES
+round_questions = []  # (question text, answer) for every question in the current round
 score = 0  # Player score
 lives = 3  # Number of lives
 question_number = 0  # Question counter
-timer_id = None  # Timer callback ID
-time_left = 15  # Seconds per question
 correct_answer = None  # Stores correct answer
 current_question_text = None  # Stores current question text for retry
 
-# GENERATE QUESTIONS FUNCTION
-def generate_question(level):  # Generate random math question
-    if level == "Easy":
-        a, b = random.randint(1, 10), random.randint(1, 10)
-    elif level == "Moderate":
-        a, b = random.randint(10, 50), random.randint(10, 50)
-    else:  # Advanced
-        a, b = random.randint(50, 100), random.randint(50, 100)
+# QUIZ SCREEN
+# Laid out once per round; each question only changes the text of these items and clears the answer box.
+quiz_items = {}  # Canvas item ids by role: score, lives, counter, question, timer
+answer_entry = None  # Answer input box, made on the first round and reused after that
+next_btn = None  # Next button, made on the first round and reused after that
+quiz_level = None  # Difficulty of the round being played
+
+def build_quiz_screen(level):  # Draw the quiz screen for a new round
+    global answer_entry, next_btn, quiz_level
+    quiz_level = level
+    canvas.delete("all")  # Clear canvas (widgets are only taken off it, not destroyed)
+    show_background("quiz")  # Background
+
+    if answer_entry is None:  # Widgets made once for the whole session
+        answer_entry = tk.Entry(window, font=("Pixel Emulator", 20), width=10, justify="center",
+                                bg="white", highlightthickness=2, highlightbackground="black",
+                                highlightcolor="black")
+        next_btn = tk.Button(window, text="Next ➜", font=("Pixel Emulator", 14, "bold"), bg="#FFD93D",
+                             command=lambda: (play("click"), check_answer(quiz_level, answer_entry.get())))
+
+    quiz_items["score"] = canvas.create_text(650, 40, text="", fill="black",
+                                             font=("Pixel Emulator", 18, "bold"), anchor="w")  # Score
+    quiz_items["lives"] = canvas.create_text(60, 40, text="", fill="red",
+                                             font=("Pixel Emulator", 18, "bold"), anchor="w")  # Lives as hearts
+    quiz_items["counter"] = canvas.create_text(400, 190, text="",
+                                               font=("Pixel Emulator", 20, "bold"), fill="black")  # Question counter
+    quiz_items["question"] = canvas.create_text(400, 260, text="",
+                                                font=("Pixel Emulator", 28, "bold"), fill="black")  # Question text
+    quiz_items["timer"] = canvas.create_text(400, 320, text="",
+                                             font=("Pixel Emulator", 16), fill="red")  # Timer
+    quiz_items["feedback"] = canvas.create_text(400, 525, text="", state="hidden",
+                                                font=("Pixel Emulator", 20, "bold"))  # Answer result overlay
+    canvas.create_window(400, 380, window=answer_entry)  # Answer input box
+    canvas.create_window(400, 450, window=next_btn)  # Next button
 
-    operation = random.choice(["+", "-"])  # Randomly select + or -
-    return f"{a} {operation} {b} = ?", eval(f"{a}{operation}{b}")  # Return question text and answer
+    # Bind Enter key to check answer
+    window.unbind("<Return>")
+    window.bind("<Return>", lambda event: check_answer(quiz_level, answer_entry.get()))
 
 # START QUIZ FUNCTION
 def start_quiz(level):  # Reset quiz variables and show first question
-    global score, lives, question_number
+    global score, lives, question_number, round_questions
     score = 0
     lives = 3
     question_number = 0
+    round_questions = make_round(level, rng)  # All questions up front: nothing to work out between them
+    stop_feedback()  # Nothing left over from the last round
+    build_quiz_screen(level)  # Screen is drawn once here, not for every question
     show_question(level)  # Display first question
 
 # SHOW QUESTION FUNCTION
 def show_question(level):
-    global question_number, correct_answer, time_left, timer_id, current_question_text
-
-    canvas.delete("all")  # Clear canvas
-    canvas.create_image(0, 0, image=bg_quiz_photo, anchor="nw")  # Background
+    global question_number, correct_answer, current_question_text
 
     # Retry logic: reuse question if retry flagged
     if (hasattr(check_answer, "retry_flag") and check_answer.retry_flag) or \
@@ -148,119 +362,98 @@ def show_question(level):
         q_text = current_question_text  # Reuse question
     else:
         question_number += 1  # Increment question counter
-        if question_number > 10 or lives <= 0:  # End quiz if limit reached
+        if question_number > len(round_questions) or lives <= 0:  # End quiz if limit reached
             show_result()
             return
-        q_text, correct_answer = generate_question(level)  # Generate new question
+        q_text, correct_answer = round_questions[question_number - 1]  # Next pregenerated question
         current_question_text = q_text
 
-    # Display score
-    canvas.create_text(650, 40, text=f"Score: {score}", fill="black",
-                       font=("Pixel Emulator", 18, "bold"), anchor="w")
-    # Display lives as hearts
+    # Update the quiz screen in place
     hearts = "❤️" * lives + "🤍" * (3 - lives)
-    canvas.create_text(60, 40, text=f"Lives: {hearts}", fill="red",
-                       font=("Pixel Emulator", 18, "bold"), anchor="w")
-    # Display question counter
-    canvas.create_text(400, 190, text=f"Question {question_number}/10",
-                       font=("Pixel Emulator", 20, "bold"), fill="black")
-    # Display question text
-    canvas.create_text(400, 260, text=q_text,
-                       font=("Pixel Emulator", 28, "bold"), fill="black")
-    # Display timer
-    timer_text = canvas.create_text(400, 320, text=f"Time Left: 15s",
-                                    font=("Pixel Emulator", 16), fill="red")
-
-    # Answer input box
-    answer_entry = tk.Entry(window, font=("Pixel Emulator", 20), width=10, justify="center",
-                            bg="white", highlightthickness=2, highlightbackground="black",
-                            highlightcolor="black")
-    canvas.create_window(400, 380, window=answer_entry)
+    canvas.itemconfigure(quiz_items["score"], text=f"Score: {score}")
+    canvas.itemconfigure(quiz_items["lives"], text=f"Lives: {hearts}")
+    canvas.itemconfigure(quiz_items["counter"], text=f"Question {question_number}/{len(round_questions)}")
+    canvas.itemconfigure(quiz_items["question"], text=q_text)
+    answer_entry.delete(0, "end")  # Clear the previous answer
     answer_entry.focus_set()  # Focus cursor on input box
 
-    # Next button
-    next_btn = tk.Button(window, text="Next ➜", font=("Pixel Emulator", 14, "bold"), bg="#FFD93D",
-                         command=lambda: (click_sound.play(), check_answer(level, answer_entry.get())))
-    canvas.create_window(400, 450, window=next_btn)
+    timer.start(DIFFICULTY[level]["time"])  # Timer countdown
 
-    # Bind Enter key to check answer
-    window.unbind("<Return>")
-    window.bind("<Return>", lambda event: check_answer(level, answer_entry.get()))
-
-    # Timer countdown
-    time_left = 15  # Reset timer
-    def countdown():
-        global time_left, timer_id, lives, score
-        time_left -= 1
-        canvas.itemconfigure(timer_text, text=f"Time Left: {time_left}s")
-        if time_left <= 0:  # Time up
-            timeup_sound.play()
-            lives -= 1
-            score = max(0, score - 5)
-            messagebox.showinfo("⏰ Time’s Up!", "You ran out of time! -5 pts.")
-            show_question(level)
-        else:
-            timer_id = window.after(1000, countdown)  # Repeat every second
-    timer_id = window.after(1000, countdown)  # Start timer
+def show_time_left(seconds):  # Timer text, redrawn only when the seconds change
+    canvas.itemconfigure(quiz_items["timer"], text=f"Time Left: {seconds}s")
+
+def time_up():  # Timer ran out before an answer
+    global lives, score
+    record_latency("timeout")
+    lives -= 1
+    score = max(0, score - 5)
+    answered("timeout", "⏰ Time's up! -5 pts", quiz_level)
+
+timer = QuestionTimer(window, show_time_left, time_up)
+
+def on_window_state(event):  # Pause while the window is minimised, carry on when it is back
+    if event.widget is window:
+        timer.pause() if event.type == tk.EventType.Unmap else timer.resume()
+
+window.bind("<Unmap>", on_window_state)
+window.bind("<Map>", on_window_state)
 
 # CHECK ANSWER FUNCTION
 def check_answer(level, user_answer):
-    global score, lives, timer_id
+    global score, lives
 
-    try:
-        window.after_cancel(timer_id)  # Stop countdown
-    except:
-        pass
+    if timer.deadline is None:  # Already answered or timed out (e.g. Enter pressed twice)
+        return
 
     # Empty answer / skip
     if user_answer.strip() == "":
+        record_latency("skipped")
         if not hasattr(check_answer, "retry_flag") or not check_answer.retry_flag:
             check_answer.retry_flag = True  # Allow one retry
-            messagebox.showinfo("Try Again!", "You skipped the question.\nTry again! You have one more chance.")
-            show_question(level)
+            answered("skip", "Skipped! Try again, one more chance", level)
             return
         else:
             check_answer.retry_flag = False
-            wrong_sound.play()
             lives -= 1
             score = max(0, score - 5)
-            messagebox.showinfo("❌", "You skipped again! -5 pts")
-            show_question(level)
+            answered("skip", "❌ Skipped again! -5 pts", level)
             return
 
     # Wrong answer
     if str(user_answer).strip() != str(correct_answer):
+        record_latency("wrong")
         if not hasattr(check_answer, "wrong_retry") or not check_answer.wrong_retry:
             check_answer.wrong_retry = True  # Allow one retry
-            wrong_sound.play()
             lives -= 1
             score = max(0, score - 5)
-            messagebox.showinfo("❌", "Wrong! -5 pts. Try again!")
-            show_question(level)
+            answered("wrong", "❌ Wrong! -5 pts. Try again!", level)
             return
         else:
             check_answer.wrong_retry = False
             check_answer.retry_flag = False
-            wrong_sound.play()
             lives -= 1
             score = max(0, score - 5)
-            messagebox.showinfo("❌", "Still wrong! -5 pts")
-            show_question(level)
+            answered("wrong", "❌ Still wrong! -5 pts", level)
             return
 
     # Correct answer
+    record_latency("correct")
     check_answer.retry_flag = False
     check_answer.wrong_retry = False
-    correct_sound.play()
     score += 10
-    messagebox.showinfo("✅", "correct! +10 pts")
-    show_question(level)
+    answered("correct", "✅ Correct! +10 pts", level)
 
 # SHOW RESULT SCREEN
+play_again_btn = None  # Play Again button, made on the first result screen and reused after that
+exit_btn = None  # Exit button, made on the first result screen and reused after that
+
 def show_result():
+    global play_again_btn, exit_btn
     window.unbind("<Return>")  # Unbind Enter key
+    save_latencies()  # Response times for later analysis
+    stop_feedback()  # The overlay goes with the quiz screen
     canvas.delete("all")  # Clear canvas
-    canvas.create_image(0, 0, image=gameover_bg_photo, anchor="nw")  # Background
+    show_background("gameover")  # Background
 
     canvas.create_text(400, 370, text=f"Your Score: {score}", fill="white",
                        font=("Pixel Emulator", 20, "bold"))
@@ -275,17 +468,18 @@ def show_result():
 
     canvas.create_text(400, 400, text=msg, fill="white", font=("Pixel Emulator", 20, "bold"))
 
-    # Play Again button
-    canvas.create_window(320, 460, window=tk.Button(window, text="Play Again", font=("Pixel Emulator", 18, "bold"),
-                                                   bg="#FFD93D", activebackground="#FFEA7A",
-                                                   command=lambda: (click_sound.play(), show_difficulty_screen())))
-    # Exit button
-    canvas.create_window(480, 460, window=tk.Button(window, text="Exit Game", font=("Pixel Emulator", 18, "bold"),
-                                                   bg="#FF6B6B", activebackground="#FF8787",
-                                                   command=lambda: (click_sound.play(), window.destroy())))
+    if play_again_btn is None:  # Buttons made once for the whole session
+        play_again_btn = tk.Button(window, text="Play Again", font=("Pixel Emulator", 18, "bold"),
+                                   bg="#FFD93D", activebackground="#FFEA7A",
+                                   command=lambda: (play("click"), show_difficulty_screen()))
+        exit_btn = tk.Button(window, text="Exit Game", font=("Pixel Emulator", 18, "bold"),
+                             bg="#FF6B6B", activebackground="#FF8787",
+                             command=lambda: (play("click"), window.destroy()))
+    canvas.create_window(320, 460, window=play_again_btn)  # Play Again button
+    canvas.create_window(480, 460, window=exit_btn)  # Exit button
 
 # BIND START CLICK
-canvas.tag_bind(press_text_id, "<Button-1>", lambda e: (click_sound.play(), show_how_to_play()))
+canvas.tag_bind(press_text_id, "<Button-1>", lambda e: (play("click"), show_how_to_play()))
 
 # START MAIN LOOP
 window.mainloop()  # Start Tkinter event loop
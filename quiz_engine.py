@@ -0,0 +1,122 @@
+# QUIZ ENGINE
+
+# Questions and the question timer for Maths Quiz.py. Nothing here opens a window, so it can be tested on its own.
+import math  # Rounding the time left up to whole seconds
+import operator  # Arithmetic for the question engine (no eval)
+import time  # Monotonic clock for the question timer
+
+# QUESTION ENGINE
+# Difficulty profiles are plain data: which operators appear, the operand range for each, and how many steps.
+# For "÷" the range is for the divisor and the answer, so every division comes out whole; for "^" it is the base.
+DIFFICULTY = {
+    "Easy": {"ops": {"+": (1, 10), "-": (1, 10)}, "steps": 1, "time": 15},
+    "Moderate": {"ops": {"+": (10, 50), "-": (10, 50), "×": (2, 12), "÷": (2, 12)}, "steps": 1, "time": 20},
+    "Advanced": {"ops": {"+": (50, 100), "-": (50, 100), "×": (6, 20), "÷": (6, 20), "^": (2, 12)},
+                 "steps": 2, "chain": {"+": (10, 50), "-": (10, 50), "×": (2, 9)}, "time": 30},
+}  # "time" is the seconds allowed per question
+ROUND_LENGTH = 10  # Questions per round
+OPS = {"+": operator.add, "-": operator.sub, "×": operator.mul, "÷": operator.floordiv, "^": operator.pow}
+PRECEDENCE = {"+": 1, "-": 1, "×": 2, "÷": 2, "^": 3}  # Decides where brackets are needed
+POWERS = {2: "²", 3: "³"}  # Exponents "^" can use, as they are shown
+
+
+def operands(op, low, high, rng):  # Two operands for op whose result is a whole number
+    if op == "÷":  # Build it backwards from divisor x answer
+        divisor, answer = rng.randint(low, high), rng.randint(low, high)
+        return divisor * answer, divisor
+    if op == "^":
+        return rng.randint(low, high), rng.choice(list(POWERS))
+    return rng.randint(low, high), rng.randint(low, high)
+
+
+def make_question(profile, rng):  # (question text, answer, duplicate key) built and worked out step by step
+    op = rng.choice(list(profile["ops"]))
+    a, b = operands(op, *profile["ops"][op], rng)
+    text = f"{a}{POWERS[b]}" if op == "^" else f"{a} {op} {b}"
+    value, level = OPS[op](a, b), PRECEDENCE[op]
+    key = (op, min(a, b), max(a, b)) if op in "+×" else (op, a, b)  # 3 + 4 and 4 + 3 count as the same question
+    for _ in range(profile["steps"] - 1):  # Extra steps apply to the running result, left to right
+        op = rng.choice(list(profile["chain"]))
+        c = rng.randint(*profile["chain"][op])
+        if PRECEDENCE[op] > level:  # e.g. (a + b) × c: without brackets the × would happen first
+            text = f"({text})"
+        text, value, level = f"{text} {op} {c}", OPS[op](value, c), PRECEDENCE[op]
+        key += (op, c)
+    return f"{text} = ?", value, key
+
+
+def make_round(level, rng, count=ROUND_LENGTH):  # A whole round of different questions, made before it starts
+    profile = DIFFICULTY[level]
+    questions, seen = [], set()
+    for _ in range(count * 100):  # Bounded, in case a profile has fewer than count different questions
+        text, answer, key = make_question(profile, rng)
+        if key not in seen:
+            seen.add(key)
+            questions.append((text, answer))
+            if len(questions) == count:
+                break
+    return questions
+
+
+# QUESTION TIMER
+# Counts down to a deadline on the monotonic clock, so a busy or blocked event loop never makes it drift:
+# each tick works out the time left from the clock and only wakes up again when the whole seconds shown change.
+class QuestionTimer:
+    def __init__(self, widget, on_tick, on_expire):
+        self.widget = widget  # Tk widget whose after() schedules the ticks
+        self.on_tick = on_tick  # Called with the whole seconds left whenever that number changes
+        self.on_expire = on_expire  # Called once when time runs out
+        self.deadline = None  # Monotonic time the question ends, None when stopped
+        self.started = None  # Monotonic time the question was shown, moved on by pauses
+        self.paused_at = None  # Monotonic time of pause(), None while running
+        self.shown = None  # Seconds last passed to on_tick
+        self.after_id = None  # Pending Tk callback
+
+    def start(self, limit):  # Begin counting down limit seconds
+        self.stop()
+        self.started = time.monotonic()
+        self.deadline = self.started + limit
+        self.paused_at = self.shown = None
+        self._tick()
+
+    def _tick(self):
+        self.after_id = None
+        left = self.deadline - time.monotonic()
+        seconds = max(0, math.ceil(left))
+        if seconds != self.shown:  # Redraw only when the number changes
+            self.shown = seconds
+            self.on_tick(seconds)
+        if left <= 0:
+            self.deadline = None
+            self.on_expire()
+        else:  # Sleep until the next whole second is crossed
+            self.after_id = self.widget.after(int((left - (seconds - 1)) * 1000) + 1, self._tick)
+
+    def _cancel(self):
+        if self.after_id is not None:
+            self.widget.after_cancel(self.after_id)
+            self.after_id = None
+
+    def pause(self):  # Freeze the countdown (e.g. while the window is minimised)
+        if self.deadline is not None and self.paused_at is None:
+            self._cancel()
+            self.paused_at = time.monotonic()
+
+    def resume(self):
+        if self.paused_at is not None:
+            gap = time.monotonic() - self.paused_at
+            self.deadline += gap  # Paused time does not count against the player...
+            self.started += gap  # ...or towards their response time
+            self.paused_at = None
+            self._tick()
+
+    def elapsed(self):  # Seconds the current question has been on screen, pauses excluded
+        if self.started is None:
+            return 0.0
+        return (self.paused_at or time.monotonic()) - self.started
+
+    def stop(self):  # Stop counting; returns the response time in seconds
+        self._cancel()
+        took = self.elapsed()
+        self.deadline = self.paused_at = None
+        return took
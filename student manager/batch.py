@@ -0,0 +1,144 @@
+# BATCH GRADING
+
+# Headless grading of one or more marks files, no tkinter or PIL involved.
+# Usage: python "student manager/batch.py" [FILE or FOLDER ...] [--format csv|json|text] [--output FILE] [--jobs N]
+#                                           [--scheme NAME]
+import argparse  # Command-line options
+import csv  # CSV report
+import json  # JSON report
+import os  # File and folder handling
+import sys  # Standard streams and exit code
+from concurrent.futures import ProcessPoolExecutor  # Grade several files at once
+from itertools import repeat  # Same scheme settings for every file
+from grading import chosen_schemes, fit_scheme  # Configurable grading schemes
+from journal import Journal  # Saved edits not yet folded into the marks file
+from marks import DATA_FILE, LoadReport, format_student_output  # Shared data utilities
+from snapshot import load_cached  # Binary snapshot loading
+
+FIELDS = ["file", "code", "name", "coursework", "exam", "percent", "grade"]  # CSV columns
+PATTERN = ".txt"  # Files picked up when a folder is given
+
+
+def expand_paths(paths):  # Files to grade: folders become their marks files, in name order
+    files = []
+    for p in paths:
+        if os.path.isdir(p):
+            files.extend(os.path.join(p, n) for n in sorted(os.listdir(p))
+                         if n.endswith(PATTERN) and os.path.isfile(os.path.join(p, n)))
+        else:
+            files.append(p)
+    return files
+
+
+def grade_file(path, schemes, name, named=False):  # Grade every student in one file (runs in a worker process)
+    report = LoadReport(path)
+    table = load_cached(path, report, save=False)  # Grading never writes beside its input files
+    journal = Journal(path)
+    journal.replay(table, report, set_aside=False)  # Include edits saved in the GUI but not yet folded into the file
+    result = {"file": path, "found": os.path.exists(path), "students": [], "scheme": schemes[name], "note": None,
+              "error": None, "summary": report.summary(), "skipped": report.skipped, "stale": journal.stale}
+    if not len(table):
+        return result
+    codes, names, cw, exam = table.live_columns()
+    try:  # The chosen scheme; if it was only the configured default, one that fits the file's marks
+        scheme, result["note"] = fit_scheme(schemes, name, len(cw), named)
+    except ValueError as e:  # A scheme asked for by name that does not fit this file
+        result["error"] = str(e)
+        return result
+    _, percents, grades = scheme.grade_columns(cw, exam)  # Whole columns at once
+    cw_totals = map(sum, zip(*cw))
+    result["students"] = list(zip(codes, names, cw_totals, exam, percents, grades))
+    result["scheme"] = scheme
+    return result
+
+
+def grade_files(files, jobs=None, schemes=None, name=None, named=False):  # Results for each file, in the order given
+    if schemes is None:
+        schemes, name = chosen_schemes()
+    args = (files, repeat(schemes), repeat(name), repeat(named))
+    if len(files) < 2 or jobs == 1:
+        yield from map(grade_file, *args)  # Not worth starting a process pool
+        return
+    pool = ProcessPoolExecutor(max_workers=jobs)
+    try:
+        yield from pool.map(grade_file, *args)
+    finally:
+        pool.shutdown()
+
+
+# Report writers (each takes an iterable of grade_file results and an open text stream)
+def write_csv(results, out):
+    writer = csv.writer(out)
+    writer.writerow(FIELDS)
+    for result in results:  # Rows are written as each file finishes
+        writer.writerows((result["file"],) + row for row in result["students"])
+        yield result
+
+
+def write_json(results, out):
+    files = []
+    for result in results:
+        files.append({"file": result["file"], "summary": result["summary"],
+                      "skipped": [{"line": n, "reason": reason, "text": text} for n, reason, text in result["skipped"]],
+                      "students": [dict(zip(FIELDS[1:], row)) for row in result["students"]]})
+        yield result
+    json.dump({"files": files}, out, indent=2)
+    out.write("\n")
+
+
+def write_text(results, out):  # Same layout as the GUI's record view
+    for result in results:
+        out.write(f"== {result['file']}\n")
+        for code, name, cw_total, exam, percent, grade in result["students"]:
+            s = {"code": code, "name": name, "exam": exam}
+            out.write(format_student_output(s, (cw_total, percent, grade), result["scheme"]) + "\n\n")
+        yield result
+
+
+WRITERS = {"csv": write_csv, "json": write_json, "text": write_text}
+
+
+def main(argv=None):  # Returns the process exit code
+    parser = argparse.ArgumentParser(description="Grade student marks files without opening the GUI.")
+    parser.add_argument("paths", nargs="*", default=[DATA_FILE], help="marks files or folders of .txt files")
+    parser.add_argument("--format", choices=sorted(WRITERS), default="csv", help="report format (default csv)")
+    parser.add_argument("--output", help="write the report here instead of standard output")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--scheme", help="grading scheme from schemes.json (default: the configured one)")
+    args = parser.parse_args(argv)
+
+    try:
+        schemes, name = chosen_schemes(args.scheme)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    files = expand_paths(args.paths)
+    if not files:
+        print("No marks files found", file=sys.stderr)
+        return 2
+    out = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    status = 0
+    try:
+        for result in WRITERS[args.format](grade_files(files, args.jobs, schemes, name, bool(args.scheme)), out):
+            if not result["found"]:
+                print(f"{result['file']}: file not found", file=sys.stderr)
+                status = 1
+            elif result["error"]:
+                print(f"{result['file']}: {result['error']}", file=sys.stderr)
+                status = 1
+            else:
+                print(f"{result['file']}: {result['summary']}", file=sys.stderr)  # Keep stdout for the report
+                if result["note"]:
+                    print(f"{result['file']}: {result['note']}", file=sys.stderr)
+                if result["stale"]:
+                    print(f"{result['file']}: ignored {result['stale']} journalled edits made to a different "
+                          "version of the file", file=sys.stderr)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return status
+
+
+if __name__ == "__main__":  # Run program if file executed directly
+    sys.exit(main())
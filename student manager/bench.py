@@ -0,0 +1,150 @@
+# BENCHMARKS
+
+# Times the data layer on synthetic marks files, with no GUI, and saves the results as JSON.
+# Usage: python "student manager/bench.py" [--rows 10 1000 100000] [--dup 0.01] [--bad 0.001]
+#                                          [--repeat 3] [--seed 1] [--output FILE] [--compare OLD.json]
+import argparse  # Command-line options
+import json  # Results file
+import os  # Temporary files
+import platform  # Machine details stored with the results
+import random  # Synthetic students
+import sys  # Standard output and exit code
+import tempfile  # Scratch folder for generated files
+import time  # perf_counter timings
+from itertools import cycle, islice  # Repeating rows to fill the journal timing
+from marks import LoadReport, load_students, save_students  # Shared data utilities
+from table import StudentTable  # Columnar student store
+from snapshot import load_cached  # Binary snapshot loading
+from codes import CODE_MAX, CODE_MIN, CodeAllocator, resolve_duplicates  # Duplicate code handling
+from indexes import StudentIndex  # Code and name lookups
+from journal import Journal  # Edit journal
+from metrics import Metrics  # Cached totals
+from ranking import RankIndex  # Rank order
+from optional import np  # Reported with the results: NumPy changes the column timings
+from stats import cohort_stats  # Class statistics
+
+FIRST = ["Alex", "Sam", "Jo", "Lee", "Ron", "Matt", "Jake", "Gareth", "Alan", "Les", "Priya", "Wei", "Ana", "Omar"]
+LAST = ["Curry", "Scott", "Hyde", "Herrema", "Thompson", "Hobbs", "Shearer", "Khan", "Silva", "Chen", "Okafor"]
+LOOKUPS = 1000  # Lookups timed per run
+APPENDS = 100  # Journal writes timed per run (each one is flushed to disk, as an edit in the app is)
+REGRESSION = 1.25  # Slower than this many times the old result counts as a regression
+NOISE_FLOOR = 0.005  # Timings under this many seconds are too noisy to compare
+
+
+def code_high(rows):  # Highest code a generated file of `rows` lines uses
+    # The app's 1000-9999 range only holds 9000 students; bigger files get a wider range, and resolve_duplicates
+    # an allocator over the same range, so it times real renumbering and not the "range full" path.
+    return max(CODE_MAX, CODE_MIN + rows - 1)
+
+
+def generate(path, rows, dup_rate=0.0, bad_rate=0.0, seed=1):  # Write a marks file with `rows` data lines
+    rng = random.Random(seed)  # Same seed, same file
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"{rows}\n")  # Header: declared row count
+        chunk = []
+        for k in range(rows):
+            r = rng.random()
+            if r < bad_rate:  # Malformed line: too few fields or a non-numeric mark
+                chunk.append(rng.choice(["broken line", f"{CODE_MIN + k},Bad Mark,x,1,2,3"]))
+            else:
+                code = CODE_MIN + (rng.randrange(k) if k and r < bad_rate + dup_rate else k)  # A dup reuses an earlier code
+                marks = ",".join(str(rng.randint(0, 20)) for _ in range(3))
+                chunk.append(f"{code},{rng.choice(FIRST)} {rng.choice(LAST)},{marks},{rng.randint(0, 100)}")
+            if len(chunk) >= 10000:
+                f.write("\n".join(chunk) + "\n")
+                chunk = []
+        if chunk:
+            f.write("\n".join(chunk) + "\n")
+
+
+def best_time(fn, repeat):  # Fastest of `repeat` runs, in seconds, plus the last result
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def bench_size(folder, rows, args):  # {operation: seconds} for one file size
+    path = os.path.join(folder, f"marks_{rows}.txt")
+    generate(path, rows, args.dup, args.bad, args.seed)
+    out = {}
+    out["load_students"], _ = best_time(lambda: load_students(path), args.repeat)
+    out["table_load"], table = best_time(lambda: StudentTable.load(path, LoadReport(path)), args.repeat)
+    load_cached(path)  # Writes the snapshot
+    out["snapshot_load"], _ = best_time(lambda: load_cached(path), args.repeat)
+    out["save_students"], _ = best_time(lambda: save_students(table, path + ".out"), args.repeat)
+
+    def dedupe():
+        t = table.copy()
+        return resolve_duplicates(t, CodeAllocator(t.codes, CODE_MIN, code_high(rows)))
+    out["resolve_duplicates"], _ = best_time(dedupe, args.repeat)
+
+    out["build_indexes"], (index, metrics) = best_time(lambda: (StudentIndex(table), Metrics(table)), args.repeat)
+    out["rank_index"], ranking = best_time(lambda: RankIndex(table, metrics), args.repeat)
+    out["rank_order"], _ = best_time(lambda: ranking.ordered("desc"), args.repeat)  # What Sort Records lists
+    out["cohort_stats"], _ = best_time(lambda: cohort_stats(table, metrics), args.repeat)
+
+    rng = random.Random(args.seed)
+    keys = [rng.choice([table.codes[rng.randrange(len(table.codes))], rng.choice(LAST)]) if len(table) else "x"
+            for _ in range(LOOKUPS)]
+    index.warm()  # Time lookups, not the one-off trigram build
+    out[f"lookup_x{LOOKUPS}"], _ = best_time(lambda: [index.lookup(k) for k in keys], args.repeat)
+
+    if len(table):
+        journal = Journal(path)
+        journal.replay(table.copy())  # No journal yet: this only ties it to the file
+        edits = [Journal.update_line(table.codes[i], table.row(i))  # One write per edit, as the app does
+                 for i in islice(cycle(table.row_ids()), APPENDS)]
+        out[f"journal_append_x{APPENDS}"], _ = best_time(lambda: [journal.write([line]) for line in edits],
+                                                         args.repeat)
+    return out
+
+
+def compare(results, old):  # Lines describing operations that got slower than REGRESSION times
+    lines = []
+    for rows, ops in results["sizes"].items():
+        for op, secs in ops.items():
+            before = old.get("sizes", {}).get(rows, {}).get(op)
+            if before and secs > NOISE_FLOOR and secs > before * REGRESSION:
+                lines.append(f"{op} @ {rows} rows: {before:.4f}s -> {secs:.4f}s ({secs / before:.2f}x)")
+    return lines
+
+
+def main(argv=None):  # Returns the process exit code (1 if --compare found a regression)
+    parser = argparse.ArgumentParser(description="Benchmark the student manager data layer.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10, 1000, 100000], help="file sizes to test")
+    parser.add_argument("--dup", type=float, default=0.01, help="fraction of rows with a repeated code")
+    parser.add_argument("--bad", type=float, default=0.001, help="fraction of malformed rows")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per operation (the fastest is kept)")
+    parser.add_argument("--seed", type=int, default=1, help="random seed for the generated files")
+    parser.add_argument("--output", help="save the JSON results here")
+    parser.add_argument("--compare", help="earlier results file to check for regressions")
+    args = parser.parse_args(argv)
+
+    results = {"python": platform.python_version(), "machine": platform.machine(), "numpy": np is not None,
+               "dup": args.dup, "bad": args.bad, "seed": args.seed, "repeat": args.repeat, "sizes": {}}
+    with tempfile.TemporaryDirectory() as folder:
+        for rows in args.rows:
+            ops = bench_size(folder, rows, args)
+            results["sizes"][str(rows)] = {op: round(secs, 6) for op, secs in ops.items()}
+            print(f"{rows} rows")
+            for op, secs in ops.items():
+                print(f"  {op:<22}{secs * 1000:10.2f} ms")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            slower = compare(results, json.load(f))
+        for line in slower:
+            print("SLOWER: " + line)
+        return 1 if slower else 0
+    return 0
+
+
+if __name__ == "__main__":  # Run program if file executed directly
+    sys.exit(main())
@@ -1,89 +1,38 @@
 # STUDENT MANAGER
 
 # Import required libraries
-import tkinter as tk  # Tkinter for GUI components
-from tkinter import ttk, messagebox, simpledialog  # Extra widgets, dialogs, and message boxes
-import os  # For file handling (checking existence, reading/writing)
-from PIL import Image, ImageTk  # For loading and displaying images in Tkinter
-
-# DATA FILE SETUP
-DATA_FILE = "student manager/studentMarks.txt"  # File where student records are stored
-
-# Data utilities
-def load_students(path=DATA_FILE):  # Function to load student data from file
-    students = []  # Empty list to hold student dictionaries
-    if not os.path.exists(path):  # If file doesn’t exist, return empty list
-        return students
-    with open(path, "r", encoding="utf-8") as f:  # Open file in read mode
-        lines = [ln.strip() for ln in f.readlines() if ln.strip()]  # Read lines, strip whitespace, ignore blanks
-    if not lines:  # If file is empty, return empty list
-        return students
-    try:
-        int(lines[0])  # Try to read first line as student count
-        data_lines = lines[1:]  # Skip first line if it’s a number
-    except:
-        data_lines = lines  # Otherwise treat all lines as data
-
-    for ln in data_lines:  # Loop through each line of student data
-        parts = [p.strip() for p in ln.split(",")]  # Split by commas
-        if len(parts) < 6:  # Skip malformed lines
-            continue
-        code = parts[0]  # Student code
-        name = parts[1]  # Student name
-        try:
-            cw1, cw2, cw3 = int(parts[2]), int(parts[3]), int(parts[4])  # Coursework marks
-            exam = int(parts[5])  # Exam mark
-        except:
-            continue  # Skip if marks aren’t integers
-        students.append({  # Add student dictionary to list
-            "code": code,
-            "name": name,
-            "cw": [cw1, cw2, cw3],
-            "exam": exam
-        })
-    return students  # Return list of students
-
-
-def save_students(students, path=DATA_FILE):  # Function to save student list to file
-    with open(path, "w", encoding="utf-8") as f:  # Open file in write mode
-        f.write(str(len(students)) + "\n")  # First line = number of students
-        for s in students:  # Loop through each student
-            line = f"{s['code']},{s['name']},{s['cw'][0]},{s['cw'][1]},{s['cw'][2]},{s['exam']}\n"  # Format as CSV
-            f.write(line)  # Write line to file
-
-
-def coursework_total(s):  # Function to calculate coursework total
-    return sum(s["cw"])  # Sum of three coursework marks (out of 60)
-
-
-def overall_percentage(s):  # Function to calculate overall percentage
-    total = coursework_total(s) + s["exam"]  # Coursework + exam marks
-    return round((total / 160.0) * 100, 2)  # Convert to percentage (max 160 marks)
-
-
-def grade_from_percent(p):  # Function to assign grade based on percentage
-    if p >= 70: return "A"  # 70% or above = A
-    if p >= 60: return "B"  # 60–69% = B
-    if p >= 50: return "C"  # 50–59% = C
-    if p >= 40: return "D"  # 40–49% = D
-    return "F"  # Below 40% = Fail
-
-
-def format_student_output(s):  # Function to format student info for display
-    cw_total = coursework_total(s)  # Coursework total
-    exam = s["exam"]  # Exam mark
-    percent = overall_percentage(s)  # Overall percentage
-    g = grade_from_percent(percent)  # Grade
-    lines = [  # Build output lines
-        f"Student Name: {s['name']}",
-        f"Student Number: {s['code']}",
-        f"Total coursework mark (out of 60): {cw_total}",
-        f"Exam mark (out of 100): {exam}",
-        f"Overall percentage (out of 160): {percent}%",
-        f"Grade: {g}"
-    ]
-    return "\n".join(lines)  # Return formatted string
+import time  # Startup timing
+STARTED = time.perf_counter()  # Process start, as near as we can get
+import sys  # Command-line arguments
+import os  # File extensions for import/export
+from contextlib import contextmanager  # Grouping edits into one batch
+if __name__ == "__main__" and len(sys.argv) > 1:  # Arguments mean a batch run: grade without loading Tk or PIL
+    from batch import main
+    sys.exit(main())
 
+import tkinter as tk  # Tkinter for GUI components
+from tkinter import ttk, messagebox, simpledialog, filedialog  # Extra widgets, dialogs, and message boxes
+from marks import LoadReport, format_student_output, parse_student  # Data utilities
+from indexes import StudentIndex  # Code and name lookups
+from metrics import Metrics  # Cached percentages, grades and class aggregates
+from record_view import RecordView  # Virtualised table of student records
+from ranking import RankIndex  # Students in rank order for top-N and rank queries
+from journal import Journal  # Append-only edit log for the marks file
+from snapshot import load_cached, write_snapshot  # Binary copy of the marks file for fast loading
+from table import StudentTable  # Columnar student store
+from jobs import JobRunner  # Worker thread for file I/O
+from codes import CODE_MAX, CODE_MIN, CodeAllocator, resolve_duplicates  # Free student codes
+from stats import cohort_stats, format_stats  # Class statistics
+from history import History  # Undo/redo of edits
+from grading import STANDARD, load_schemes, pick_scheme  # Grading schemes from schemes.json
+from thumbs import cached_thumbnail  # Pre-resized logo, readable without PIL
+from transfer import EXPORTERS, READERS, export_table, iter_import, write_rejects  # Bulk import/export
+
+SEARCH_DELAY_MS = 200  # Pause in typing before the live search runs
+SEARCH_LIMIT = 5000  # Most matches a live search lists
+WATCH_MS = 2000  # How often to look for changes other people made to the marks file
+LOGO_FILE = "images/bsu.png"  # Sidebar logo
+LOGO_SIZE = (140, 140)  # Logo size in the sidebar
 
 # GUI
 class StudentManagerApp:  # Main application class for managing students
@@ -92,8 +41,25 @@ class StudentManagerApp:  # Main application class for managing students
         root.title("Student Manager")  # Set window title
         root.geometry("1000x600")  # Set window size (width x height)
 
-        self.students = load_students()  # Load student data from file
-        self._ensure_unique_codes()  # Ensure no duplicate student codes
+        self.journal = Journal()  # Edits are appended here instead of rewriting the whole file
+        self.loading = True  # True until the worker thread has read the marks file
+        self.duplicates_left = 0  # Repeated codes the loader had no free code for
+        self.history = History()  # Undo/redo steps for edits made in this session
+        self._batch_lines = None  # Journal lines held back while a batch of edits is open
+        self._merging = False  # True while applying changes read from disk (already saved, so not logged)
+        self._dirty = set()  # Codes edited here since the last look at the files on disk
+        self._since_check = None  # Codes edited while a file check is running
+        self._clashes = 0  # Journal lines from disk that clashed with codes in use here
+        self._since_compact = None  # Codes edited while a compaction is running
+        try:
+            self.schemes, self.scheme_name = load_schemes()  # Grading schemes, and the one to use by default
+        except (OSError, ValueError) as e:
+            print(f"Could not read grading schemes ({e}), using the standard one.")
+            self.schemes, self.scheme_name = {STANDARD.name: STANDARD}, STANDARD.name
+        self._set_data(self._index_data(LoadReport(), StudentTable()))  # Empty until loading finishes
+        root.protocol("WM_DELETE_WINDOW", self.on_close)  # Fold the journal into the file on exit
+        root.bind("<Control-z>", lambda e: self.undo())  # Keyboard shortcuts for undo/redo
+        root.bind("<Control-y>", lambda e: self.redo())
 
         # SIDEBAR
         self.sidebar = tk.Frame(root, width=220, bg="#2c3e50")  # Create sidebar frame
@@ -101,9 +67,8 @@ class StudentManagerApp:  # Main application class for managing students
 
         # LOGO
         try:
-            img = Image.open("images/bsu.png")  # Try to open logo image
-            img = img.resize((140, 140))  # Resize image to fit sidebar
-            self.logo_img = ImageTk.PhotoImage(img)  # Convert to Tkinter image
+            # Resized copy made once with PIL and cached on disk; Tk loads the PNG itself after that
+            self.logo_img = tk.PhotoImage(file=cached_thumbnail(LOGO_FILE, LOGO_SIZE))
             logo_label = tk.Label(self.sidebar, image=self.logo_img, bg="#2c3e50")  # Label to hold logo
             logo_label.pack(pady=20)  # Place logo with padding
         except:
@@ -120,9 +85,16 @@ class StudentManagerApp:  # Main application class for managing students
             ("Highest Scorer", self.show_highest),
             ("Lowest Scorer", self.show_lowest),
             ("Sort Records", self.sort_prompt),
+            ("Top / Bottom N", self.rank_list_prompt),
+            ("Student Rank", self.rank_student_prompt),
+            ("Statistics", self.show_statistics),
             ("Add Student", self.add_student_form),
             ("Delete Student", self.delete_student_prompt),
-            ("Update Student", self.update_student_prompt)
+            ("Update Student", self.update_student_prompt),
+            ("Import Students", self.import_prompt),
+            ("Export Students", self.export_prompt),
+            ("Undo", self.undo),
+            ("Redo", self.redo)
         ]
         for i, (label, cmd) in enumerate(btn_options):  # Loop through button list
             b = tk.Button(self.sidebar, text=label, fg="white", bg="#34495e",  # Create button
@@ -140,11 +112,14 @@ class StudentManagerApp:  # Main application class for managing students
         tk.Label(ctrl_frame, text="Search (code or name):", bg="#ecf0f1").pack(side="left")  # Label
         self.search_entry = tk.Entry(ctrl_frame)  # Entry box
         self.search_entry.pack(side="left", padx=6)
+        self.search_entry.bind("<KeyRelease>", self._on_search_key)  # Live search as the user types
+        self._search_job = None  # Pending root.after id for the debounced search
+        self._last_search = None  # (query, table generation, every name match) to narrow from
         tk.Button(ctrl_frame, text="Find", command=self.view_individual_from_search).pack(side="left", padx=6)  # Find button
         tk.Button(ctrl_frame, text="Refresh", command=self.refresh_data).pack(side="left", padx=6)  # Refresh button
 
-                # TEXT OUTPUT AREA
-        text_frame = tk.Frame(self.main)  # Frame for text output
+        # TEXT OUTPUT AREA
+        self.text_frame = text_frame = tk.Frame(self.main)  # Frame for text output
         text_frame.pack(fill="both", expand=True, padx=12, pady=12)
 
         self.text_widget = tk.Text(text_frame, wrap="word", state="normal", font=("Consolas", 11))  # Text widget
@@ -156,36 +131,460 @@ class StudentManagerApp:  # Main application class for managing students
         self.scrollbar.pack(side="right", fill="y")
         self.text_widget.configure(yscrollcommand=self.scrollbar.set)  # Link scrollbar to text widget
 
+        # RECORD TABLE (shown instead of the text area when listing students)
+        self.records = RecordView(self.main, self._record_values, on_open=self._show_row)
+        self.records.set_scheme(self.metrics.scheme)
+
         # STATUS BAR
         self.status = tk.Label(self.main, text="", anchor="w", bg="#ecf0f1")  # Status bar at bottom
         self.status.pack(fill="x", padx=12, pady=(0, 10))
 
-        # Show welcome message initially
+        # Show welcome message initially, then load the data once the window is on screen
+        self.jobs = JobRunner(root, self.status)  # File I/O runs here, off the Tk main thread
+        self.startup = {}  # Seconds from process start to the first paint ("window") and loaded data ("data")
         self.display_welcome()
+        root.after_idle(self._on_first_paint)  # Runs once the event loop has drawn the window
+        root.after(WATCH_MS, self._watch)  # Pick up edits made by other people sharing the file
+
+    def _on_first_paint(self):  # Start loading only now, so parsing a big file never holds up the first paint
+        self.startup["window"] = time.perf_counter() - STARTED
+        self._start_load(self._on_loaded)
 
     # Helper functions
-    def _ensure_unique_codes(self):  # Ensure student codes are unique
-        used = set()
-        changed = False
-        for s in self.students:
-            if s['code'] in used:  # Duplicate found
-                base = int(s['code']) if s['code'].isdigit() else 1000
-                newcode = str(base)
-                while newcode in used:  # Increment until unique
-                    base += 1
-                    newcode = str(base)
-                s['code'] = newcode
-                changed = True
-            used.add(s['code'])
-        if changed:
-            save_students(self.students)  # Save updated codes
+    def _start_load(self, on_done):  # Read the marks file on the worker thread
+        self.loading = True
+        self.jobs.submit("load", self._read_data, progress=True, message="Loading students...",
+                         on_done=on_done, on_error=self._load_failed)
+
+    def _read_data(self, progress=None):  # Worker thread: load, replay the journal and build the indexes
+        report = LoadReport()  # Records any lines the loader had to skip
+        table = load_cached(report=report, progress=progress)  # Snapshot when current, text parse otherwise
+        self.journal.replay(table, report)  # Edits made since the last full write
+        codes = CodeAllocator(table.codes[i] for i in table.row_ids())  # Every code in use
+        changed, self.duplicates_left = resolve_duplicates(table, codes)  # Ensure no duplicate student codes
+        if changed and not report.mixed:  # A rewrite would drop rows with another marks layout
+            self._write_full(table)  # Save updated codes (nobody else can see this table yet)
+        if table.codes:  # The configured scheme, or one that matches the file's coursework marks
+            scheme = pick_scheme(self.schemes, self.scheme_name, len(table.cw))
+        else:  # Empty file: new students get the configured scheme's marks
+            scheme = self.schemes[self.scheme_name]
+            table = StudentTable(scheme.cw_count)
+        if progress is not None:
+            progress("Indexing students...")
+        data = self._index_data(report, table, codes, scheme)
+        data[2].warm()  # Search-as-you-type should not stall on building the substring index
+        return data
+
+    @staticmethod
+    def _index_data(report, table, codes=None, scheme=None):  # Everything the app keeps about one loaded table
+        index = StudentIndex(table)  # Code/name indexes over the table
+        metrics = Metrics(table, scheme)  # Per-student totals and class aggregates under the grading scheme
+        ranking = RankIndex(table, metrics)  # Rank order, separate from file order
+        if codes is None:
+            codes = CodeAllocator(table.codes[i] for i in table.row_ids())
+        return report, table, index, metrics, ranking, codes
+
+    def _set_data(self, data):  # Main thread: switch to freshly loaded data
+        self.load_report, self.students, self.index, self.metrics, self.ranking, self.codes = data
+
+    def _on_loaded(self, data):  # Main thread: loading finished
+        self._set_data(data)
+        self.records.set_scheme(self.metrics.scheme)  # The file may be graded with another scheme than before
+        self.history.clear()  # Steps refer to the data that was just replaced
+        self.loading = False
+        self.records.set_rows([])  # Old row ids mean nothing in the reloaded table
+        self.display_welcome()
+        text = self.load_report.summary()  # Report skipped lines, if any
+        if self.metrics.scheme.name != self.scheme_name:  # File does not fit the configured scheme
+            text += f", graded with the {self.metrics.scheme.name} scheme"
+        if self.duplicates_left:
+            text += f", {self.duplicates_left} duplicate codes left (no free codes in {CODE_MIN}-{CODE_MAX})"
+        if "data" not in self.startup:  # First load: report how long startup took
+            self.startup["data"] = time.perf_counter() - STARTED
+            timing = f"window {self.startup['window'] * 1000:.0f} ms, data {self.startup['data'] * 1000:.0f} ms"
+            print(f"Startup: {timing} ({len(self.students)} students)")
+            text += f" (startup: {timing})"
+        self.status.config(text=text)
+        self._warn_stale_journal()
+
+    def _warn_stale_journal(self):  # Tell the user about journalled edits that could not be applied
+        if self.journal.stale:
+            messagebox.showwarning("Unsaved edits set aside", f"{self.journal.stale} saved edits were made to a "
+                                   "different version of the marks file, so they were not applied.\nThey are kept in "
+                                   f"{os.path.basename(self.journal.log_path)}.stale.")
+            self.journal.stale = 0  # Warn once
+
+    def _load_failed(self, error):
+        self.loading = False
+        self.status.config(text="Could not load student records")
+        messagebox.showerror("Load failed", f"Could not read the marks file:\n{error}")
+
+    def _ready(self):  # False (after telling the user) while records are still loading
+        if self.loading:
+            messagebox.showinfo("Please wait", "Student records are still loading.")
+            return False
+        return True
+
+    def add_student(self, s):  # Add a record to the table and the indexes
+        row = self.students.add(s)
+        self.codes.take(s["code"])
+        self.index.add(row)
+        self.metrics.add(row)
+        self.ranking.add(row)
+        if self.records.listing == "all":  # New students go at the end of the full listing
+            self.records.append_row(row)
+        self._changed(("A", s), Journal.add_line(s))
+        return row
+
+    def update_student(self, row, s):  # Replace a record, keeping the indexes in step
+        before = self.students.row(row)
+        old_code = before["code"]
+        self.index.remove(row)
+        self.metrics.remove(row)  # Only this student's cached metrics are invalidated
+        self.ranking.remove(row)
+        self.students.update(row, s)
+        if s["code"] != old_code:
+            self.codes.release(old_code)
+            self.codes.take(s["code"])
+        self.index.add(row)
+        self.metrics.add(row)
+        self.ranking.add(row)
+        self.records.refresh_row(row)  # Redraw just this line if it is on screen
+        self._changed(("U", before, s), Journal.update_line(old_code, s))
+
+    def delete_student(self, row):  # Delete a record and drop it from the indexes
+        gone = self.students.row(row)
+        code = gone["code"]
+        self.index.remove(row)
+        self.metrics.remove(row)
+        self.ranking.remove(row)
+        self.students.delete(row)
+        self.codes.release(code)
+        self.records.remove_row(row)
+        self._changed(("D", gone), Journal.delete_line(code))
+
+    @contextmanager
+    def batch(self, label=None):  # Edits inside become one undo step and one journal write
+        self.history.begin(label)
+        outer = self._batch_lines is None
+        if outer:
+            self._batch_lines = []
+        try:
+            yield
+        finally:
+            self.history.end()
+            if outer:
+                lines, self._batch_lines = self._batch_lines, None
+                if lines:
+                    self._persist(self.journal.write, lines)
+
+    def _changed(self, op, line):  # A local edit: remember it for undo and conflict checks, then journal it
+        if self._merging:
+            return  # Changes read from disk are already saved
+        self.history.record(op)
+        codes = {s["code"] for s in op[1:]}
+        self._dirty |= codes
+        if self._since_check is not None:
+            self._since_check |= codes
+        if self._since_compact is not None:
+            self._since_compact |= codes
+        self._log(line)
+
+    def _log(self, line):  # Journal one edit now, or at the end of the open batch
+        if self._batch_lines is not None:
+            self._batch_lines.append(line)
+        else:
+            self._persist(self.journal.write, [line])
+
+    # Watching the shared marks file
+    def _watch(self):  # Every WATCH_MS: queue a cheap check of the files unless the worker is busy
+        if not self.loading and not self.jobs.busy() and self._batch_lines is None:
+            self._since_check = set()
+            self.jobs.submit("watch", self._check_files, on_done=self._on_files_checked, on_error=self._watch_failed)
+        self.root.after(WATCH_MS, self._watch)
+
+    def _check_files(self):  # Worker thread: read whatever changed on disk
+        change = self.journal.check()  # Two stat calls when nothing changed
+        if change == "append":  # Only the new end of the journal is read
+            return change, self.journal.read_new()
+        if change == "rewrite":  # Marks file replaced: read it again and diff it against memory
+            return self._read_fresh()
+        return None
+
+    def _read_fresh(self):  # Worker thread: the students exactly as a reload would see them
+        report = LoadReport()
+        table = load_cached(report=report)
+        self.journal.replay(table, report)
+        lost = self.journal.lost  # Our saved edits the new version of the file does not hold
+        if resolve_duplicates(table, CodeAllocator(table.codes[i] for i in table.row_ids()))[0] and not report.mixed:
+            self._write_full(table)  # Same clean-up as a full load
+        return "rewrite", table, lost
+
+    def _watch_failed(self, error):  # File half-written or briefly missing: try again next time
+        self._since_check = None
+
+    def _on_files_checked(self, result):  # Main thread: merge changes from disk into memory
+        recent, self._since_check = self._since_check, None
+        self._merge_from_disk(result, recent)
+
+    def _merge_from_disk(self, result, recent):  # Merge a check's result; recent = codes edited since it started
+        if result is None:
+            self._dirty = recent  # Everything older is on disk for others to see
+            return
+        kind, payload = result[:2]
+        if kind == "rewrite" and len(payload.cw) != len(self.students.cw):  # Different marks layout: reload fully
+            self._dirty = recent
+            self._start_load(self._on_reloaded)
+            return
+        self._clashes = 0  # Journal lines that would have given two students the same code
+        kept = set()  # Codes changed elsewhere where a newer edit made here wins
+        lost = {}  # Codes edited here that the rewritten file does not hold: fresh row or None
+        self._merging = True
+        try:
+            if kind == "append":
+                touched, kept = self._merge_lines(payload, recent)
+            else:
+                lost = self._unsaved_in(payload, result[2] - recent)  # Recent edits are still queued to save
+                touched = self._merge_table(payload, recent | lost.keys())
+        finally:
+            self._merging = False
+        self._resave(lost)
+        conflicts = sorted((touched & self._dirty) | kept | lost.keys())  # Edited here and elsewhere since we last looked
+        self._dirty = recent
+        if kept or self._clashes:  # Edits crossed: the journal alone cannot say what the file now means
+            self._since_check = set()
+            self.jobs.submit("watch", self._read_fresh, on_done=self._on_files_checked, on_error=self._watch_failed)
+        if touched:
+            self._last_search = None
+            self.status.config(text=f"Merged {len(touched)} changes made to the marks file by someone else")
+        self._warn_stale_journal()
+        if conflicts:
+            messagebox.showwarning("Edit conflict", "These students were also changed by someone else. "
+                                   "The last saved edit has been kept:\n" + ", ".join(conflicts[:20]))
+
+    @staticmethod
+    def _parse_line(line):  # (kind, code, student, codes involved) for a journal line, or None if it is bad
+        kind, _, rest = line.partition(",")
+        try:
+            if kind == "D":
+                return kind, rest, None, {rest}
+            if kind == "U":
+                old, _, rest = rest.partition(",")
+                s = parse_student(rest)
+                return kind, old, s, {old, s["code"]}
+            if kind == "A":
+                s = parse_student(rest)
+                return kind, s["code"], s, {s["code"]}
+        except ValueError:
+            pass
+        return None  # A reload would skip it too
+
+    def _merge_lines(self, lines, recent):  # Apply journal lines written elsewhere; returns (changed, kept) codes
+        newer = set(recent)  # Codes edited here later in the file, or not written yet
+        kept, plan = set(), []
+        for line, mine in reversed(lines):  # Walk back so "later" is known for every line
+            op = self._parse_line(line)
+            if op is None:
+                continue
+            if mine:  # Already applied here
+                newer |= op[3]
+            elif op[3] & newer:  # Our later edit to the same student wins (or fails) on reload
+                kept |= op[3] & newer
+            else:
+                plan.append(op)
+        if kept:
+            return set(), kept  # Left to the full re-read the caller starts
+        touched = set()
+        for kind, code, s, codes in reversed(plan):
+            if self._merge_op(kind, code, s):
+                touched |= codes
+        return touched, kept
+
+    def _merge_op(self, kind, code, s):  # Apply one journal operation; True if memory changed
+        row = self.students.find(code)
+        if kind == "D":
+            if row is None:
+                return False
+            self.delete_student(row)
+            return True
+        holder = self.students.find(s["code"])
+        if kind == "A" and holder is not None and self.students.row(holder) != s:
+            self._clashes += 1  # Two people added different students with the same code
+            return False
+        if row is None:
+            row = holder
+        elif holder is not None and holder != row:  # Renamed onto a code another student has here
+            self._clashes += 1
+            return False
+        if row is None:
+            self.add_student(s)
+        elif self.students.row(row) != s:
+            self.update_student(row, s)
+        else:
+            return False  # Already like this in memory
+        return True
+
+    def _unsaved_in(self, fresh, codes):  # {code: fresh row or None} where a saved edit here is missing from fresh
+        on_disk = {s["code"]: s for s in fresh if s["code"] in codes}
+        lost = {}
+        for code in codes:
+            row = self.students.find(code)
+            here = self.students.row(row) if row is not None else None
+            if on_disk.get(code) != here:  # Rewritten from a copy that missed this edit
+                lost[code] = on_disk.get(code)
+        return lost
+
+    def _resave(self, lost):  # Journal local edits again on top of a marks file that lost them
+        lines = []
+        for code, s in sorted(lost.items()):
+            row = self.students.find(code)
+            if row is None:
+                if s is not None:
+                    lines.append(Journal.delete_line(code))
+            elif s is None:
+                lines.append(Journal.add_line(self.students.row(row)))
+            else:
+                lines.append(Journal.update_line(code, self.students.row(row)))
+        if lines:
+            self._persist(self.journal.write, lines)
+
+    def _merge_table(self, fresh, recent):  # Add, update and delete rows so memory matches fresh
+        live = {self.students.codes[i]: i for i in self.students.row_ids()}
+        touched = set()
+        for s in fresh:
+            row = live.pop(s["code"], None)
+            if s["code"] in recent:
+                continue
+            if row is None:
+                self.add_student(s)
+            elif self.students.row(row) != s:
+                self.update_student(row, s)
+            else:
+                continue
+            touched.add(s["code"])
+        for code, row in live.items():  # Gone from the file
+            if code not in recent:
+                self.delete_student(row)
+                touched.add(code)
+        return touched
+
+    def undo(self):  # Reverse the last edit (or batch of edits)
+        if self._ready():
+            self._step(self.history.undo(), "Undid", "Nothing to undo")
+
+    def redo(self):  # Repeat the last undone edit
+        if self._ready():
+            self._step(self.history.redo(), "Redid", "Nothing to redo")
+
+    def _step(self, step, verb, empty):  # Apply undo/redo records through the normal edit paths
+        if step is None:
+            self.status.config(text=empty)
+            return
+        label, ops = step
+        self.history.replaying = True
+        try:
+            with self.batch():
+                for op in ops:
+                    self._apply(op)
+        finally:
+            self.history.replaying = False
+        self.view_all_records()
+        self.status.config(text=f"{verb}: {label}")
+
+    def _apply(self, op):  # Apply one diff record from the history
+        # Someone sharing the file may have changed these students since, so match by code and never duplicate one
+        row = self.students.find(op[1]["code"])
+        if op[0] == "D":
+            if row is not None:
+                self.delete_student(row)
+            return
+        s = op[-1]
+        holder = self.students.find(s["code"])
+        if row is None:
+            row = holder
+        elif holder is not None and holder != row:
+            return  # That code now belongs to another student
+        if row is None:
+            self.add_student(s)
+        else:
+            self.update_student(row, s)
+
+    def _persist(self, record, *args):  # Queue a journal write; the single worker keeps edits in order
+        self._last_search = None  # Edits can change which names match
+        self.jobs.submit("save", record, *args, on_done=self._maybe_compact, on_error=self._save_failed)
+
+    def _maybe_compact(self, _=None):  # Main thread, after each journal write: fold the journal in once it is long
+        if self.journal.due() and not self.jobs.busy("compact"):
+            self._compact()
+
+    def _compact(self):  # Write the marks file out in full on the worker thread
+        if self.load_report.mixed:  # The table lacks rows with another marks layout: edits stay in the journal
+            self.status.config(text=f"Not saving in full: {self.load_report.mixed} lines have a different number of "
+                                    "coursework marks (fix them and reload)")
+            return
+        # Copy now, on the main thread (column slices only): edits made after this point are journalled after the rewrite
+        self._since_compact = set()
+        self.jobs.submit("compact", self._write_full, self.students.copy(), message="Saving all records...",
+                         on_done=self._on_compacted, on_error=self._compact_failed)
+
+    def _on_compacted(self, merged):  # Main thread: the marks file was rewritten (merged is None if it was not)
+        recent, self._since_compact = self._since_compact, None
+        if merged is None:  # Rewritten elsewhere first: the watcher merges it, and the next save tries again
+            self.status.config(text="Marks file changed elsewhere, records will be saved in full later")
+            return
+        self.status.config(text="All records saved")
+        if merged:  # Lines someone else journalled just before the rewrite: in the file now, merge them here too
+            self._merge_from_disk(("append", merged), recent)
+
+    def _compact_failed(self, error):
+        self._since_compact = None
+        self._save_failed(error)
+
+    def _write_full(self, table):  # Worker thread: rewrite the marks file and refresh its binary snapshot
+        merged = self.journal.compact(table)  # None if the file was rewritten elsewhere first
+        if merged is not None:
+            try:
+                write_snapshot(table)
+            except OSError:
+                pass  # The snapshot is only a cache
+        return merged
+
+    def _save_failed(self, error):
+        messagebox.showerror("Save failed", f"Could not write the marks file:\n{error}")
+
+    def on_close(self):  # Save outstanding edits into the marks file, then quit
+        self.jobs.shutdown()  # Let queued saves finish first
+        if not self.loading and self.journal.pending and not self.load_report.mixed:
+            self._write_full(self.students)
+        self.root.destroy()
 
     def refresh_data(self):  # Reload data from file
-        self.students = load_students()
-        self._ensure_unique_codes()
-        self.show_message("Data reloaded from file.")
+        if self._ready():
+            self._start_load(self._on_reloaded)
+
+    def _on_reloaded(self, data):  # Main thread: Refresh finished loading
+        self._on_loaded(data)
+        msg = "Data reloaded from file."
+        if self.load_report.skipped:  # List the first few bad lines so they can be fixed
+            msg += "\n\nSkipped lines:\n" + "\n".join(
+                f"Line {n}: {reason}" for n, reason, _ in self.load_report.skipped[:10])
+        self.show_message(msg)
+
+    def _show_text(self):  # Put the text area on screen in place of the record table
+        self.records.frame.pack_forget()
+        self.text_frame.pack(fill="both", expand=True, padx=12, pady=12, before=self.status)
+
+    def _show_records(self):  # Put the record table on screen in place of the text area
+        self.text_frame.pack_forget()
+        self.records.frame.pack(fill="both", expand=True, padx=12, pady=12, before=self.status)
+
+    def _record_values(self, row):  # Column values for one line of the record table
+        cw_total, percent, grade = self.metrics.derived(row)
+        return (self.students.names[row], self.students.codes[row], cw_total,
+                self.students.exam[row], f"{percent}%", grade)
 
     def display_welcome(self):  # Show welcome text
+        self._show_text()
         self.text_widget.config(state="normal")
         self.text_widget.delete("1.0", "end")
         self.text_widget.insert("end", "Welcome to Student Manager\n\n", "heading")
@@ -194,28 +593,25 @@ class StudentManagerApp:  # Main application class for managing students
         self.text_widget.config(state="disabled")
 
     def _display_summary_brief(self):  # Show class summary
+        if self.loading:  # Filled in by _on_loaded when the data arrives
+            self.text_widget.insert("end", "\nLoading student records...\n")
+            return
         n = len(self.students)
         avg = self._class_average()
         self.text_widget.insert("end", f"\nClass size: {n}\nAverage percentage: {avg}%\n")
 
     def _class_average(self):  # Calculate average percentage
-        if not self.students:
-            return 0.0
-        avg = sum(overall_percentage(s) for s in self.students) / len(self.students)
-        return round(avg, 2)
+        return self.metrics.average()  # Kept up to date on every edit
 
     # Menu actions
     def view_all_records(self):  # Display all student records
-        self.text_widget.config(state="normal")
-        self.text_widget.delete("1.0", "end")
-        self.text_widget.insert("end", "ALL STUDENT RECORDS\n\n", "heading")
-        for s in self.students:
-            self.text_widget.insert("end", format_student_output(s) + "\n" + "-" * 50 + "\n")
+        gen = self.students.generation
+        if self.records.listing != "all" or self.records.generation != gen:  # Reuse the listing if still valid
+            self.records.set_rows(list(self.students.row_ids()), "all", gen)
+        self._show_records()
         n = len(self.students)
         avg = self._class_average()
-        self.text_widget.insert("end", f"\nClass size: {n}\nAverage percentage: {avg}%\n", "heading")
-        self.text_widget.config(state="disabled")
-        self.status.config(text=f"Displayed all records ({n} students)")
+        self.status.config(text=f"Displayed all records ({n} students) - Average percentage: {avg}%")
 
     def view_individual_prompt(self):  # Prompt for student search
         key = simpledialog.askstring("Find student", "Enter student code or name:")
@@ -229,46 +625,91 @@ class StudentManagerApp:  # Main application class for managing students
             return
         self._view_individual(key)
 
+    def _on_search_key(self, event):  # Restart the debounce timer on every keystroke
+        if self._search_job is not None:
+            self.root.after_cancel(self._search_job)  # The query it would have run is already stale
+        self._search_job = self.root.after(SEARCH_DELAY_MS, self._live_search)
+
+    def _live_search(self):  # List every student whose code or name matches the search box
+        self._search_job = None
+        if self.loading:
+            return
+        text = self.search_entry.get().strip()
+        if not text:
+            if self.records.listing == "search":
+                self.display_welcome()
+            self._last_search = None
+            return
+        query, gen = text.casefold(), self.students.generation
+        last = self._last_search
+        if last is not None and last[1] == gen and last[0] in query:  # Longer query: filter the last matches
+            rows = self.index.narrow(last[2], query)
+        else:
+            rows = self.index.search(query, limit=SEARCH_LIMIT + 1)
+        complete = len(rows) <= SEARCH_LIMIT
+        self._last_search = (query, gen, rows) if complete else None  # A capped list cannot be narrowed
+        rows = rows[:SEARCH_LIMIT]
+        code_row = self.index.code(text)
+        if code_row is not None and code_row not in rows:
+            rows = [code_row] + rows
+        self.records.set_rows(rows, "search", gen)
+        self._show_records()
+        if not rows:
+            self.status.config(text=f"No student found for '{text}'")
+        elif complete:
+            self.status.config(text=f"Matches for '{text}': {len(rows)}")
+        else:
+            self.status.config(text=f"Showing the first {SEARCH_LIMIT} students matching '{text}'")
+
     def _view_individual(self, key):  # Display one student
-        found = None
-        for s in self.students:
-            if s['code'] == key or s['name'].lower() == key.lower() or key.lower() in s['name'].lower():
-                found = s
-                break
-        self.text_widget.config(state="normal")
-        self.text_widget.delete("1.0", "end")
-        if not found:
+        row = self.index.lookup(key)  # Code, exact name or part of a name
+        if row is None:
+            self._show_text()
+            self.text_widget.config(state="normal")
+            self.text_widget.delete("1.0", "end")
             self.text_widget.insert("end", f"No student found for '{key}'.\n")
             self.status.config(text="No student found")
+            self.text_widget.config(state="disabled")
         else:
-            self.text_widget.insert("end", "STUDENT RECORD\n\n", "heading")
-            self.text_widget.insert("end", format_student_output(found) + "\n")
-            self.status.config(text=f"Displayed student {found['code']} - {found['name']}")
+            self._show_row(row)
+
+    def _show_row(self, row):  # Display one student by row id
+        found = self.students.row(row)
+        self._show_text()
+        self.text_widget.config(state="normal")
+        self.text_widget.delete("1.0", "end")
+        self.text_widget.insert("end", "STUDENT RECORD\n\n", "heading")
+        self.text_widget.insert("end", format_student_output(found, self.metrics.derived(row), self.metrics.scheme) + "\n")
+        self.status.config(text=f"Displayed student {found['code']} - {found['name']}")
         self.text_widget.config(state="disabled")
 
     def show_highest(self):  # Show highest scorer
         if not self.students:
             messagebox.showinfo("No data", "No students loaded.")
             return
-        best = max(self.students, key=lambda s: overall_percentage(s))
+        row = self.metrics.best()
+        best = self.students.row(row)
+        self._show_text()
         self.text_widget.config(state="normal")
         self.text_widget.delete("1.0", "end")
         self.text_widget.insert("end", "STUDENT WITH HIGHEST OVERALL PERCENTAGE\n\n", "heading")
-        self.text_widget.insert("end", format_student_output(best) + "\n")
+        self.text_widget.insert("end", format_student_output(best, self.metrics.derived(row), self.metrics.scheme) + "\n")
         self.text_widget.config(state="disabled")
-        self.status.config(text=f"Highest: {best['code']} - {best['name']} ({overall_percentage(best)}%)")
+        self.status.config(text=f"Highest: {best['code']} - {best['name']} ({self.metrics.percent(row)}%)")
 
     def show_lowest(self):  # Show lowest scorer
         if not self.students:
             messagebox.showinfo("No data", "No students loaded.")
             return
-        worst = min(self.students, key=lambda s: overall_percentage(s))
+        row = self.metrics.worst()
+        worst = self.students.row(row)
+        self._show_text()
         self.text_widget.config(state="normal")
         self.text_widget.delete("1.0", "end")
         self.text_widget.insert("end", "STUDENT WITH LOWEST OVERALL PERCENTAGE\n\n", "heading")
-        self.text_widget.insert("end", format_student_output(worst) + "\n")
+        self.text_widget.insert("end", format_student_output(worst, self.metrics.derived(row), self.metrics.scheme) + "\n")
         self.text_widget.config(state="disabled")
-        self.status.config(text=f"Lowest: {worst['code']} - {worst['name']} ({overall_percentage(worst)}%)")
+        self.status.config(text=f"Lowest: {worst['code']} - {worst['name']} ({self.metrics.percent(row)}%)")
 
     def sort_prompt(self):  # Sort records
         if not self.students:
@@ -276,45 +717,151 @@ class StudentManagerApp:  # Main application class for managing students
             return
         choice = messagebox.askquestion("Sort", "Sort ascending by overall percentage?\nNo = descending")
         asc = (choice == "yes")
-        self.students.sort(key=lambda s: overall_percentage(s), reverse=not asc)
-        self.view_all_records()
+        rows = self.ranking.ordered("asc" if asc else "desc")  # Already sorted: no re-sort, file order untouched
+        self.records.set_rows(rows, "ranked", self.students.generation)
+        self._show_records()
         self.status.config(text=f"Sorted ({'Ascending' if asc else 'Descending'})")
 
+    def rank_list_prompt(self):  # Show the top or bottom N students
+        if not self.students:
+            messagebox.showinfo("No data", "No students loaded.")
+            return
+        n = simpledialog.askinteger("Top / Bottom N", "How many students?", minvalue=1, initialvalue=10)
+        if not n:
+            return
+        top = messagebox.askquestion("Top / Bottom N", f"Show the top {n}?\nNo = bottom {n}") == "yes"
+        rows = self.ranking.top(n) if top else self.ranking.bottom(n)
+        self.records.set_rows(rows, "ranked", self.students.generation)
+        self._show_records()
+        self.status.config(text=f"{'Top' if top else 'Bottom'} {len(rows)} students by overall percentage")
+
+    def rank_student_prompt(self):  # Show a student's rank and the students around them
+        key = simpledialog.askstring("Student Rank", "Enter student code or name:")
+        if not key:
+            return
+        row = self.index.lookup(key.strip())
+        if row is None:
+            messagebox.showinfo("Student Rank", f"No student found for '{key}'")
+            return
+        rank, pct = self.ranking.rank(row), self.ranking.percentile(row)
+        self.records.set_rows(self.ranking.around(row, 5), "ranked", self.students.generation)
+        self._show_records()
+        self.status.config(text=f"{self.students.codes[row]} - {self.students.names[row]}: rank {rank} of "
+                                f"{len(self.ranking)} (percentile {pct}), showing 5 either side")
+
     def add_student_form(self):  # Open add student dialog
-        AddDialog(self.root, self)
+        if self._ready():
+            AddDialog(self.root, self)
 
     def delete_student_prompt(self):  # Delete student
+        if not self._ready():
+            return
         key = simpledialog.askstring("Delete", "Enter student code or name:")
         if not key:
             return
-        target = None
-        for s in self.students:
-            if s['code'] == key or s['name'].lower() == key.lower():
-                target = s
-                break
-        if not target:
+        rows = self.index.name(key)
+        if len(rows) > 1:  # Several students share this name: offer to remove them all as one edit
+            if messagebox.askyesno("Confirm", f"Delete all {len(rows)} students named {key}?"):
+                with self.batch(f"Delete {len(rows)} students named {key}"):
+                    for row in rows:
+                        self.delete_student(row)
+                self.view_all_records()
+                self.status.config(text=f"Deleted {len(rows)} students (Undo restores them)")
+            return
+        row = self.index.exact(key)
+        if row is None:
             messagebox.showinfo("Delete", f"No student found for '{key}'")
             return
+        target = self.students.row(row)
         confirm = messagebox.askyesno("Confirm", f"Delete {target['code']} - {target['name']}?")
         if confirm:
-            self.students.remove(target)
-            save_students(self.students)
+            self.delete_student(row)
             self.view_all_records()
             self.status.config(text=f"Deleted {target['name']}")
 
     def update_student_prompt(self):  # Update student
+        if not self._ready():
+            return
         key = simpledialog.askstring("Update", "Enter student code or name:")
         if not key:
             return
-        found = None
-        for s in self.students:
-            if s['code'] == key or s['name'].lower() == key.lower():
-                found = s
-                break
-        if not found:
+        row = self.index.exact(key)
+        if row is None:
             messagebox.showinfo("Update", f"No student found for '{key}'")
             return
-        UpdateDialog(self.root, self, found)
+        UpdateDialog(self.root, self, row)
+
+    def show_statistics(self):  # Class-wide statistics and grade distribution
+        if not self.students:
+            messagebox.showinfo("No data", "No students loaded.")
+            return
+        stats = cohort_stats(self.students, self.metrics)
+        self._show_text()
+        self.text_widget.config(state="normal")
+        self.text_widget.delete("1.0", "end")
+        self.text_widget.insert("end", "CLASS STATISTICS\n\n", "heading")
+        self.text_widget.insert("end", format_stats(stats) + "\n")
+        self.text_widget.config(state="disabled")
+        self.status.config(text=f"Mean {stats['mean']}%, median {stats['median']}% over {stats['count']} students")
+
+    def import_prompt(self):  # Add every valid student from a CSV or JSON Lines file
+        if not self._ready():
+            return
+        path = filedialog.askopenfilename(title="Import students", filetypes=[
+            ("Student files", " ".join("*" + ext for ext in READERS)), ("All files", "*.*")])
+        if not path:
+            return
+        # The worker streams and checks the file against a copy of the codes in use; nothing changes until it is done
+        self.jobs.submit("import", self._read_import, path, self.codes.copy(), self.metrics.scheme, message="Checking import file...",
+                         on_done=self._on_import_read,
+                         on_error=lambda e: messagebox.showerror("Import failed", f"Could not import:\n{e}"))
+
+    @staticmethod
+    def _read_import(path, codes, scheme):  # Worker thread: (report, [(line number, student), ...]) for the valid rows
+        report = LoadReport(path)
+        rows = []
+        for batch in iter_import(path, codes, report, scheme=scheme):
+            rows.extend(batch)
+        return report, rows
+
+    def _on_import_read(self, result):  # Main thread: add the checked students as one edit and one save
+        report, rows = result
+        added = 0
+        with self.batch(f"Import {len(rows)} students"):
+            for lineno, s in rows:
+                if not self.codes.is_free(s["code"]):  # Taken by an edit made while the file was being read
+                    report.skipped.append((lineno, "code already exists", s["code"]))
+                    continue
+                self.add_student(s)
+                added += 1
+        if added:
+            self.view_all_records()
+        self.status.config(text=f"Imported {added} students, rejected {len(report.skipped)}")
+        if not report.skipped:
+            return
+        report.skipped.sort()
+        shown = "\n".join(f"Line {n}: {reason}" for n, reason, _ in report.skipped[:10])
+        if messagebox.askyesno("Import", f"Imported {added} students. {len(report.skipped)} rows were rejected:\n"
+                               f"{shown}\n\nSave the full list of rejected rows?"):
+            out = filedialog.asksaveasfilename(title="Save rejected rows", defaultextension=".csv",
+                                               filetypes=[("CSV files", "*.csv")])
+            if out:
+                self.jobs.submit("export", write_rejects, report.skipped, out, on_error=self._save_failed)
+
+    def export_prompt(self):  # Write every student to a CSV, JSON Lines or columnar file
+        if not self._ready():
+            return
+        path = filedialog.asksaveasfilename(title="Export students", defaultextension=".csv", filetypes=[
+            ("CSV", "*.csv"), ("JSON Lines", "*.jsonl"), ("Columnar JSON", "*.json"), ("Parquet", "*.parquet")])
+        if not path:
+            return
+        if os.path.splitext(path)[1].lower() not in EXPORTERS:
+            messagebox.showerror("Export", f"Choose one of: {', '.join(sorted(EXPORTERS))}")
+            return
+        # Copy now, on the main thread, like compaction does
+        self.jobs.submit("export", export_table, self.students.copy(), path, self.metrics.scheme, message="Exporting students...",
+                         on_done=lambda n: self.status.config(text=f"Exported {n} students to {path}"),
+                         on_error=lambda e: messagebox.showerror("Export failed", f"Could not export:\n{e}"))
 
     def show_message(self, txt):  # Show info popup
         messagebox.showinfo("Info", txt)
@@ -325,7 +872,7 @@ class AddDialog:  # Dialog window for adding a new student
         self.app = app  # Reference to main app
         self.top = tk.Toplevel(root)  # Create popup window
         self.top.title("Add Student")  # Window title
-        self.top.geometry("420x380")  # Window size
+        self.top.geometry(f"420x{240 + 46 * len(app.metrics.scheme.maxima)}")  # Taller for more marks
         self.top.transient(root)  # Keep on top of main window
         self.top.grab_set()  # Make dialog modal (block other actions)
 
@@ -333,23 +880,20 @@ class AddDialog:  # Dialog window for adding a new student
         frm.pack(padx=12, pady=12, fill="both", expand=True)
 
         # Input fields
-        tk.Label(frm, text="Student Code (1000-9999):").pack(anchor="w")
+        tk.Label(frm, text=f"Student Code ({CODE_MIN}-{CODE_MAX}):").pack(anchor="w")
         self.code_ent = tk.Entry(frm); self.code_ent.pack(fill="x")
+        suggested = app.codes.peek()  # Lowest unused code, ready to accept or overwrite
+        if suggested is not None:
+            self.code_ent.insert(0, suggested)
 
         tk.Label(frm, text="Student Name:").pack(anchor="w")
         self.name_ent = tk.Entry(frm); self.name_ent.pack(fill="x")
 
-        tk.Label(frm, text="Coursework 1 (0-20):").pack(anchor="w")
-        self.cw1 = tk.Entry(frm); self.cw1.pack(fill="x")
-
-        tk.Label(frm, text="Coursework 2 (0-20):").pack(anchor="w")
-        self.cw2 = tk.Entry(frm); self.cw2.pack(fill="x")
-
-        tk.Label(frm, text="Coursework 3 (0-20):").pack(anchor="w")
-        self.cw3 = tk.Entry(frm); self.cw3.pack(fill="x")
-
-        tk.Label(frm, text="Exam mark (0-100):").pack(anchor="w")
-        self.exam = tk.Entry(frm); self.exam.pack(fill="x")
+        self.mark_ents = []  # One entry per coursework mark in the grading scheme, then the exam
+        for label, top in zip(app.metrics.scheme.labels, app.metrics.scheme.maxima):
+            tk.Label(frm, text=f"{label} (0-{top}):").pack(anchor="w")
+            ent = tk.Entry(frm); ent.pack(fill="x")
+            self.mark_ents.append(ent)
 
         # Buttons
         tk.Button(frm, text="Add", command=self.on_add).pack(pady=10)
@@ -360,43 +904,42 @@ class AddDialog:  # Dialog window for adding a new student
         name = self.name_ent.get().strip()
 
         try:
-            cw1 = int(self.cw1.get())
-            cw2 = int(self.cw2.get())
-            cw3 = int(self.cw3.get())
-            exam = int(self.exam.get())
+            marks = [int(ent.get()) for ent in self.mark_ents]  # Coursework marks, then the exam
         except:
             messagebox.showerror("Input error", "Marks must be integers")
             return
+        new = {"code": code, "name": name, "cw": marks[:-1], "exam": marks[-1]}
 
-        if not code.isdigit() or not (1000 <= int(code) <= 9999):
-            messagebox.showerror("Input error", "Code must be 1000–9999")
+        if not self.app.codes.in_range(code):
+            messagebox.showerror("Input error", f"Code must be {CODE_MIN}–{CODE_MAX}")
             return
 
-        if any(not (0 <= m <= 20) for m in (cw1, cw2, cw3)) or not (0 <= exam <= 100):
+        if self.app.metrics.scheme.check(new):  # Each mark within the scheme's maximum
             messagebox.showerror("Input error", "Marks out of range")
             return
 
-        for s in self.app.students:
-            if s['code'] == code:
-                messagebox.showerror("Input error", "Code already exists")
-                return
+        if self.app.index.code(code) is not None:
+            if self.app.codes.exhausted():
+                messagebox.showerror("Input error", f"Every code from {CODE_MIN} to {CODE_MAX} is in use")
+            else:
+                messagebox.showerror("Input error", f"Code already exists (next free code: {self.app.codes.peek()})")
+            return
 
-        new = {"code": code, "name": name, "cw": [cw1, cw2, cw3], "exam": exam}
-        self.app.students.append(new)
-        save_students(self.app.students)
+        self.app.add_student(new)
         self.app.view_all_records()
         self.app.status.config(text=f"Added {name}")
         self.top.destroy()
 
 # Update Dialog
 class UpdateDialog:  # Dialog window for updating student info
-    def __init__(self, root, app, student):
+    def __init__(self, root, app, row):
         self.app = app
-        self.student = student
+        self.row = row  # Row id of the student in the table
+        student = app.students.row(row)
 
         self.top = tk.Toplevel(root)  # Popup window
         self.top.title(f"Update {student['code']} - {student['name']}")  # Title with student info
-        self.top.geometry("420x420")  # Window size
+        self.top.geometry(f"420x{280 + 46 * len(app.metrics.scheme.maxima)}")  # Taller for more marks
         self.top.transient(root)
         self.top.grab_set()
 
@@ -412,21 +955,13 @@ class UpdateDialog:  # Dialog window for updating student info
         self.name_ent = tk.Entry(frm); self.name_ent.pack(fill="x")
         self.name_ent.insert(0, student['name'])
 
-        tk.Label(frm, text="Coursework 1 (0-20):").pack(anchor="w")
-        self.cw1 = tk.Entry(frm); self.cw1.pack(fill="x")
-        self.cw1.insert(0, str(student['cw'][0]))
-
-        tk.Label(frm, text="Coursework 2 (0-20):").pack(anchor="w")
-        self.cw2 = tk.Entry(frm); self.cw2.pack(fill="x")
-        self.cw2.insert(0, str(student['cw'][1]))
-
-        tk.Label(frm, text="Coursework 3 (0-20):").pack(anchor="w")
-        self.cw3 = tk.Entry(frm); self.cw3.pack(fill="x")
-        self.cw3.insert(0, str(student['cw'][2]))
-
-        tk.Label(frm, text="Exam mark (0-100):").pack(anchor="w")
-        self.exam = tk.Entry(frm); self.exam.pack(fill="x")
-        self.exam.insert(0, str(student['exam']))
+        self.mark_ents = []  # One entry per coursework mark in the grading scheme, then the exam
+        scheme = app.metrics.scheme
+        for label, top, mark in zip(scheme.labels, scheme.maxima, student['cw'] + [student['exam']]):
+            tk.Label(frm, text=f"{label} (0-{top}):").pack(anchor="w")
+            ent = tk.Entry(frm); ent.pack(fill="x")
+            ent.insert(0, str(mark))
+            self.mark_ents.append(ent)
 
         # Buttons
         tk.Button(frm, text="Save", command=self.on_save).pack(pady=10)
@@ -437,34 +972,28 @@ class UpdateDialog:  # Dialog window for updating student info
         name = self.name_ent.get().strip()
 
         try:
-            cw1 = int(self.cw1.get())
-            cw2 = int(self.cw2.get())
-            cw3 = int(self.cw3.get())
-            exam = int(self.exam.get())
+            marks = [int(ent.get()) for ent in self.mark_ents]  # Coursework marks, then the exam
         except:
             messagebox.showerror("Input error", "Marks must be integers")
             return
+        new = {"code": code, "name": name, "cw": marks[:-1], "exam": marks[-1]}
 
-        if not code.isdigit() or not (1000 <= int(code) <= 9999):
-            messagebox.showerror("Input error", "Code must be 1000–9999")
+        if not self.app.codes.in_range(code):
+            messagebox.showerror("Input error", f"Code must be {CODE_MIN}–{CODE_MAX}")
             return
 
-        if any(not (0 <= m <= 20) for m in (cw1, cw2, cw3)) or not (0 <= exam <= 100):
+        if self.app.metrics.scheme.check(new):  # Each mark within the scheme's maximum
             messagebox.showerror("Input error", "Marks out of range")
             return
 
-        for s in self.app.students:
-            if s is not self.student and s['code'] == code:
-                messagebox.showerror("Input error", "Another student has this code")
-                return
+        other = self.app.index.code(code)
+        if other is not None and other != self.row:
+            messagebox.showerror("Input error", "Another student has this code")
+            return
 
         # Update student info
-        self.student['code'] = code
-        self.student['name'] = name
-        self.student['cw'] = [cw1, cw2, cw3]
-        self.student['exam'] = exam
+        self.app.update_student(self.row, new)
 
-        save_students(self.app.students)
         self.app.view_all_records()
         self.app.status.config(text=f"Updated {name}")
         self.top.destroy()
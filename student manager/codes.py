@@ -0,0 +1,86 @@
+# STUDENT CODES
+
+# Bitmap of the student code range, so the next free code is found without trying numbers one by one
+CODE_MIN = 1000  # Lowest student code AddDialog accepts
+CODE_MAX = 9999  # Highest student code AddDialog accepts
+
+
+class CodeAllocator:  # Which codes in [low, high] are taken, lowest free code first
+    def __init__(self, used=(), low=CODE_MIN, high=CODE_MAX):
+        self.low = low
+        self.high = high
+        self.taken = bytearray(high - low + 1)  # 1 where that code is in use
+        self.free = len(self.taken)  # Codes still available
+        self.first = 0  # No free code sits below this slot, so searches start here
+        for code in used:
+            self.take(code)
+
+    def _slot(self, code):  # Bitmap position of a code, or None if it is not a number in range
+        if not code.isdigit():
+            return None
+        k = int(code) - self.low
+        return k if 0 <= k < len(self.taken) else None
+
+    def in_range(self, code):
+        return self._slot(code) is not None
+
+    def is_free(self, code):
+        k = self._slot(code)
+        return k is not None and not self.taken[k]
+
+    def take(self, code):  # Mark a code as used (codes outside the range are ignored)
+        k = self._slot(code)
+        if k is not None and not self.taken[k]:
+            self.taken[k] = 1
+            self.free -= 1
+
+    def release(self, code):  # A student with this code was deleted or renumbered
+        k = self._slot(code)
+        if k is not None and self.taken[k]:
+            self.taken[k] = 0
+            self.free += 1
+            self.first = min(self.first, k)
+
+    def peek(self):  # Lowest free code as a string, or None when the range is full
+        k = self.taken.find(0, self.first)  # C-speed scan that only ever moves forward
+        if k < 0:
+            self.first = len(self.taken)
+            return None
+        self.first = k
+        return str(self.low + k)
+
+    def allocate(self):  # Take and return the lowest free code
+        code = self.peek()
+        if code is None:
+            raise ValueError(f"no free student codes left in {self.low}-{self.high}")
+        self.take(code)
+        return code
+
+    def exhausted(self):
+        return self.free == 0
+
+    def copy(self):  # Independent allocator with the same codes taken (e.g. for checking an import off-thread)
+        other = CodeAllocator((), self.low, self.high)
+        other.taken[:] = self.taken
+        other.free, other.first = self.free, self.first
+        return other
+
+
+def resolve_duplicates(table, codes):  # Give every repeated code after the first a free one, in a single pass
+    seen = set()  # Returns (rows renumbered, duplicates left because the range is full)
+    changed = left = 0
+    for i in list(table.row_ids()):
+        code = table.codes[i]
+        if code not in seen:
+            seen.add(code)
+            continue
+        new = codes.peek()
+        if new is None:  # Range is full: leave the duplicate for the user to fix
+            left += 1
+            continue
+        codes.take(new)
+        s = table.row(i)
+        s["code"] = new
+        table.update(i, s)
+        changed += 1
+    return changed, left
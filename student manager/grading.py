@@ -0,0 +1,183 @@
+# GRADING SCHEMES
+
+# How marks become an overall percentage and a grade, configured per module in schemes.json.
+# A scheme has any number of coursework marks and one exam, each with a maximum and a weight, plus grade bands.
+# Weights are turned into whole "points" per mark, so a student's result depends only on their points total:
+# percentages and grades are then read from tables indexed by that total, built once when the scheme loads.
+import json  # Scheme configuration file
+import os  # Checking the configuration exists
+from array import array  # Points columns
+from bisect import bisect_right  # Grade band search
+from fractions import Fraction  # Exact weight per mark
+from math import gcd, lcm  # Smallest whole points per mark
+from operator import mul  # Marks x points, element by element
+from optional import np  # NumPy for points columns, or None (then totals() sums in Python)
+
+SCHEMES_FILE = "student manager/schemes.json"  # Grading schemes shared by the GUI and the command-line tools
+TABLE_LIMIT = 1000000  # Largest points total given lookup tables; bigger schemes work results out per call
+CW_MAX = 20  # Coursework maximum when a scheme does not say
+EXAM_MAX = 100  # Exam maximum when a scheme does not say
+STANDARD_BANDS = {"A": 70, "B": 60, "C": 50, "D": 40}  # Lowest percentage for each grade
+FAIL = "F"  # Grade below every band
+
+
+class Scheme:  # One compiled grading scheme
+    def __init__(self, name, components, bands=STANDARD_BANDS, fail=FAIL):
+        # components: (label, maximum mark, weight) for each coursework mark, then the exam last
+        if len(components) < 2:
+            raise ValueError(f"scheme {name}: needs at least one coursework mark and an exam")
+        self.name = name
+        self.labels = [c[0] for c in components]
+        self.maxima = [int(c[1]) for c in components]
+        weights = [Fraction(str(c[2])) for c in components]  # str() keeps 0.1 as exactly 1/10
+        if any(m <= 0 for m in self.maxima) or any(w < 0 for w in weights) or not sum(weights):
+            raise ValueError(f"scheme {name}: maximum marks must be positive and weights must not all be zero")
+        self.cw_count = len(components) - 1
+
+        # Weight per mark as whole numbers: the smallest integers in the same ratio
+        per_mark = [w / m for w, m in zip(weights, self.maxima)]
+        scale = lcm(*(f.denominator for f in per_mark))
+        points = [int(f * scale) for f in per_mark]
+        step = gcd(*points)
+        self.points = [p // step for p in points]  # Points each mark is worth, per component
+        self.max_points = sum(map(mul, self.points, self.maxima))
+        self.raw = len(set(self.points)) == 1  # Unweighted: points are just the mark total
+
+        # Grade bands, searched with bisect: grades[k] applies from cutoffs[k - 1] up to cutoffs[k]
+        ordered = sorted(bands.items(), key=lambda b: b[1])
+        self.cutoffs = [c for _, c in ordered]
+        self.grades = [fail] + [g for g, _ in ordered]
+        self.letters = self.grades[::-1]  # Best grade first, for reports
+
+        # Lookup tables indexed by points total
+        self.percents = self.grade_table = None
+        if self.max_points <= TABLE_LIMIT:
+            self.percents = [self._percent(t) for t in range(self.max_points + 1)]
+            self.grade_table = [self.grade_from_percent(p) for p in self.percents]
+
+    def __repr__(self):
+        return f"Scheme({self.name!r}, {self.cw_count} coursework, out of {self.max_points} points)"
+
+    # Single results
+    def _percent(self, total):
+        return round(total / self.max_points * 100, 2)
+
+    def grade_from_percent(self, p):  # Grade band a percentage falls in
+        return self.grades[bisect_right(self.cutoffs, p)]
+
+    def percent_for(self, total):  # Percentage for a points total, from the table when possible
+        if self.percents is not None and 0 <= total <= self.max_points:
+            return self.percents[total]
+        return self._percent(total)
+
+    def grade_for(self, total):  # Grade for a points total, from the table when possible
+        if self.grade_table is not None and 0 <= total <= self.max_points:
+            return self.grade_table[total]
+        return self.grade_from_percent(self._percent(total))
+
+    def cents_for(self, total):  # Percentage in hundredths, so sums stay exact integers
+        return round(self.percent_for(total) * 100)
+
+    def total(self, cw, exam):  # Points total for one student's marks
+        return sum(map(mul, self.points, cw)) + self.points[-1] * exam
+
+    def percent(self, s):  # Overall percentage of a student dictionary
+        return self.percent_for(self.total(s["cw"], s["exam"]))
+
+    def grade(self, s):
+        return self.grade_for(self.total(s["cw"], s["exam"]))
+
+    def check(self, s):  # Why the student's marks do not fit this scheme, or None
+        if len(s["cw"]) != self.cw_count:
+            return f"expected {self.cw_count} coursework marks, found {len(s['cw'])}"
+        marks = s["cw"] + [s["exam"]]
+        if any(not (0 <= m <= top) for m, top in zip(marks, self.maxima)):
+            return "marks out of range"
+        return None
+
+    # Whole columns
+    def totals(self, cw, exam):  # Points total for every row of the mark columns
+        if np is not None and len(exam):
+            total = np.frombuffer(exam, dtype=np.intc).astype(np.int64) * self.points[-1]
+            for col, k in zip(cw, self.points):
+                total += np.frombuffer(col, dtype=np.intc) * k
+            return array("q", total.tobytes())
+        if self.raw:
+            return array("q", map(sum, zip(*cw, exam)))
+        k = self.points
+        return array("q", (sum(map(mul, k, marks)) for marks in zip(*cw, exam)))
+
+    def grade_columns(self, cw, exam):  # (points totals, percentages, grades) for whole mark columns
+        totals = self.totals(cw, exam)
+        if self.percents is not None and (not totals or (min(totals) >= 0 and max(totals) <= self.max_points)):
+            return totals, list(map(self.percents.__getitem__, totals)), list(map(self.grade_table.__getitem__, totals))
+        return totals, list(map(self.percent_for, totals)), list(map(self.grade_for, totals))
+
+
+def standard_scheme(cw_count=3, name="standard"):  # Unweighted marks: coursework out of 20 each, exam out of 100
+    components = [(f"Coursework {k}", CW_MAX, CW_MAX) for k in range(1, cw_count + 1)]
+    return Scheme(name, components + [("Exam mark", EXAM_MAX, EXAM_MAX)])
+
+
+STANDARD = standard_scheme()  # The original 3 x 20 + 100 = 160 marks scheme
+
+
+def scheme_from_config(name, cfg):  # Scheme from one entry of schemes.json
+    try:
+        parts = [(c.get("name", f"Coursework {k}"), c.get("max", CW_MAX), c.get("weight", c.get("max", CW_MAX)))
+                 for k, c in enumerate(cfg["coursework"], 1)]  # Weight defaults to the maximum: marks count as they are
+        exam = cfg.get("exam", {})
+        top = exam.get("max", EXAM_MAX)
+        parts.append((exam.get("name", "Exam mark"), top, exam.get("weight", top)))
+        return Scheme(name, parts, cfg.get("bands", STANDARD_BANDS), cfg.get("fail", FAIL))
+    except (KeyError, TypeError, AttributeError) as e:
+        raise ValueError(f"scheme {name}: bad entry ({e})") from None
+
+
+def load_schemes(path=SCHEMES_FILE):  # ({name: Scheme}, default scheme name) from the configuration file
+    if not os.path.exists(path):
+        return {STANDARD.name: STANDARD}, STANDARD.name
+    with open(path, encoding="utf-8") as f:
+        try:
+            cfg = json.load(f)
+        except ValueError as e:
+            raise ValueError(f"{path}: {e}") from None
+    schemes = {name: scheme_from_config(name, entry) for name, entry in cfg.get("schemes", {}).items()}
+    schemes.setdefault(STANDARD.name, STANDARD)
+    default = cfg.get("default", STANDARD.name)
+    if default not in schemes:
+        raise ValueError(f"{path}: default scheme {default!r} is not defined")
+    return schemes, default
+
+
+def pick_scheme(schemes, name, cw_count):  # The named scheme if it fits the data, else one that does
+    if schemes[name].cw_count == cw_count:
+        return schemes[name]
+    for scheme in schemes.values():
+        if scheme.cw_count == cw_count:
+            return scheme
+    return standard_scheme(cw_count, f"standard-{cw_count}")
+
+
+# Command-line tools
+def chosen_schemes(requested=None):  # ({name: Scheme}, scheme name) for a --scheme option, or ValueError
+    try:
+        schemes, name = load_schemes()
+    except OSError as e:
+        raise ValueError(f"Could not read grading schemes: {e}") from None
+    if requested is None:
+        return schemes, name
+    if requested not in schemes:
+        raise ValueError(f"Unknown grading scheme {requested!r} (choose from {', '.join(sorted(schemes))})")
+    return schemes, requested
+
+
+def fit_scheme(schemes, name, cw_count, named=False):  # (scheme, note): pick_scheme, with a note when it used another
+    # named=True means the user asked for this scheme by name: a file it does not fit is an error, not a substitution
+    scheme = pick_scheme(schemes, name, cw_count)
+    if scheme is schemes[name]:
+        return scheme, None
+    why = f"the {name} scheme expects {schemes[name].cw_count} coursework marks, not {cw_count}"
+    if named:
+        raise ValueError(why)
+    return scheme, f"{why}; graded with the {scheme.name} scheme"
@@ -0,0 +1,77 @@
+# EDIT HISTORY
+
+# Undo/redo stacks of small diff records. Undoing replays the inverse edits, so nothing is reloaded.
+# Records are keyed by student code (row ids change when rows are re-added):
+#   ("A", student)          student was added
+#   ("D", student)          student was deleted
+#   ("U", before, after)    student changed from before to after
+HISTORY_LIMIT = 100  # Undo steps kept
+
+
+def inverse(op):  # The diff record that cancels op
+    if op[0] == "A":
+        return ("D", op[1])
+    if op[0] == "D":
+        return ("A", op[1])
+    return ("U", op[2], op[1])
+
+
+def describe(op):  # Short label for a single edit
+    verb = {"A": "Add", "D": "Delete", "U": "Update"}[op[0]]
+    return f"{verb} {op[-1]['name']}"
+
+
+class History:  # Steps of one or more diff records, newest last
+    def __init__(self, limit=HISTORY_LIMIT):
+        self.limit = limit  # Oldest steps are dropped beyond this
+        self.undo_steps = []  # (label, [record, ...]) in the order they happened
+        self.redo_steps = []  # Steps undone since the last new edit
+        self.replaying = False  # True while undo/redo applies records, so they are not logged again
+        self._open = None  # Step being collected between begin() and end()
+        self._depth = 0  # Nesting level of begin()
+
+    def clear(self):  # Forget everything (after the data is reloaded)
+        self.undo_steps.clear()
+        self.redo_steps.clear()
+
+    # Recording
+    def begin(self, label=None):  # Start collecting several edits into one step
+        if self._depth == 0:
+            self._open = (label, [])
+        self._depth += 1
+
+    def end(self):
+        self._depth -= 1
+        if self._depth == 0:
+            label, ops = self._open
+            self._open = None
+            if ops:
+                self._push(label or (describe(ops[0]) if len(ops) == 1 else f"{len(ops)} edits"), ops)
+
+    def record(self, op):  # Log one edit
+        if self.replaying:
+            return
+        if self._open is not None:
+            self._open[1].append(op)
+        else:
+            self._push(describe(op), [op])
+
+    def _push(self, label, ops):
+        self.undo_steps.append((label, ops))
+        del self.undo_steps[:-self.limit]
+        self.redo_steps.clear()  # A new edit starts a new branch of history
+
+    # Stepping (the caller applies the returned records)
+    def undo(self):  # (label, records that reverse the newest step), or None
+        if not self.undo_steps:
+            return None
+        label, ops = self.undo_steps.pop()
+        self.redo_steps.append((label, ops))
+        return label, [inverse(op) for op in reversed(ops)]
+
+    def redo(self):  # (label, records that repeat the newest undone step), or None
+        if not self.redo_steps:
+            return None
+        label, ops = self.redo_steps.pop()
+        self.undo_steps.append((label, ops))
+        return label, ops
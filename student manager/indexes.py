@@ -0,0 +1,143 @@
+# STUDENT INDEXES
+
+# Lookup structures for student codes and names, kept in step with a StudentTable
+from array import array  # Compact posting lists of row ids
+from bisect import bisect_left  # Inserting into sorted posting lists
+from heapq import merge  # Several posting lists as one, still in row order
+
+GRAM = 3  # Length of the n-grams used for substring search
+
+
+def grams(text):  # Set of n-grams in an already case-folded string
+    return {text[k:k + GRAM] for k in range(len(text) - GRAM + 1)}
+
+
+def _unique(rows):  # Drop repeats from row ids that arrive in order
+    last = None
+    for i in rows:
+        if i != last:
+            yield i
+            last = i
+
+
+class StudentIndex:  # Exact and substring lookups over a StudentTable
+    def __init__(self, table):
+        self.table = table  # Table whose row ids this index stores
+        self.rebuild()
+
+    def rebuild(self):  # Build every index from scratch (after load, sort or compact)
+        t = self.table
+        self.folded = [name.casefold() for name in t.names]  # Case-folded name per row id
+        self.by_name = {}  # Case-folded name -> row ids with that exact name
+        for i in t.row_ids():
+            self.by_name.setdefault(self.folded[i], []).append(i)
+        self.by_gram = None  # Trigram -> sorted row ids; built on the first substring search
+        self.short = {i for i in t.row_ids() if len(self.folded[i]) < GRAM}  # Names too short to have a trigram
+        self.stale = 0  # Postings left behind by deletes and renames
+        self.generation = t.generation
+
+    def _build_grams(self):  # Trigram postings are the slow part of a rebuild, so build them on demand
+        self.by_gram = by_gram = {}
+        folded = self.folded
+        for i in self.table.row_ids():
+            for g in grams(folded[i]):
+                postings = by_gram.get(g)
+                if postings is None:
+                    postings = by_gram[g] = array("i")
+                postings.append(i)  # Row ids arrive in order, so every list stays sorted
+        return by_gram
+
+    def warm(self):  # Build the trigram postings now, e.g. on a worker thread before the index is shared
+        if self.by_gram is None:
+            self._build_grams()
+
+    def _sync(self):  # Rebuild if the table renumbered its rows behind our back
+        if self.generation != self.table.generation:
+            self.rebuild()
+            return True
+        return False
+
+    # Maintenance (call remove() before changing a row and add() after)
+    def add(self, i):  # Index row i as it is now in the table
+        if self._sync():  # A fresh rebuild already picked the row up
+            return
+        f = self.table.names[i].casefold()
+        if i == len(self.folded):
+            self.folded.append(f)
+        else:
+            self.folded[i] = f
+        self.by_name.setdefault(f, []).append(i)
+        if len(f) < GRAM:
+            self.short.add(i)
+        for g in (grams(f) if self.by_gram is not None else ()):
+            postings = self.by_gram.setdefault(g, array("i"))
+            k = bisect_left(postings, i)
+            if k == len(postings) or postings[k] != i:  # Row may still be listed from an older name
+                postings.insert(k, i)
+
+    def remove(self, i):  # Forget row i (posting lists are cleaned lazily)
+        self._sync()
+        if self.stale > len(self.table):  # Too much dead weight in the postings: start again
+            self.rebuild()
+        f = self.folded[i]
+        rows = self.by_name.get(f, [])
+        if i in rows:
+            rows.remove(i)
+            if not rows:
+                del self.by_name[f]
+        self.stale += 1
+
+    # Lookups (all return row ids)
+    def code(self, code):  # Exact student code
+        return self.table.find(code)
+
+    def name(self, name):  # Exact name, ignoring case
+        self._sync()
+        return sorted(self.by_name.get(name.casefold(), ()))
+
+    def exact(self, key):  # First row whose code or full name matches key
+        self._sync()
+        rows = self.name(key)
+        code_row = self.code(key)
+        if code_row is not None:
+            rows.append(code_row)
+        return min(rows) if rows else None
+
+    def search(self, text, limit=None):  # Rows whose name contains text, in row order
+        self._sync()
+        text = text.casefold()
+        by_gram = self.by_gram if self.by_gram is not None else self._build_grams()
+        alive, folded = self.table.alive, self.folded
+        if not text:  # Everything matches
+            candidates = self.table.row_ids()
+        elif len(text) < GRAM:  # One or two characters: every trigram holding them, plus the shortest names
+            postings = [p for g, p in by_gram.items() if text in g]
+            if sum(map(len, postings)) > len(folded) // 4:  # Common piece: a scan reaches the limit sooner
+                candidates = self.table.row_ids()
+            else:
+                candidates = _unique(merge(*postings, sorted(self.short)))
+        else:
+            postings = [by_gram.get(g) for g in grams(text)]
+            if any(p is None for p in postings):  # Some trigram appears in no name at all
+                return []
+            candidates = min(postings, key=len)  # Verify against the rarest trigram's rows
+        out = []
+        for i in candidates:
+            if alive[i] and text in folded[i]:  # Drops deleted rows and stale postings
+                out.append(i)
+                if limit and len(out) >= limit:
+                    break
+        return out
+
+    def narrow(self, rows, text):  # Rows from an earlier search that still contain text (for a longer query)
+        self._sync()
+        text = text.casefold()
+        alive, folded = self.table.alive, self.folded
+        return [i for i in rows if alive[i] and text in folded[i]]
+
+    def lookup(self, key):  # First row matching code, exact name or part of a name
+        rows = self.search(key, limit=1)
+        exact = self.exact(key)
+        if exact is not None:
+            rows.append(exact)
+        return min(rows) if rows else None
@@ -0,0 +1,72 @@
+# BACKGROUND JOBS
+
+# Runs file I/O off the Tk main thread and hands results back through root.after
+import queue  # Thread-safe mailbox from the worker to the main thread
+from concurrent.futures import ThreadPoolExecutor  # Worker thread
+
+POLL_MS = 50  # How often the main thread checks for finished jobs while any are running
+
+
+class JobRunner:  # One worker thread, so jobs run one at a time in the order they were submitted
+    def __init__(self, root, status=None):
+        self.root = root  # Tk root, used to schedule callbacks on the main thread
+        self.status = status  # Optional Label that shows job progress
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="student-jobs")
+        self.messages = queue.Queue()  # (kind, job, value) posted by the worker
+        self.running = {}  # Job kind -> number submitted but not finished
+        self._polling = False
+        self.closed = False  # Set by shutdown(); later submits are ignored
+
+    def submit(self, kind, fn, *args, on_done=None, on_error=None, message=None, progress=False):
+        # fn runs on the worker. With progress=True it also gets a progress(text) keyword argument.
+        if self.closed:  # Shutting down: callbacks delivered by shutdown() must not start follow-up jobs
+            return
+        job = {"kind": kind, "on_done": on_done, "on_error": on_error}
+        self.running[kind] = self.running.get(kind, 0) + 1
+        if message:
+            self._show(message)
+        kwargs = {"progress": lambda text: self.messages.put(("progress", job, text))} if progress else {}
+        self.executor.submit(self._run, job, fn, args, kwargs)
+        if not self._polling:
+            self._polling = True
+            self.root.after(POLL_MS, self._poll)
+
+    def _run(self, job, fn, args, kwargs):  # Worker thread: never touches Tk
+        try:
+            self.messages.put(("done", job, fn(*args, **kwargs)))
+        except Exception as e:  # Hand every failure back to the main thread
+            self.messages.put(("error", job, e))
+
+    def _poll(self):  # Main thread: deliver progress and results
+        while True:
+            try:
+                kind, job, value = self.messages.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                self._show(value)
+                continue
+            self.running[job["kind"]] -= 1
+            callback = job["on_done"] if kind == "done" else job["on_error"]
+            if callback is not None:
+                callback(value)
+            elif kind == "error":
+                self._show(f"Error: {value}")
+        if any(self.running.values()):
+            self.root.after(POLL_MS, self._poll)
+        else:
+            self._polling = False
+
+    def _show(self, text):
+        if self.status is not None:
+            self.status.config(text=text)
+
+    def busy(self, kind=None):  # True while a job (of this kind) is queued or running
+        if kind is None:
+            return any(self.running.values())
+        return self.running.get(kind, 0) > 0
+
+    def shutdown(self):  # Wait for queued jobs to finish, then stop the worker
+        self.closed = True
+        self.executor.shutdown(wait=True)
+        self._poll()  # Deliver whatever finished while we waited
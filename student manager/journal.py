@@ -0,0 +1,274 @@
+# EDIT JOURNAL
+
+# Append-only log of add/update/delete operations, folded back into the marks file by compact()
+import os  # File stats, fsync and removal
+from marks import DATA_FILE, parse_student, save_students, student_line  # Shared data utilities
+from snapshot import file_digest  # Content hash of the marks file
+
+JOURNAL_LIMIT = 500  # Compact once this many operations are waiting in the journal
+
+
+def file_stat(path):  # (size, mtime, inode) of a file, or None if it does not exist
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_size, st.st_mtime_ns, st.st_ino  # Every atomic rewrite is a new inode, however coarse mtime is
+
+
+def file_signature(path):  # Size and content hash identify one version of a file, whatever its mtime says
+    try:
+        return f"{os.path.getsize(path)}:{file_digest(path).hex()}"
+    except FileNotFoundError:
+        return "0:0"
+
+
+def header_line(base, parent=None, folded=0):  # First line of a new journal, as bytes
+    # "# base SIG id ID" names the marks file version the operations apply to, and this journal.
+    # After a compaction it adds "from OLD N": the file holds the first N bytes of journal OLD.
+    text = f"# base {base} id {os.urandom(6).hex()}" + (f" from {parent} {folded}" if parent else "")
+    return (text + "\n").encode("utf-8")
+
+
+def parse_header(raw):  # (base, journal id, parent id, folded) from a journal's first line, or None
+    parts = raw.decode("utf-8", "replace").split()
+    if len(parts) < 3 or parts[:2] != ["#", "base"]:
+        return None
+    fields = dict(zip(parts[3::2], parts[4::2]))  # "id ID" and "from OLD", in any order
+    folded = parts[parts.index("from") + 2] if "from" in parts[3:-2] else "0"
+    return parts[2], fields.get("id"), fields.get("from"), int(folded) if folded.isdigit() else 0
+
+
+def line_codes(line):  # Student codes one journal line touches
+    kind, _, rest = line.partition(",")
+    parts = rest.split(",", 2)
+    return {parts[0], parts[1]} if kind == "U" and len(parts) > 1 else {parts[0]}
+
+
+class Journal:  # Operations since the last full write of the marks file
+    def __init__(self, path=DATA_FILE, limit=JOURNAL_LIMIT):
+        self.path = path  # Marks file the journal applies to
+        self.log_path = path + ".journal"  # Journal lives beside it
+        self.limit = limit  # Pending operations allowed before compacting
+        self.pending = 0  # Operations written since the last compaction
+        self.valid = False  # True once the journal on disk is known to match the marks file
+        self.base = None  # Signature of the marks file version the table in memory started from
+        self.offset = 0  # Bytes of the journal already applied (read, or written by us)
+        self._own = []  # (start, end) byte ranges we appended beyond offset, after someone else's lines
+        self._seen = None  # (stat, signature) of the marks file when it was last hashed
+        self.stale = 0  # Lines in a journal that no longer matched the marks file when it was replayed
+        self._writes = []  # (journal id, end offset, codes) of our writes not yet known to be in the marks file
+        self.lost = set()  # Codes of our writes that the last replayed version of the marks file did not take in
+
+    def _signature(self):  # Signature of the marks file now, hashing it again only if its stat changed
+        stat = file_stat(self.path)  # Taken before hashing, so a change during the hash is seen next time
+        if self._seen is not None and stat is not None and self._seen[0] == stat:
+            return self._seen[1]  # A touch or a no-op save changes the stat but not the signature
+        signature = file_signature(self.path)
+        self._seen = (stat, signature)
+        return signature
+
+    # Reading
+    def replay(self, table, report=None, set_aside=True):  # Apply the journal to a freshly loaded table
+        # set_aside=False leaves a stale journal where it is (read-only callers); its size is still in self.stale
+        self.pending = 0
+        self.valid = False
+        self.base = self._signature()
+        self.offset = 0
+        self._own = []
+        self.stale = 0
+        writes, self._writes = self._writes, []
+        if not os.path.exists(self.log_path):
+            self.lost = set().union(*(codes for _, _, codes in writes))  # Marks file replaced and journal gone
+            return 0
+        with open(self.log_path, "rb") as f:
+            # The header names the marks file version the operations were written against.
+            # If the content changed since (a crash right after compaction, or an edit by hand) they cannot be applied.
+            header = f.readline()
+            base, journal_id, parent, folded = parse_header(header) or (None, None, None, 0)
+            if base != self.base:
+                journal_id = parent = None  # Stale journal: none of its lines count
+            # Our earlier writes are in this version if they are in its journal or were folded into the file
+            self.lost = set().union(*(codes for written_to, end, codes in writes
+                                      if written_to is None or (written_to != journal_id and
+                                                                (written_to != parent or end > folded))))
+            if base != self.base:
+                self.stale = sum(1 for raw in f if raw.endswith(b"\n"))
+                self.offset = f.tell()  # Only a change of size matters now
+            else:
+                self.valid = True
+                self.offset = len(header)
+                for lineno, raw in enumerate(f, 2):
+                    if not raw.endswith(b"\n"):  # Torn final write from a crash: ignore it
+                        break
+                    self.offset += len(raw)
+                    line = raw.decode("utf-8").rstrip("\n")
+                    try:
+                        self.apply(table, line)
+                    except ValueError as e:
+                        if report is not None:
+                            report.skipped.append((lineno, f"journal: {e}", line.strip()))
+                        continue
+                    self.pending += 1
+        if self.stale and set_aside:
+            self._set_aside(report)
+        return self.pending
+
+    def _set_aside(self, report):  # Keep a stale journal's lines for the user instead of dropping them
+        kept = self.log_path + ".stale"
+        with open(self.log_path, "rb") as f, open(kept, "ab") as out:  # Added to any older stale lines
+            out.write(f.read())
+        os.remove(self.log_path)  # The next write starts a fresh journal
+        self.offset = 0
+        if report is not None:
+            report.skipped.append((1, f"journal: {self.stale} edits were written against a different version of "
+                                      f"the marks file and were not applied (kept in {os.path.basename(kept)})", ""))
+
+    def check(self):  # What changed on disk since we last looked: "rewrite", "append" or None
+        if self._signature() != self.base:
+            return "rewrite"  # Marks file replaced (compacted elsewhere or edited by hand)
+        size = self._log_size()
+        if size == self.offset:
+            return None
+        return "append" if self.valid and size > self.offset else "rewrite"
+
+    def _current_header(self):  # Header line of the journal on disk if it matches the marks file now, else None
+        try:
+            with open(self.log_path, "rb") as f:
+                header = f.readline()
+        except FileNotFoundError:
+            return None
+        fields = parse_header(header)
+        if fields is None or fields[0] != self._signature():
+            return None
+        return header
+
+    def read_new(self):  # (line, written by us) for every complete line appended since we last looked
+        with open(self.log_path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read()
+        end = data.rfind(b"\n") + 1  # A line still being written is left for next time
+        lines, pos = [], self.offset
+        for raw in data[:end].splitlines(keepends=True):
+            mine = any(start <= pos < stop for start, stop in self._own)  # Ours, interleaved with theirs
+            lines.append((raw.decode("utf-8").rstrip("\n"), mine))
+            if not mine:
+                self.pending += 1
+            pos += len(raw)
+        self.offset += end
+        self._own = [r for r in self._own if r[1] > self.offset]
+        return lines
+
+    @staticmethod
+    def apply(table, line):  # Apply one journal line to a table
+        kind, _, rest = line.partition(",")
+        if kind == "A":  # A,<student line>
+            table.add(parse_student(rest))
+        elif kind == "U":  # U,<old code>,<student line>
+            old, _, rest = rest.partition(",")
+            row = table.find(old)
+            if row is None:
+                raise ValueError(f"no student {old} to update")
+            table.update(row, parse_student(rest))
+        elif kind == "D":  # D,<code>
+            row = table.find(rest)
+            if row is None:
+                raise ValueError(f"no student {rest} to delete")
+            table.delete(row)
+        else:
+            raise ValueError(f"unknown operation {kind!r}")
+
+    # Writing
+    @staticmethod
+    def add_line(s):  # Journal lines for each operation, so several can go out in one write()
+        return "A," + student_line(s)
+
+    @staticmethod
+    def update_line(old_code, s):
+        return f"U,{old_code}," + student_line(s)
+
+    @staticmethod
+    def delete_line(code):
+        return f"D,{code}"
+
+    def write(self, lines):  # Append operation lines and flush them to disk in one go
+        data = "".join(line + "\n" for line in lines).encode("utf-8")
+        if not self.valid:  # Someone sharing the file may already have started a journal for it
+            header = self._current_header()
+            if header is not None:
+                self.valid = True
+                self.offset, self._own = len(header), []  # Their lines are read by read_new()
+        mode = "a+b" if self.valid else "wb"  # Start a fresh journal if the old one no longer applies
+        with open(self.log_path, mode) as f:
+            if self.valid:  # Appending: note which version the journal belongs to now
+                f.seek(0)
+                journal_id = (parse_header(f.readline()) or (None, None))[1]
+            else:
+                header = header_line(self._signature())
+                journal_id = parse_header(header)[1]
+                f.write(header)
+                self.offset, self._own = len(header), []
+            f.write(data)  # Always at the end, whatever was read
+            f.flush()
+            os.fsync(f.fileno())
+            end = f.tell()
+        if end - len(data) == self.offset:  # Nobody else appended in between
+            self.offset = end
+        else:
+            self._own.append((end - len(data), end))
+        self.valid = True
+        self.pending += len(lines)
+        self._writes.append((journal_id, end, set().union(*map(line_codes, lines))))
+
+    # Compaction
+    def due(self):  # True when the journal is long enough to fold into the marks file
+        return self.pending >= self.limit
+
+    def compact(self, table):  # Rewrite the marks file from the table and start an empty journal
+        # Lines someone else appended since we last looked are applied to the table first, so the rewrite keeps
+        # them; they are returned as (line, False) pairs for the caller to merge too.
+        # Returns None, writing nothing, if the marks file was rewritten elsewhere since this table was read.
+        if self.base is not None and self._signature() != self.base:
+            return None
+        header = None if self.valid else self._current_header()
+        if header is not None:  # Someone else started a journal for this version of the file
+            self.valid, self.offset, self._own = True, len(header), []
+        merged = []
+        while True:
+            if self.valid:
+                for line, mine in self.read_new():
+                    if mine:
+                        continue  # Already in the table
+                    try:
+                        self.apply(table, line)
+                    except ValueError:
+                        continue  # A reload would skip it too
+                    merged.append((line, False))
+            save_students(table, self.path)  # Atomic write-rename
+            if not self.valid or self._log_size() == self.offset:
+                break  # Nobody appended while the file was written
+        parent = self._journal_id() if self.valid else None  # The journal whose first offset bytes are now in the file
+        self.base = self._signature()
+        header = header_line(self.base, parent, self.offset)  # Others can tell which of their lines we took
+        with open(self.log_path, "wb") as f:
+            f.write(header)
+            f.flush()
+            os.fsync(f.fileno())
+        self.valid = True
+        self.pending = 0
+        self.offset, self._own = len(header), []
+        self._writes = []  # Everything we wrote is in the marks file now
+        return merged
+
+    def _journal_id(self):  # Id in the header of the journal on disk, or None
+        try:
+            with open(self.log_path, "rb") as f:
+                return (parse_header(f.readline()) or (None, None))[1]
+        except FileNotFoundError:
+            return None
+
+    def _log_size(self):  # Bytes in the journal on disk, 0 if there is none
+        try:
+            return os.path.getsize(self.log_path)
+        except FileNotFoundError:
+            return 0
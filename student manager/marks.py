@@ -0,0 +1,134 @@
+# STUDENT MARKS
+
+# Data utilities shared by the GUI and the table backend (no tkinter needed here)
+import os  # For file handling (checking existence, reading/writing)
+from collections import Counter  # Most common row layout
+from itertools import islice  # Reading only the start of a file
+
+# DATA FILE SETUP
+DATA_FILE = "student manager/studentMarks.txt"  # File where student records are stored
+LAYOUT_SAMPLE = 1000  # Lines read to decide how many coursework marks a file's rows have
+
+# Streaming loader
+class LoadReport:  # What happened while reading a marks file
+    def __init__(self, path=DATA_FILE):
+        self.path = path  # File that was read
+        self.declared = None  # Row count from the header line, if the file has one
+        self.loaded = 0  # Number of student rows read successfully
+        self.skipped = []  # (line number, reason, text) for every row that was dropped
+        self.cw_count = None  # Coursework marks per student: the layout most rows of the file use
+        self.mixed = 0  # Rows dropped for having a different number of coursework marks (rewriting would lose them)
+
+    def mismatch(self):  # True when the header count disagrees with what was read
+        return self.declared is not None and self.declared != self.loaded
+
+    def summary(self):  # One-line description for status bars and logs
+        text = f"Loaded {self.loaded} students"
+        if self.skipped:
+            text += f", skipped {len(self.skipped)} bad lines"
+        if self.mismatch():
+            text += f" (header says {self.declared})"
+        return text
+
+
+def parse_student(line):  # Turn one CSV line into a student dictionary, or raise ValueError
+    # code,name,coursework marks...,exam: any number of coursework marks, the exam mark always last
+    parts = [p.strip() for p in line.split(",")]  # Split by commas
+    if len(parts) < 4:  # Malformed line
+        raise ValueError(f"expected at least 4 fields, found {len(parts)}")
+    try:
+        marks = [int(p) for p in parts[2:]]  # Coursework marks then the exam mark
+    except ValueError:
+        raise ValueError("marks must be integers") from None
+    return {"code": parts[0], "name": parts[1], "cw": marks[:-1], "exam": marks[-1]}
+
+
+def common_layout(path):  # Coursework marks per row that most of the first rows of a marks file have, or None
+    counts = Counter()
+    with open(path, "r", encoding="utf-8") as f:  # Commas only, no parsing, and never the whole file
+        for ln in islice(f, LAYOUT_SAMPLE):
+            fields = ln.count(",") + 1
+            if fields >= 4:  # Blank lines, the count line and short rows say nothing about the layout
+                counts[fields - 3] += 1
+    return counts.most_common(1)[0][0] if counts else None  # A tie goes to the layout seen first
+
+
+def iter_students(path=DATA_FILE, report=None):  # Yield students one at a time while reading the file
+    if report is None:
+        report = LoadReport(path)
+    if not os.path.exists(path):  # If file doesn’t exist, there is nothing to yield
+        return
+    if report.cw_count is None:  # One odd row must not decide the layout for the whole file
+        report.cw_count = common_layout(path)  # Rows after the sample that disagree are counted as mixed
+    with open(path, "r", encoding="utf-8") as f:  # Read line by line, never the whole file
+        first = True
+        for lineno, ln in enumerate(f, 1):
+            ln = ln.strip()
+            if not ln:  # Ignore blank lines
+                continue
+            if first:  # First non-blank line may be the student count
+                first = False
+                try:
+                    report.declared = int(ln)
+                    continue
+                except ValueError:
+                    pass  # Otherwise treat it as data
+            try:
+                s = parse_student(ln)
+            except ValueError as e:
+                report.skipped.append((lineno, str(e), ln))
+                continue
+            if len(s["cw"]) != report.cw_count:  # Every row in a file has the same number of coursework marks
+                report.skipped.append((lineno, f"expected {report.cw_count} coursework marks, found {len(s['cw'])}", ln))
+                report.mixed += 1
+                continue
+            report.loaded += 1
+            yield s
+
+
+def iter_batches(path=DATA_FILE, size=10000, report=None):  # Yield lists of at most `size` students
+    batch = []
+    for s in iter_students(path, report):
+        batch.append(s)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def load_students(path=DATA_FILE, report=None):  # Function to load student data from file
+    return list(iter_students(path, report))  # List of student dictionaries
+
+
+def student_line(s):  # One student as a line of the marks file (without the newline)
+    return f"{s['code']},{s['name']},{','.join(map(str, s['cw']))},{s['exam']}"
+
+
+def save_students(students, path=DATA_FILE):  # Function to save student list to file
+    tmp = path + ".tmp"  # Write beside the real file first so a crash never leaves it half-written
+    with open(tmp, "w", encoding="utf-8") as f:  # Open temp file in write mode
+        f.write(str(len(students)) + "\n")  # First line = number of students
+        for s in students:  # Loop through each student
+            f.write(student_line(s) + "\n")  # Write line to file
+        f.flush()
+        os.fsync(f.fileno())  # Make sure the bytes are on disk before the swap
+    os.replace(tmp, path)  # Atomic rename: readers see the old file or the new one, never a mix
+
+
+def format_student_output(s, derived, scheme):  # Function to format student info for display
+    if derived is None:  # (coursework total, percentage, grade) not worked out by the caller
+        derived = sum(s["cw"]), scheme.percent(s), scheme.grade(s)
+    cw_total, percent, g = derived
+    exam = s["exam"]  # Exam mark
+    cw_max, exam_max = sum(scheme.maxima[:-1]), scheme.maxima[-1]  # Maximum marks under the grading scheme
+    overall = f"out of {scheme.max_points}" if scheme.raw else f"{scheme.name} scheme"
+    lines = [  # Build output lines
+        f"Student Name: {s['name']}",
+        f"Student Number: {s['code']}",
+        f"Total coursework mark (out of {cw_max}): {cw_total}",
+        f"Exam mark (out of {exam_max}): {exam}",
+        f"Overall percentage ({overall}): {percent}%",
+        f"Grade: {g}"
+    ]
+    return "\n".join(lines)  # Return formatted string
@@ -0,0 +1,119 @@
+# DERIVED METRICS
+
+# Per-student totals, percentages and grades worked out once, plus class aggregates kept up to date
+from array import array  # Cached total columns
+from collections import Counter  # How many students share each mark total
+from itertools import compress  # Totals of live rows only
+from operator import add  # Coursework total + exam, element by element
+from grading import STANDARD, standard_scheme  # Compiled grading schemes
+
+
+class Metrics:  # Cached per-row totals and class aggregates over a StudentTable
+    # "Totals" are the grading scheme's points totals; in the standard scheme that is simply the mark total
+    def __init__(self, table, scheme=None):
+        self.table = table  # Table whose row ids the caches follow
+        if scheme is None:
+            scheme = STANDARD if len(table.cw) == STANDARD.cw_count else standard_scheme(len(table.cw))
+        if scheme.cw_count != len(table.cw):
+            raise ValueError(f"scheme {scheme.name} expects {scheme.cw_count} coursework marks, not {len(table.cw)}")
+        self.scheme = scheme  # How totals become percentages and grades
+        self.rebuild()
+
+    def rebuild(self):  # Recompute everything (after load, sort or compact)
+        t = self.table
+        if t.cw:
+            self.cw_totals = array("i", map(sum, zip(*t.cw)))  # Coursework total per row id
+        else:
+            self.cw_totals = array("i", bytes(4 * len(t.exam)))
+        if self.scheme.points == [1] * len(self.scheme.points):  # Unweighted: coursework + exam per row id
+            self.totals = array("q", map(add, self.cw_totals, t.exam))
+        else:
+            self.totals = self.scheme.totals(t.cw, t.exam)  # Weighted points per row id, a column at a time
+        self.counts = Counter(compress(self.totals, t.alive))  # Total -> live students with it
+        self.count = sum(self.counts.values())
+        cents_for = self.scheme.cents_for
+        self.sum_cents = sum(cents_for(total) * n for total, n in self.counts.items())
+        self._bounds()
+        self.generation = t.generation
+
+    def sync(self):  # Rebuild if the table renumbered its rows
+        if self.generation != self.table.generation:
+            self.rebuild()
+            return True
+        return False
+
+    def _bounds(self):  # Lowest and highest mark totals present (few distinct totals, so this is cheap)
+        self.lo = min(self.counts) if self.counts else None
+        self.hi = max(self.counts) if self.counts else None
+
+    # Maintenance (call remove() before changing a row and add() after)
+    def add(self, i):  # Cache row i as it is now and count it in the aggregates
+        if self.sync():  # A fresh rebuild already counted the row
+            return
+        t = self.table
+        cw = [col[i] for col in t.cw]
+        cw_total = sum(cw)
+        total = self.scheme.total(cw, t.exam[i])
+        if i == len(self.totals):
+            self.cw_totals.append(cw_total)
+            self.totals.append(total)
+        else:
+            self.cw_totals[i] = cw_total
+            self.totals[i] = total
+        self.counts[total] += 1
+        self.count += 1
+        self.sum_cents += self.scheme.cents_for(total)
+        if self.hi is None or total > self.hi:
+            self.hi = total
+        if self.lo is None or total < self.lo:
+            self.lo = total
+
+    def remove(self, i):  # Take row i out of the aggregates before it changes or goes
+        self.sync()
+        total = self.totals[i]
+        self.counts[total] -= 1
+        if not self.counts[total]:
+            del self.counts[total]
+            if total in (self.lo, self.hi):
+                self._bounds()
+        self.count -= 1
+        self.sum_cents -= self.scheme.cents_for(total)
+
+    # Per-row values (O(1) lookups)
+    def total(self, i):
+        self.sync()
+        return self.totals[i]
+
+    def percent(self, i):
+        return self.scheme.percent_for(self.total(i))
+
+    def grade(self, i):
+        return self.scheme.grade_for(self.total(i))
+
+    def derived(self, i):  # (coursework total, percentage, grade) for format_student_output
+        total = self.total(i)
+        return self.cw_totals[i], self.scheme.percent_for(total), self.scheme.grade_for(total)
+
+    # Class aggregates (O(1), apart from finding which row holds the extreme)
+    def average(self):  # Mean overall percentage
+        self.sync()
+        if not self.count:
+            return 0.0
+        return round(self.sum_cents / self.count / 100, 2)
+
+    def best(self):  # Row id of the first student with the highest percentage
+        self.sync()
+        return self._first_with(self.hi)
+
+    def worst(self):  # Row id of the first student with the lowest percentage
+        self.sync()
+        return self._first_with(self.lo)
+
+    def _first_with(self, total):  # First live row (file order) with this mark total
+        if total is None:
+            return None
+        alive, i = self.table.alive, -1
+        while True:
+            i = self.totals.index(total, i + 1)  # C-speed scan
+            if alive[i]:
+                return i
@@ -0,0 +1,7 @@
+# OPTIONAL LIBRARIES
+
+# Libraries the program runs without; each name is None when its library is not installed
+try:
+    import numpy as np  # Whole-column sums for grading and class statistics
+except ImportError:
+    np = None
@@ -0,0 +1,83 @@
+# RANKING
+
+# Students kept in rank order (highest overall percentage first) without touching the stored row order
+from bisect import bisect_left, insort  # O(log n) search in the sorted key list
+from itertools import islice  # Taking the first N of an ordering
+
+
+class RankIndex:  # Sorted (-total, row id) keys, so rank 1 is the best and ties keep file order
+    def __init__(self, table, metrics):
+        self.table = table  # Table whose row ids are ranked
+        self.metrics = metrics  # Source of each row's cached mark total
+        self.rebuild()
+
+    def rebuild(self):  # Sort every live row (after load, sort or compact)
+        self.metrics.sync()  # Totals must follow the current row ids first
+        totals = self.metrics.totals
+        self.keys = sorted((-totals[i], i) for i in self.table.row_ids())
+        self.generation = self.table.generation
+
+    def _sync(self):  # Rebuild if the table renumbered its rows
+        if self.generation != self.table.generation:
+            self.rebuild()
+            return True
+        return False
+
+    def __len__(self):
+        return len(self.keys)
+
+    # Maintenance (call remove() before a row's marks change and add() after metrics.add())
+    def add(self, row):
+        if self._sync():
+            return
+        insort(self.keys, (-self.metrics.totals[row], row))
+
+    def remove(self, row):
+        self._sync()
+        key = (-self.metrics.totals[row], row)
+        k = bisect_left(self.keys, key)
+        if k < len(self.keys) and self.keys[k] == key:
+            del self.keys[k]
+
+    # Orderings (row ids)
+    def top(self, n):  # The n highest-scoring students, best first
+        self._sync()
+        return [row for _, row in self.keys[:n]]
+
+    def bottom(self, n):  # The n lowest-scoring students, worst first
+        return list(islice(self.ascending(), n))
+
+    def descending(self):  # Every student, best first (ties in file order)
+        self._sync()
+        return (row for _, row in self.keys)
+
+    def ascending(self):  # Every student, worst first (ties still in file order)
+        self._sync()
+        keys, k = self.keys, len(self.keys)
+        while k > 0:
+            j = bisect_left(keys, (keys[k - 1][0],))  # Start of this mark total's run of ties
+            yield from (row for _, row in keys[j:k])
+            k = j
+
+    def ordered(self, direction="desc"):  # List of row ids in either direction
+        return list(self.descending() if direction == "desc" else self.ascending())
+
+    # Queries about one student
+    def rank(self, row):  # 1 = best; students with equal marks share a rank
+        self._sync()
+        return bisect_left(self.keys, (-self.metrics.totals[row],)) + 1
+
+    def percentile(self, row):  # Percentage of the class this student beats (ties count half)
+        self._sync()
+        if not self.keys:
+            return 0.0
+        neg = -self.metrics.totals[row]
+        above = bisect_left(self.keys, (neg,))  # Students with a higher total
+        not_below = bisect_left(self.keys, (neg + 1,))  # ... plus those with the same total
+        below = len(self.keys) - not_below
+        return round((below + (not_below - above) / 2) / len(self.keys) * 100, 1)
+
+    def around(self, row, n):  # Up to n students either side of this one, in rank order
+        self._sync()
+        k = bisect_left(self.keys, (-self.metrics.totals[row], row))
+        return [r for _, r in self.keys[max(0, k - n):k + n + 1]]
@@ -0,0 +1,124 @@
+# RECORD VIEW
+
+# Virtualised student list: the Treeview only ever holds the rows that fit on screen
+import tkinter as tk  # Tkinter for GUI components
+from tkinter import font, ttk  # Row text size, Treeview widget
+
+ROW_HEIGHT = 20  # Smallest pixel height of one Treeview row (the ttk default at normal DPI)
+ROW_PADDING = 4  # Pixels above and below the text of a row
+WHEEL_STEP = 3  # Rows moved per mouse-wheel notch
+COLUMNS = [  # (column id, heading, width) - the same fields format_student_output prints
+    ("name", "Student Name", 200),
+    ("code", "Student Number", 120),
+    ("cw", "Coursework", 130),  # Maximum marks are added by set_scheme()
+    ("exam", "Exam", 100),
+    ("percent", "Overall %", 100),
+    ("grade", "Grade", 60),
+]
+
+
+class RecordView:  # Scrollable table that renders only the visible window of rows
+    def __init__(self, parent, values, on_open=None):
+        self.values = values  # Function: row id -> tuple of column values
+        self.on_open = on_open  # Called with a row id when a line is double-clicked
+        self.rows = []  # Row ids in display order (the whole listing, not just what is shown)
+        self.listing = None  # Name of what is listed ("all", "search", ...) so callers can reuse it
+        self.generation = None  # Table generation the row ids belong to
+        self.top = 0  # Index into self.rows of the first visible row
+        self.slots = []  # Treeview items, reused for every scroll position
+
+        # Set the row height ourselves: themes and HiDPI scaling use taller rows than the slot count would assume
+        self.row_height = max(ROW_HEIGHT, font.nametofont("TkDefaultFont").metrics("linespace") + ROW_PADDING)
+        ttk.Style(parent).configure("Treeview", rowheight=self.row_height)
+        self.frame = tk.Frame(parent)  # Frame holding the table and its scrollbar
+        self.tree = ttk.Treeview(self.frame, columns=[c[0] for c in COLUMNS], show="headings",
+                                 selectmode="browse", height=1)
+        for key, title, width in COLUMNS:
+            self.tree.heading(key, text=title)
+            self.tree.column(key, width=width, anchor="w")
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.scrollbar = tk.Scrollbar(self.frame, command=self.yview)  # Scrolls self.top, not the tree
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.tree.bind("<Configure>", self._on_resize)  # Work out how many rows fit
+        for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"):  # Windows/macOS and Linux wheels
+            self.tree.bind(seq, self._on_wheel)
+        self.tree.bind("<Double-1>", self._on_double)
+
+    def set_scheme(self, scheme):  # Show the grading scheme's maximum marks in the headings
+        self.tree.heading("cw", text=f"Coursework (/{sum(scheme.maxima[:-1])})")
+        self.tree.heading("exam", text=f"Exam (/{scheme.maxima[-1]})")
+
+    # Listing
+    def set_rows(self, rows, listing=None, generation=None):  # Replace the listing and jump to the top
+        self.rows = rows
+        self.listing = listing
+        self.generation = generation
+        self.top = 0
+        self.render()
+
+    def append_row(self, row):  # New student at the end of the listing
+        self.rows.append(row)
+        if len(self.rows) - self.top <= len(self.slots):  # Only redraw if it lands on screen
+            self.render()
+        else:
+            self._update_scrollbar()
+
+    def remove_row(self, row):  # Drop a student from the listing
+        try:
+            self.rows.remove(row)
+        except ValueError:
+            return
+        self.render()
+
+    def refresh_row(self, row):  # Redraw one student if it is on screen
+        visible = self.rows[self.top:self.top + len(self.slots)]
+        if row in visible:
+            self.tree.item(self.slots[visible.index(row)], values=self.values(row))
+
+    # Rendering
+    def render(self):  # Fill the reusable slots from self.top onwards
+        n = len(self.rows)
+        self.top = max(0, min(self.top, n - len(self.slots)))
+        for k, iid in enumerate(self.slots):
+            j = self.top + k
+            self.tree.item(iid, values=self.values(self.rows[j]) if j < n else ())
+        self._update_scrollbar()
+
+    def _update_scrollbar(self):
+        n = len(self.rows)
+        if n:
+            self.scrollbar.set(self.top / n, min(1.0, (self.top + len(self.slots)) / n))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def yview(self, *args):  # Scrollbar protocol: ("moveto", fraction) or ("scroll", n, "units"/"pages")
+        if args[0] == "moveto":
+            self.top = int(float(args[1]) * len(self.rows))
+        elif args[0] == "scroll":
+            step = int(args[1])
+            self.top += step * (len(self.slots) if args[2] == "pages" else 1)
+        self.render()
+
+    # Events
+    def _on_resize(self, event):  # Keep exactly one slot per visible line
+        page = max(1, (event.height - self.row_height) // self.row_height)  # Leave room for the heading row
+        if page == len(self.slots):
+            return
+        while len(self.slots) < page:
+            self.slots.append(self.tree.insert("", "end", values=()))
+        while len(self.slots) > page:
+            self.tree.delete(self.slots.pop())
+        self.render()
+
+    def _on_wheel(self, event):
+        up = event.num == 4 or getattr(event, "delta", 0) > 0
+        self.yview("scroll", -WHEEL_STEP if up else WHEEL_STEP, "units")
+        return "break"  # The tree has nothing of its own to scroll
+
+    def _on_double(self, event):  # Open the student under the mouse
+        iid = self.tree.identify_row(event.y)
+        if self.on_open and iid in self.slots:
+            j = self.top + self.slots.index(iid)
+            if j < len(self.rows):
+                self.on_open(self.rows[j])
@@ -0,0 +1,165 @@
+# SHARDED STORAGE
+
+# A folder of ordinary marks files (one per cohort, year or code range) used as one class list.
+# Every shard keeps the usual studentMarks.txt format, so any existing file can be dropped in as a shard.
+# Usage: python "student manager/shards.py" split SOURCE FOLDER [--width N]
+#        python "student manager/shards.py" rank FOLDER [--codes LOW-HIGH] [--top N] [--scheme NAME]
+import argparse  # Command-line options
+import heapq  # Streaming k-way merge
+import os  # Folder listing
+import sys  # Standard output and exit code
+import tempfile  # Sorted runs wait on disk, not in memory
+from itertools import islice  # First N of a merged stream
+from grading import chosen_schemes, fit_scheme  # Configurable grading schemes
+from marks import LoadReport, common_layout, iter_students, parse_student, save_students, student_line  # Data utilities
+from snapshot import load_cached  # Per-shard binary snapshots
+from table import StudentTable  # Columnar student store
+
+SHARD_WIDTH = 1000  # Student codes per code-range shard (1000-1999, 2000-2999, ...)
+OTHER = "other.txt"  # Shard for codes that are not plain numbers
+
+
+def shard_name(code, width=SHARD_WIDTH):  # File name of the code-range shard a student belongs in
+    if not code.isdigit():
+        return OTHER
+    low = int(code) // width * width
+    return f"codes_{low}-{low + width - 1}.txt"
+
+
+def shard_range(name):  # (low, high) codes held by a code-range shard, or None for a cohort file
+    stem = os.path.splitext(name)[0]
+    low, sep, high = stem.partition("_")[2].partition("-")
+    if not (stem.startswith("codes_") and sep and low.isdigit() and high.isdigit()):
+        return None
+    return int(low), int(high)
+
+
+def merge_runs(runs, key, reverse=False):  # Merge already-sorted iterables lazily; ties keep run order
+    return heapq.merge(*runs, key=key, reverse=reverse)
+
+
+class ShardSet:  # Marks files in one folder, loaded together or a few at a time
+    def __init__(self, folder, width=SHARD_WIDTH):
+        self.folder = folder  # Folder holding the shard files
+        self.width = width  # Codes per shard when splitting by code range
+
+    def names(self):  # Shard file names, in name order
+        if not os.path.isdir(self.folder):
+            return []
+        return sorted(n for n in os.listdir(self.folder)
+                      if n.endswith(".txt") and os.path.isfile(os.path.join(self.folder, n)))
+
+    def paths(self, names=None):  # Full paths of the chosen shards (all of them by default)
+        return [os.path.join(self.folder, n) for n in (self.names() if names is None else names)]
+
+    def for_codes(self, low, high):  # Shards that can hold codes in [low, high]: skips the rest unread
+        picked = []
+        for n in self.names():
+            r = shard_range(n)
+            if r is None or (r[0] <= high and low <= r[1]):  # Cohort files may hold any code
+                picked.append(n)
+        return picked
+
+    # Loading
+    def load(self, names=None, report=None):  # One StudentTable over the chosen shards, in shard order
+        tables, parts = [], []
+        for path in self.paths(names):
+            parts.append(LoadReport(path))
+            tables.append(load_cached(path, parts[-1]))  # Each shard has its own snapshot
+        if report is not None:  # Fold the per-shard reports into one
+            report.loaded += sum(p.loaded for p in parts)
+            report.mixed += sum(p.mixed for p in parts)
+            if parts and all(p.declared is not None for p in parts):
+                report.declared = sum(p.declared for p in parts)
+            for p in parts:
+                report.skipped.extend((n, f"{os.path.basename(p.path)}: {reason}", text) for n, reason, text in p.skipped)
+        return StudentTable.concat(tables)
+
+    def merged(self, key, names=None, reverse=False):  # Every student in key order, one shard in memory at a time
+        # Each shard is sorted on its own and written to a temporary run file; the merge then streams the runs,
+        # so memory holds one shard while sorting and one student per shard while merging.
+        runs = []
+        try:
+            for path in self.paths(names):
+                run = tempfile.TemporaryFile("w+", encoding="utf-8")
+                runs.append(run)
+                run.writelines(student_line(s) + "\n" for s in sorted(iter_students(path), key=key, reverse=reverse))
+                run.seek(0)
+            yield from merge_runs((map(parse_student, run) for run in runs), key, reverse)
+        finally:
+            for run in runs:
+                run.close()
+
+    def ranked(self, scheme, names=None):  # Every student, best percentage first (ties in shard/file order)
+        for path in self.paths(names):  # Percentages from one scheme only compare students with the same marks
+            found = common_layout(path)
+            if found not in (None, scheme.cw_count):
+                raise ValueError(f"{os.path.basename(path)}: expected {scheme.cw_count} coursework marks, found {found}")
+        return self.merged(lambda s: -scheme.percent(s), names)
+
+    # Writing
+    def split(self, students):  # Write students into code-range shards, replacing those files
+        groups = {}
+        for s in students:
+            groups.setdefault(shard_name(s["code"], self.width), []).append(s)
+        os.makedirs(self.folder, exist_ok=True)
+        for name, group in groups.items():
+            save_students(group, os.path.join(self.folder, name))  # Same format and atomic write as the main file
+        return sorted(groups)
+
+
+def code_range(text):  # argparse type for --codes: "LOW-HIGH" or a single code, as (low, high)
+    low, _, high = text.partition("-")
+    high = high or low
+    if not (low.isdigit() and high.isdigit()):
+        raise argparse.ArgumentTypeError(f"expected LOW-HIGH student codes, not {text!r}")
+    return int(low), int(high)
+
+
+def main(argv=None):  # Returns the process exit code
+    parser = argparse.ArgumentParser(description="Split marks files into shards, or rank students across shards.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    split = sub.add_parser("split", help="split one marks file into code-range shards")
+    split.add_argument("source")
+    split.add_argument("folder")
+    split.add_argument("--width", type=int, default=SHARD_WIDTH, help="codes per shard")
+    rank = sub.add_parser("rank", help="print students from every shard, best first")
+    rank.add_argument("folder")
+    rank.add_argument("--codes", type=code_range, help="only read shards that can hold codes LOW-HIGH")
+    rank.add_argument("--top", type=int, help="stop after this many students")
+    rank.add_argument("--scheme", help="grading scheme from schemes.json (default: the configured one)")
+    args = parser.parse_args(argv)
+
+    if args.command == "split":
+        for name in ShardSet(args.folder, args.width).split(iter_students(args.source)):
+            print(os.path.join(args.folder, name))
+        return 0
+    try:
+        schemes, name = chosen_schemes(args.scheme)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    shards = ShardSet(args.folder)
+    names = None
+    if args.codes:
+        low, high = args.codes
+        names = shards.for_codes(low, high)
+    paths = shards.paths(names)
+    layout = common_layout(paths[0]) if paths else None
+    try:
+        scheme, note = (schemes[name], None) if layout is None else fit_scheme(schemes, name, layout, bool(args.scheme))
+        students = shards.ranked(scheme, names)
+    except ValueError as e:  # The named scheme does not fit, or shards with different numbers of coursework marks
+        print(e, file=sys.stderr)
+        return 2
+    if note:
+        print(note, file=sys.stderr)
+    if args.codes:  # Cohort files in the pick may hold codes outside the range
+        students = (s for s in students if s["code"].isdigit() and low <= int(s["code"]) <= high)
+    for s in islice(students, args.top):
+        print(f"{s['code']},{s['name']},{scheme.percent(s)}")
+    return 0
+
+
+if __name__ == "__main__":  # Run program if file executed directly
+    sys.exit(main())
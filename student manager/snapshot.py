@@ -0,0 +1,196 @@
+# BINARY SNAPSHOT
+
+# Compact binary copy of the marks file that loads without parsing any text.
+# Layout: header, int32 mark columns, int64 code/name offsets, code heap, name heap, JSON load report.
+import hashlib  # Content hash of the text file
+import json  # Load report stored at the end of the snapshot
+import mmap  # Map the snapshot instead of reading it
+import os  # File stats and atomic rename
+import struct  # Fixed-width header
+import sys  # Byte order of this machine
+from array import array  # Typed columns
+from marks import DATA_FILE, LoadReport  # Shared data utilities
+from table import StudentTable  # Columnar student store
+
+MAGIC = b"SMSNAP2\x00"  # File type and format version
+HEADER = struct.Struct("<8sQq16sQIQQQ")  # magic, src size, src mtime_ns, src hash, rows, cw count, heap sizes, report size
+STAT_AT = 8  # Byte offset of the source size/mtime pair inside the header
+STAT = struct.Struct("<Qq")
+
+
+def snapshot_path(path=DATA_FILE):  # Snapshot lives next to the text file
+    return path + ".snap"
+
+
+def file_digest(path):  # BLAKE2 hash of a file, read in 1 MB chunks
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.digest()
+
+
+def _pad(n):  # Round up to a multiple of 8 so every section stays aligned
+    return (n + 7) & ~7
+
+
+def _little(arr):  # Snapshot columns are little-endian on disk
+    if sys.byteorder != "little":
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr
+
+
+def _heap(strings):  # Newline-joined UTF-8 heap plus the start offset of every string
+    data = [s.encode("utf-8") for s in strings]
+    offsets = array("q", [0])
+    pos = 0
+    for b in data:
+        pos += len(b) + 1  # +1 for the separating newline
+        offsets.append(pos)
+    return b"\n".join(data) + (b"\n" if data else b""), offsets
+
+
+class Snapshot:  # Read-only, memory-mapped view of a snapshot file
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self.mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            (magic, self.src_size, self.src_mtime, self.src_hash, self.rows, self.cw_count,
+             codes_len, names_len, report_len) = HEADER.unpack_from(self.mm, 0)
+            if magic != MAGIC:
+                raise ValueError("not a student snapshot")
+        except (ValueError, struct.error):
+            self.close()
+            raise ValueError("not a student snapshot") from None
+        pos = _pad(HEADER.size)
+        self._cols = pos  # int32 columns: cw0 .. cwN, exam
+        pos += _pad(4 * self.rows * (self.cw_count + 1))
+        self._code_offs = pos
+        pos += 8 * (self.rows + 1)
+        self._name_offs = pos
+        pos += 8 * (self.rows + 1)
+        self._codes = pos
+        self._names = pos + codes_len
+        self._report = self._names + names_len
+        self._report_len = report_len
+        if self._report + report_len > len(self.mm):
+            self.close()
+            raise ValueError("truncated student snapshot")
+
+    def close(self):
+        if getattr(self, "mm", None) is not None:
+            self.mm.close()
+            self.mm = None
+        self._file.close()
+
+    def __len__(self):
+        return self.rows
+
+    # Freshness
+    def matches(self, path):  # True if the snapshot still describes the text file at path
+        st = os.stat(path)
+        if (st.st_size, st.st_mtime_ns) == (self.src_size, self.src_mtime):
+            return True  # Cheap check: nothing touched the file
+        if st.st_size != self.src_size or file_digest(path) != self.src_hash:
+            return False
+        with open(self.path, "r+b") as f:  # Same content, new mtime: remember the new stat
+            f.seek(STAT_AT)
+            f.write(STAT.pack(st.st_size, st.st_mtime_ns))
+        return True
+
+    # Lazy row access straight from the mapping
+    def _int(self, col, i):
+        return struct.unpack_from("<i", self.mm, self._cols + 4 * (col * self.rows + i))[0]
+
+    def _string(self, offs, heap, i):
+        start, end = struct.unpack_from("<qq", self.mm, offs + 8 * i)
+        return self.mm[heap + start:heap + end - 1].decode("utf-8")
+
+    def row(self, i):  # Student dictionary for row i, reading only that row's bytes
+        return {"code": self._string(self._code_offs, self._codes, i),
+                "name": self._string(self._name_offs, self._names, i),
+                "cw": [self._int(k, i) for k in range(self.cw_count)],
+                "exam": self._int(self.cw_count, i)}
+
+    # Bulk load
+    def column(self, col):  # One mark column copied out of the mapping in a single memcpy
+        arr = array("i")
+        start = self._cols + 4 * col * self.rows
+        arr.frombytes(self.mm[start:start + 4 * self.rows])
+        if sys.byteorder != "little":
+            arr.byteswap()
+        return arr
+
+    def _strings(self, heap, end):
+        if not self.rows:
+            return []
+        return self.mm[heap:end - 1].decode("utf-8").split("\n")  # Drop the trailing newline first
+
+    def to_table(self, report=None):  # Full StudentTable built from the snapshot columns
+        if report is not None:
+            saved = json.loads(self.mm[self._report:self._report + self._report_len].decode("utf-8"))
+            report.declared = saved["declared"]
+            report.loaded = self.rows
+            report.skipped.extend(tuple(s) for s in saved["skipped"])
+            report.mixed = saved["mixed"]
+        return StudentTable.from_columns(
+            self._strings(self._codes, self._names), self._strings(self._names, self._report),
+            [self.column(k) for k in range(self.cw_count)], self.column(self.cw_count))
+
+
+def write_snapshot(table, path=DATA_FILE, report=None, expect=None):  # Snapshot the table as a copy of path
+    digest = file_digest(path)
+    st = os.stat(path)
+    if expect is not None and (st.st_size, st.st_mtime_ns) != (expect.st_size, expect.st_mtime_ns):
+        return False  # The text changed while it was being parsed: the table may not match it
+    codes, names, cw, exam = table.live_columns()
+    code_heap, code_offs = _heap(codes)
+    name_heap, name_offs = _heap(names)
+    saved = {"declared": report.declared if report is not None else len(codes),
+             "skipped": report.skipped if report is not None else [],
+             "mixed": report.mixed if report is not None else 0}
+    report_bytes = json.dumps(saved).encode("utf-8")
+    header = HEADER.pack(MAGIC, st.st_size, st.st_mtime_ns, digest, len(codes), len(cw),
+                         len(code_heap), len(name_heap), len(report_bytes))
+    tmp = snapshot_path(path) + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(header.ljust(_pad(len(header)), b"\0"))
+        for col in cw + [exam]:
+            _little(col).tofile(f)
+        f.write(b"\0" * (_pad(4 * len(codes) * (len(cw) + 1)) - 4 * len(codes) * (len(cw) + 1)))
+        _little(code_offs).tofile(f)
+        _little(name_offs).tofile(f)
+        f.write(code_heap)
+        f.write(name_heap)
+        f.write(report_bytes)
+    os.replace(tmp, snapshot_path(path))  # Readers never see a half-written snapshot
+    return True
+
+
+def load_cached(path=DATA_FILE, report=None, progress=None, save=True):  # StudentTable for path, snapshot if current
+    # save=False never writes a snapshot, for readers that must leave the folder as they found it
+    if report is None:
+        report = LoadReport(path)
+    if not os.path.exists(path):
+        return StudentTable()
+    try:
+        snap = Snapshot(snapshot_path(path))
+    except (OSError, ValueError):
+        snap = None  # Missing or unreadable snapshot: parse the text instead
+    if snap is not None:
+        try:
+            if snap.matches(path):
+                return snap.to_table(report)
+        finally:
+            snap.close()
+    before = os.stat(path)
+    table = StudentTable.load(path, report, progress)
+    if not save:
+        return table
+    try:
+        write_snapshot(table, path, report, expect=before)
+    except OSError:
+        pass  # Read-only folder: carry on without a snapshot
+    return table
@@ -0,0 +1,110 @@
+# COHORT STATISTICS
+
+# Summary statistics for the whole class, worked out in bulk from the cached points totals
+from itertools import compress  # Live rows of a column, for the sums without NumPy
+from math import sqrt  # Standard deviation and correlation
+from operator import mul  # Element-by-element products for the pure-Python sums
+from optional import np  # NumPy for the column sums, or None
+
+BAR_WIDTH = 40  # Characters in the longest histogram bar
+
+
+def _nth(values, counts, k):  # k-th smallest value (from 0) of a distribution given as (value, count) runs
+    seen = 0
+    for v, c in zip(values, counts):
+        seen += c
+        if seen > k:
+            return v
+
+
+def _quantile(values, counts, n, q):  # Linear interpolation between ranks, like numpy.percentile's default
+    pos = (n - 1) * q
+    k = int(pos)
+    lo = _nth(values, counts, k)
+    hi = _nth(values, counts, min(k + 1, n - 1))
+    return lo + (hi - lo) * (pos - k)
+
+
+def percent_stats(metrics):  # Mean, spread and quartiles of overall percentages, from the totals histogram
+    metrics.sync()
+    n = metrics.count
+    if not n:
+        return None
+    scheme = metrics.scheme
+    totals = sorted(metrics.counts)  # At most max_points + 1 distinct totals (161 in the standard scheme)
+    counts = [metrics.counts[t] for t in totals]
+    values = [scheme.percent_for(t) for t in totals]
+    mean = sum(v * c for v, c in zip(values, counts)) / n
+    var = sum((v - mean) ** 2 * c for v, c in zip(values, counts)) / n  # Population variance
+    grades = dict.fromkeys(scheme.letters, 0)  # Best grade first
+    for t, c in zip(totals, counts):
+        grades[scheme.grade_for(t)] += c
+    return {"count": n, "mean": round(mean, 2), "std": round(sqrt(var), 2),
+            "min": values[0], "max": values[-1],
+            "q1": round(_quantile(values, counts, n, 0.25), 2),
+            "median": round(_quantile(values, counts, n, 0.5), 2),
+            "q3": round(_quantile(values, counts, n, 0.75), 2),
+            "grades": grades}
+
+
+def column_stats(table, metrics):  # Per-coursework averages and the exam vs coursework correlation
+    metrics.sync()
+    n = metrics.count
+    if not n:
+        return None
+    if np is not None:
+        alive = slice(None) if len(table) == len(table.codes) else np.frombuffer(table.alive, dtype=np.bool_)
+        cw_means = [float(np.frombuffer(col, dtype=np.intc)[alive].mean()) for col in table.cw]
+        x = np.frombuffer(metrics.cw_totals, dtype=np.intc)[alive].astype(np.float64)
+        y = np.frombuffer(table.exam, dtype=np.intc)[alive].astype(np.float64)
+        exam_mean = float(y.mean())
+        x -= x.mean()
+        y -= exam_mean
+        sxy, sxx, syy = float(x @ y), float(x @ x), float(y @ y)
+    else:
+        alive = table.alive
+        cw_means = [sum(compress(col, alive)) / n for col in table.cw]
+        x = list(compress(metrics.cw_totals, alive))
+        y = list(compress(table.exam, alive))
+        sx, sy = sum(x), sum(y)
+        exam_mean = sy / n
+        sxy = sum(map(mul, x, y)) - sx * sy / n  # Centred sums from raw ones (exact: marks are integers)
+        sxx = sum(map(mul, x, x)) - sx * sx / n
+        syy = sum(map(mul, y, y)) - sy * sy / n
+    corr = sxy / sqrt(sxx * syy) if sxx > 0 and syy > 0 else None  # Undefined if either mark never varies
+    scheme = metrics.scheme
+    return {"cw_means": [round(m, 2) for m in cw_means], "exam_mean": round(exam_mean, 2),
+            "cw_labels": scheme.labels[:-1], "cw_max": scheme.maxima[:-1], "exam_max": scheme.maxima[-1],
+            "correlation": None if corr is None else round(corr, 3)}
+
+
+def cohort_stats(table, metrics):  # Everything the statistics view shows, or None for an empty class
+    summary = percent_stats(metrics)
+    if summary is None:
+        return None
+    summary.update(column_stats(table, metrics))
+    return summary
+
+
+def format_stats(stats):  # Plain-text report with a bar chart of grades
+    if stats is None:
+        return "No students loaded."
+    lines = [
+        f"Students: {stats['count']}",
+        "",
+        "Overall percentage",
+        f"  Mean: {stats['mean']}%   Standard deviation: {stats['std']}",
+        f"  Lowest: {stats['min']}%   Highest: {stats['max']}%",
+        f"  Lower quartile: {stats['q1']}%   Median: {stats['median']}%   Upper quartile: {stats['q3']}%",
+        "",
+        "Grades",
+    ]
+    top = max(stats["grades"].values()) or 1
+    for g, n in stats["grades"].items():
+        lines.append(f"  {g:<2} {'#' * round(n / top * BAR_WIDTH):<{BAR_WIDTH}}  {n} ({n / stats['count'] * 100:.1f}%)")
+    lines += ["", "Average marks"]
+    lines += [f"  {label}: {m} / {most}" for label, m, most in zip(stats["cw_labels"], stats["cw_means"], stats["cw_max"])]
+    lines.append(f"  Exam: {stats['exam_mean']} / {stats['exam_max']}")
+    corr = stats["correlation"]
+    lines += ["", f"Exam vs coursework correlation: {'n/a' if corr is None else corr}"]
+    return "\n".join(lines)
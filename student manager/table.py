@@ -0,0 +1,154 @@
+# STUDENT TABLE
+
+# Columnar store for student records: one typed array per mark column instead of one dict per student
+from array import array  # Compact typed arrays for the mark columns
+from itertools import compress  # Columns without their deleted rows
+from marks import DATA_FILE, LoadReport, iter_batches, save_students  # Shared data utilities
+
+CW_COUNT = 3  # Coursework marks per student when a file does not say (the standard scheme)
+
+
+class StudentTable:  # Array-backed replacement for the list of student dictionaries
+    def __init__(self, cw_count=CW_COUNT):
+        self.codes = []  # Student codes (strings, exactly as stored in the file)
+        self.names = []  # Student names
+        self.cw = [array("i") for _ in range(cw_count)]  # One int column per coursework mark
+        self.exam = array("i")  # Exam marks
+        self.alive = bytearray()  # 1 = live row, 0 = deleted row waiting for compact()
+        self._slot = {}  # Student code -> row id of the live row holding it
+        self._live = 0  # Number of live rows
+        self.generation = 0  # Bumped whenever row ids are renumbered (compact/sort)
+
+    # Loading and saving
+    @classmethod
+    def load(cls, path=DATA_FILE, report=None, progress=None):  # Build a table from a marks file, one batch at a time
+        if report is None:
+            report = LoadReport(path)
+        table = None
+        for batch in iter_batches(path, report=report):
+            if table is None:  # The first row says how many coursework marks this file has
+                table = cls(report.cw_count)
+            table.extend(batch)
+            if progress is not None:  # Header row count (if any) gives a rough percentage
+                total = f" of {report.declared}" if report.declared else ""
+                progress(f"Loading students... {report.loaded}{total}")
+        return cls() if table is None else table
+
+    @classmethod
+    def from_columns(cls, codes, names, cw, exam):  # Build a table straight from column data
+        table = cls(len(cw))
+        table.codes, table.names = list(codes), list(names)
+        as_array = lambda col: col if isinstance(col, array) else array("i", col)  # Keep arrays we are handed
+        table.cw, table.exam = [as_array(col) for col in cw], as_array(exam)
+        table.alive = bytearray(b"\x01") * len(table.codes)
+        for i, code in enumerate(table.codes):
+            table._slot.setdefault(code, i)
+        table._live = len(table.codes)
+        return table
+
+    @classmethod
+    def concat(cls, tables):  # One table holding the live rows of several tables, in the order given
+        width = len(tables[0].cw) if tables else CW_COUNT  # Every shard must use the same number of marks
+        codes, names, cw, exam = [], [], [array("i") for _ in range(width)], array("i")
+        for t in tables:
+            if len(t.cw) != width:
+                raise ValueError(f"expected {width} coursework marks, got {len(t.cw)}")
+            c, n, w, e = t.live_columns()
+            codes += c
+            names += n
+            for col, more in zip(cw, w):
+                col.extend(more)
+            exam.extend(e)
+        return cls.from_columns(codes, names, cw, exam)
+
+    def save(self, path=DATA_FILE):  # Write live rows back in the usual text format
+        save_students(self, path)
+
+    def extend(self, records):  # Append many student dictionaries
+        for s in records:
+            self.add(s)
+
+    # Row access
+    def __len__(self):  # Number of live students
+        return self._live
+
+    def __iter__(self):  # Yield live rows as student dictionaries, in file order
+        for i in self.row_ids():
+            yield self.row(i)
+
+    def row_ids(self):  # Row ids of live rows, in file order
+        return compress(range(len(self.alive)), self.alive)
+
+    def row(self, i):  # Student dictionary for one row (same shape load_students returns)
+        return {"code": self.codes[i], "name": self.names[i],
+                "cw": [col[i] for col in self.cw], "exam": self.exam[i]}
+
+    def find(self, code):  # Row id for a student code, or None
+        return self._slot.get(code)
+
+    # Row operations
+    def add(self, s):  # Append a student dictionary, returns its row id
+        if len(s["cw"]) != len(self.cw):  # Every column must stay the same length
+            raise ValueError(f"expected {len(self.cw)} coursework marks, got {len(s['cw'])}")
+        i = len(self.codes)
+        self.codes.append(s["code"])
+        self.names.append(s["name"])
+        for col, mark in zip(self.cw, s["cw"]):
+            col.append(mark)
+        self.exam.append(s["exam"])
+        self.alive.append(1)
+        self._slot.setdefault(s["code"], i)  # Duplicate codes keep pointing at the first row
+        self._live += 1
+        return i
+
+    def update(self, i, s):  # Overwrite row i with a student dictionary
+        if len(s["cw"]) != len(self.cw):
+            raise ValueError(f"expected {len(self.cw)} coursework marks, got {len(s['cw'])}")
+        self._unslot(i)
+        self.codes[i] = s["code"]
+        self.names[i] = s["name"]
+        for col, mark in zip(self.cw, s["cw"]):
+            col[i] = mark
+        self.exam[i] = s["exam"]
+        self._slot.setdefault(s["code"], i)
+
+    def delete(self, i):  # Mark row i as deleted (space is reclaimed by compact())
+        if not self.alive[i]:
+            return
+        self._unslot(i)
+        self.alive[i] = 0
+        self._live -= 1
+
+    def _unslot(self, i):  # Drop the code -> row mapping if it points at row i
+        if self._slot.get(self.codes[i]) == i:
+            del self._slot[self.codes[i]]
+
+    def compact(self):  # Drop deleted rows so row ids are dense again
+        if self._live != len(self.alive):
+            self._take(list(self.row_ids()))
+
+    def copy(self):  # Independent copy, safe to write out from another thread (deleted rows come along, still deleted)
+        table = StudentTable(len(self.cw))
+        table.codes, table.names = self.codes[:], self.names[:]  # Plain slices: quick enough for the Tk main thread
+        table.cw, table.exam = [col[:] for col in self.cw], self.exam[:]
+        table.alive, table._slot, table._live = self.alive[:], self._slot.copy(), self._live
+        return table
+
+    def live_columns(self):  # (codes, names, cw columns, exam) holding only live rows
+        if self._live == len(self.alive):
+            return self.codes, self.names, self.cw, self.exam
+        alive = self.alive
+        return (list(compress(self.codes, alive)), list(compress(self.names, alive)),
+                [array("i", compress(col, alive)) for col in self.cw], array("i", compress(self.exam, alive)))
+
+    def _take(self, order):  # Rebuild every column in the given row order
+        self.codes = [self.codes[i] for i in order]
+        self.names = [self.names[i] for i in order]
+        self.cw = [array("i", map(col.__getitem__, order)) for col in self.cw]
+        self.exam = array("i", map(self.exam.__getitem__, order))
+        self.alive = bytearray(b"\x01") * len(order)
+        self._slot = {}
+        for i, code in enumerate(self.codes):
+            self._slot.setdefault(code, i)
+        self._live = len(order)
+        self.generation += 1  # Row ids changed: indexes built on them must rebuild
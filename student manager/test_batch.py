@@ -0,0 +1,65 @@
+# BATCH GRADING TESTS
+
+# Headless grading must read its inputs without changing anything. Run with: python -m pytest "student manager"
+import os  # Folder listing
+import tempfile  # Scratch marks files
+import unittest
+from batch import grade_file  # Grader under test
+from grading import STANDARD, standard_scheme  # Default scheme, and one that does not fit the file
+from journal import Journal  # Edits saved by the GUI
+from marks import save_students  # Shared data utilities
+from table import StudentTable  # Columnar student store
+
+ALICE = {"code": "1001", "name": "Alice", "cw": [10, 12, 14], "exam": 70}
+BOB = {"code": "1002", "name": "Bob", "cw": [5, 6, 7], "exam": 40}
+
+
+class GradeFileTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, "marks.txt")
+        save_students([ALICE, BOB], self.path)
+        journal = Journal(self.path)
+        journal.replay(StudentTable.load(self.path))
+        journal.write([Journal.delete_line(BOB["code"])])
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def grade(self):
+        return grade_file(self.path, {STANDARD.name: STANDARD}, STANDARD.name)
+
+    def test_journalled_edits_are_graded(self):
+        result = self.grade()
+        self.assertEqual([row[0] for row in result["students"]], ["1001"])
+        self.assertEqual(result["stale"], 0)
+
+    def test_folder_is_left_alone(self):
+        before = sorted(os.listdir(self.folder.name))
+        self.grade()
+        self.assertEqual(sorted(os.listdir(self.folder.name)), before)  # No snapshot written
+
+    def test_stale_journal_is_not_moved_or_counted_as_a_bad_line(self):
+        save_students([ALICE], self.path)  # Rewritten by hand under the journal
+        before = sorted(os.listdir(self.folder.name))
+        result = self.grade()
+        self.assertEqual(sorted(os.listdir(self.folder.name)), before)
+        self.assertEqual(result["stale"], 1)
+        self.assertEqual(result["skipped"], [])
+
+    def test_named_scheme_must_fit(self):
+        schemes = {STANDARD.name: STANDARD, "four": standard_scheme(4, "four")}
+        result = grade_file(self.path, schemes, "four", named=True)
+        self.assertEqual(result["students"], [])
+        self.assertIn("expects 4 coursework marks", result["error"])
+
+    def test_default_scheme_substitution_is_reported(self):
+        schemes = {STANDARD.name: STANDARD, "four": standard_scheme(4, "four")}
+        result = grade_file(self.path, schemes, "four")
+        self.assertIsNone(result["error"])
+        self.assertIs(result["scheme"], STANDARD)
+        self.assertIn("graded with the standard scheme", result["note"])
+
+
+if __name__ == "__main__":
+    unittest.main()
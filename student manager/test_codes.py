@@ -0,0 +1,59 @@
+# STUDENT CODE TESTS
+
+# Free-code bitmap and duplicate renumbering. Run with: python -m pytest "student manager"
+import unittest
+from codes import CodeAllocator, resolve_duplicates  # Code under test
+from table import StudentTable  # Table with repeated codes
+
+
+class AllocatorTest(unittest.TestCase):
+    def test_lowest_free_code_first(self):
+        codes = CodeAllocator(["1000", "1001", "1003"], 1000, 1005)
+        self.assertEqual(codes.allocate(), "1002")
+        self.assertEqual(codes.allocate(), "1004")
+        codes.release("1001")  # Frees a code below where the search had got to
+        self.assertEqual(codes.peek(), "1001")
+        self.assertEqual(codes.free, 2)
+
+    def test_ignores_codes_outside_the_range(self):
+        codes = CodeAllocator(["999", "10000", "abc", "1000"], 1000, 1001)
+        self.assertEqual(codes.free, 1)
+        self.assertFalse(codes.in_range("abc"))
+        self.assertFalse(codes.is_free("1000"))
+        self.assertTrue(codes.is_free("1001"))
+        codes.take("1001")
+        codes.take("1001")  # Taking twice counts once
+        self.assertTrue(codes.exhausted())
+        self.assertIsNone(codes.peek())
+        with self.assertRaises(ValueError):
+            codes.allocate()
+
+    def test_copy_is_independent(self):
+        codes = CodeAllocator(["1000"], 1000, 1002)
+        other = codes.copy()
+        other.allocate()
+        self.assertEqual((codes.peek(), codes.free), ("1001", 2))
+        self.assertEqual((other.peek(), other.free), ("1002", 1))
+
+
+class DuplicateTest(unittest.TestCase):
+    def make(self, codes):
+        table = StudentTable()
+        table.extend({"code": c, "name": f"Student {k}", "cw": [1, 2, 3], "exam": 4} for k, c in enumerate(codes))
+        return table
+
+    def test_repeats_after_the_first_get_free_codes(self):
+        table = self.make(["1001", "1000", "1001", "1000"])
+        codes = CodeAllocator(table.codes, 1000, 1005)
+        self.assertEqual(resolve_duplicates(table, codes), (2, 0))
+        self.assertEqual(table.codes, ["1001", "1000", "1002", "1003"])
+        self.assertEqual(table.find("1002"), 2)
+
+    def test_full_range_leaves_duplicates(self):
+        table = self.make(["1000", "1001", "1000"])
+        self.assertEqual(resolve_duplicates(table, CodeAllocator(table.codes, 1000, 1001)), (0, 1))
+        self.assertEqual(table.codes, ["1000", "1001", "1000"])
+
+
+if __name__ == "__main__":
+    unittest.main()
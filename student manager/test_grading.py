@@ -0,0 +1,105 @@
+# GRADING SCHEME TESTS
+
+# Scheme compilation, grade bands and scheme choice. Run with: python -m pytest "student manager"
+import json  # Scratch schemes.json files
+import os  # Scratch file paths
+import tempfile  # Scratch configuration folder
+import unittest
+from array import array  # Mark columns as the table stores them
+from unittest import mock  # Pure-Python column path
+import grading  # Module under test
+from grading import STANDARD, Scheme, fit_scheme, load_schemes, scheme_from_config, standard_scheme
+
+WEIGHTED = {  # Same shape as the weighted entry in schemes.json
+    "coursework": [{"max": 10, "weight": 10}, {"max": 10, "weight": 10}, {"max": 50, "weight": 20},
+                   {"max": 20, "weight": 10}],
+    "exam": {"max": 100, "weight": 50},
+    "bands": {"A*": 85, "A": 70, "B": 60, "C": 50, "D": 40, "E": 35},
+}
+
+
+class CompileTest(unittest.TestCase):
+    def test_standard_points_are_raw_marks(self):
+        self.assertEqual(STANDARD.points, [1, 1, 1, 1])
+        self.assertTrue(STANDARD.raw)
+        self.assertEqual(STANDARD.max_points, 160)
+        self.assertEqual(STANDARD.percent({"cw": [20, 20, 20], "exam": 52}), 70.0)
+
+    def test_weights_become_smallest_whole_points(self):
+        scheme = scheme_from_config("weighted", WEIGHTED)
+        self.assertEqual(scheme.points, [10, 10, 4, 5, 5])  # 1/10 : 1/10 : 2/5 : 1/2 : 1/2 per mark, scaled
+        self.assertFalse(scheme.raw)
+        self.assertEqual(scheme.percent({"cw": [10, 10, 50, 20], "exam": 100}), 100.0)
+        self.assertEqual(scheme.percent({"cw": [5, 5, 25, 10], "exam": 50}), 50.0)
+
+    def test_bad_schemes_are_rejected(self):
+        with self.assertRaises(ValueError):
+            Scheme("x", [("Exam", 100, 1)])  # No coursework
+        with self.assertRaises(ValueError):
+            Scheme("x", [("Lab", 0, 1), ("Exam", 100, 1)])
+        with self.assertRaises(ValueError):
+            scheme_from_config("x", {"exam": {"max": 100}})  # No coursework list
+
+    def test_large_schemes_skip_the_tables(self):
+        with mock.patch.object(grading, "TABLE_LIMIT", 100):
+            scheme = standard_scheme()
+        self.assertIsNone(scheme.percents)
+        self.assertEqual(scheme.percent({"cw": [20, 20, 20], "exam": 52}), 70.0)
+        self.assertEqual(scheme.grade({"cw": [20, 20, 20], "exam": 52}), "A")
+
+
+class BandTest(unittest.TestCase):
+    def test_cutoffs_belong_to_the_band_above(self):
+        scheme = scheme_from_config("weighted", WEIGHTED)
+        cases = {0: "F", 34.99: "F", 35: "E", 39.99: "E", 40: "D", 60: "B", 84.99: "A", 85: "A*", 100: "A*"}
+        for percent, grade in cases.items():
+            self.assertEqual(scheme.grade_from_percent(percent), grade, percent)
+        self.assertEqual(scheme.letters, ["A*", "A", "B", "C", "D", "E", "F"])
+
+    def test_columns_match_single_results(self):
+        scheme = scheme_from_config("weighted", WEIGHTED)
+        rows = [([k % 11, (3 * k) % 11, k % 51, k % 21], k % 101) for k in range(300)]
+        cw = [array("i", col) for col in zip(*(r[0] for r in rows))]
+        exam = array("i", (r[1] for r in rows))
+        expected = [(scheme.percent({"cw": c, "exam": e}), scheme.grade({"cw": c, "exam": e})) for c, e in rows]
+        for np in (grading.np, None):  # With NumPy (when installed) and without
+            with mock.patch.object(grading, "np", np):
+                _, percents, grades = scheme.grade_columns(cw, exam)
+            self.assertEqual(list(zip(percents, grades)), expected)
+
+
+class ChoiceTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, "schemes.json")
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def write(self, cfg):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(cfg, f)
+
+    def test_missing_file_gives_standard(self):
+        self.assertEqual(load_schemes(self.path), ({"standard": STANDARD}, "standard"))
+
+    def test_default_must_exist(self):
+        self.write({"default": "nope", "schemes": {}})
+        with self.assertRaises(ValueError):
+            load_schemes(self.path)
+
+    def test_fit_substitutes_or_refuses(self):
+        self.write({"default": "weighted", "schemes": {"weighted": WEIGHTED}})
+        schemes, name = load_schemes(self.path)
+        self.assertEqual(fit_scheme(schemes, name, 4), (schemes["weighted"], None))
+        scheme, note = fit_scheme(schemes, name, 3)
+        self.assertIs(scheme, schemes["standard"])
+        self.assertIn("graded with the standard scheme", note)
+        scheme, _ = fit_scheme(schemes, name, 2)
+        self.assertEqual((scheme.name, scheme.cw_count), ("standard-2", 2))
+        with self.assertRaises(ValueError):
+            fit_scheme(schemes, name, 3, named=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+# EDIT HISTORY TESTS
+
+# Undo/redo steps and batched edits. Run with: python -m pytest "student manager"
+import unittest
+from history import History  # Stacks under test
+
+ALICE = {"code": "1001", "name": "Alice", "cw": [10, 12, 14], "exam": 70}
+ALICE2 = {"code": "1001", "name": "Alice", "cw": [10, 12, 14], "exam": 75}
+BOB = {"code": "1002", "name": "Bob", "cw": [5, 6, 7], "exam": 40}
+
+
+class HistoryTest(unittest.TestCase):
+    def test_undo_returns_inverse_records(self):
+        h = History()
+        h.record(("A", ALICE))
+        h.record(("U", ALICE, ALICE2))
+        self.assertEqual(h.undo(), ("Update Alice", [("U", ALICE2, ALICE)]))
+        self.assertEqual(h.undo(), ("Add Alice", [("D", ALICE)]))
+        self.assertIsNone(h.undo())
+        self.assertEqual(h.redo(), ("Add Alice", [("A", ALICE)]))
+
+    def test_batch_is_one_step_undone_newest_first(self):
+        h = History()
+        h.begin()
+        h.record(("A", ALICE))
+        h.begin("inner")  # Nested batches join the outer one
+        h.record(("D", BOB))
+        h.end()
+        h.record(("U", ALICE, ALICE2))
+        h.end()
+        self.assertEqual(len(h.undo_steps), 1)
+        self.assertEqual(h.undo(), ("3 edits", [("U", ALICE2, ALICE), ("A", BOB), ("D", ALICE)]))
+        self.assertEqual(h.redo(), ("3 edits", [("A", ALICE), ("D", BOB), ("U", ALICE, ALICE2)]))
+
+    def test_batch_labels(self):
+        h = History()
+        h.begin("Import")
+        h.record(("A", ALICE))
+        h.record(("A", BOB))
+        h.end()
+        h.begin()
+        h.record(("D", BOB))
+        h.end()
+        h.begin()  # An empty batch leaves no step
+        h.end()
+        self.assertEqual([label for label, _ in h.undo_steps], ["Import", "Delete Bob"])
+
+    def test_new_edit_clears_redo(self):
+        h = History()
+        h.record(("A", ALICE))
+        h.undo()
+        h.record(("A", BOB))
+        self.assertIsNone(h.redo())
+
+    def test_replayed_edits_are_not_logged(self):
+        h = History()
+        h.record(("A", ALICE))
+        _, ops = h.undo()
+        h.replaying = True
+        for op in ops:
+            h.record(op)  # What the GUI does while applying an undo
+        h.replaying = False
+        self.assertEqual((h.undo_steps, len(h.redo_steps)), ([], 1))
+
+    def test_limit_drops_oldest_steps(self):
+        h = History(limit=2)
+        for s in (ALICE, BOB, ALICE2):
+            h.record(("A", s))
+        self.assertEqual([ops[0][1] for _, ops in h.undo_steps], [BOB, ALICE2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+# NAME INDEX TESTS
+
+# Code, name and part-of-name lookups. Run with: python -m pytest "student manager"
+import unittest
+from indexes import StudentIndex  # Index under test
+from table import StudentTable  # Table the index follows
+
+NAMES = ["Alice Curry", "Bob Scott", "Jo", "Al", "Priya Khan", "alan smith", "Q"]
+
+
+class SearchTest(unittest.TestCase):
+    def setUp(self):
+        self.table = StudentTable()
+        self.table.extend({"code": str(1001 + k), "name": name, "cw": [1, 2, 3], "exam": 50}
+                          for k, name in enumerate(NAMES))
+        self.index = StudentIndex(self.table)
+
+    def scan(self, text):  # What a plain scan finds, to compare against
+        return [i for i in self.table.row_ids() if text.casefold() in self.table.names[i].casefold()]
+
+    def test_matches_a_scan(self):
+        for text in ["", "a", "A", "al", "q", "jo", "o", "cur", "CURRY", "n s", "zzz", "ali"]:
+            self.assertEqual(self.index.search(text), self.scan(text), text)
+
+    def test_limit_keeps_row_order(self):
+        self.assertEqual(self.index.search("a", limit=2), self.scan("a")[:2])
+
+    def test_follows_edits(self):
+        t, index = self.table, self.index
+        index.search("al")  # Build the trigram postings before editing
+        i = t.find("1001")
+        index.remove(i)
+        t.update(i, {"code": "1001", "name": "Ed", "cw": [1, 2, 3], "exam": 50})
+        index.add(i)
+        index.remove(t.find("1004"))
+        t.delete(t.find("1004"))  # Al
+        index.add(t.add({"code": "1010", "name": "Xa", "cw": [1, 2, 3], "exam": 50}))
+        for text in ["al", "ed", "e", "xa", "a", "alice"]:
+            self.assertEqual(index.search(text), self.scan(text), text)
+
+    def test_exact_lookups(self):
+        self.assertEqual(self.index.code("1002"), 1)
+        self.assertEqual(self.index.name("BOB SCOTT"), [1])
+        self.assertEqual(self.index.lookup("1005"), 4)
+        self.assertEqual(self.index.lookup("khan"), 4)
+        self.assertIsNone(self.index.lookup("nobody"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+# JOURNAL TESTS
+
+# Crash safety of the edit journal. Run with: python -m pytest "student manager"
+import os  # File times
+import tempfile  # Scratch marks files
+import unittest
+from journal import Journal  # Journal under test
+from marks import LoadReport, save_students  # Shared data utilities
+from table import StudentTable  # Columnar student store
+
+ALICE = {"code": "1001", "name": "Alice", "cw": [10, 12, 14], "exam": 70}
+BOB = {"code": "1002", "name": "Bob", "cw": [5, 6, 7], "exam": 40}
+CAROL = {"code": "1003", "name": "Carol", "cw": [20, 20, 20], "exam": 99}
+
+
+class JournalTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, "marks.txt")
+        save_students([ALICE, BOB], self.path)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def fresh(self, report=None):  # The table a new instance of the app would load
+        table = StudentTable.load(self.path)
+        Journal(self.path).replay(table, report)
+        return list(table)
+
+    def journal_with_edits(self):  # Add Carol and delete Bob through the journal
+        journal = Journal(self.path)
+        journal.replay(StudentTable.load(self.path))
+        journal.write([Journal.add_line(CAROL), Journal.delete_line(BOB["code"])])
+        return journal
+
+    def test_replay_applies_edits(self):
+        self.journal_with_edits()
+        self.assertEqual(self.fresh(), [ALICE, CAROL])
+
+    def test_touched_marks_file_keeps_edits(self):  # A new mtime with the same content is the same version
+        journal = self.journal_with_edits()
+        st = os.stat(self.path)
+        os.utime(self.path, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+        self.assertIsNone(journal.check())
+        self.assertEqual(self.fresh(), [ALICE, CAROL])
+
+    def test_torn_final_line_is_ignored(self):  # Crash in the middle of a journal write
+        self.journal_with_edits()
+        with open(self.path + ".journal", "ab") as f:
+            f.write(b"A,1004,Dan,1,2")
+        self.assertEqual(self.fresh(), [ALICE, CAROL])
+
+    def test_stale_journal_is_reported_and_kept(self):  # Marks file changed by hand under the journal
+        self.journal_with_edits()
+        save_students([ALICE], self.path)
+        report = LoadReport(self.path)
+        self.assertEqual(self.fresh(report), [ALICE])
+        self.assertEqual(len(report.skipped), 1)
+        self.assertIn("2 edits", report.skipped[0][1])
+        self.assertFalse(os.path.exists(self.path + ".journal"))
+        with open(self.path + ".journal.stale", encoding="utf-8") as f:
+            self.assertEqual(f.read().splitlines()[1:], ["A,1003,Carol,20,20,20,99", "D,1002"])
+
+    def test_compact_folds_edits_into_marks_file(self):
+        journal = self.journal_with_edits()
+        table = StudentTable.load(self.path)
+        Journal(self.path).replay(table)
+        journal.compact(table)
+        self.assertEqual(list(StudentTable.load(self.path)), [ALICE, CAROL])
+        report = LoadReport(self.path)
+        self.assertEqual(self.fresh(report), [ALICE, CAROL])
+        self.assertEqual(report.skipped, [])
+
+    def test_compact_keeps_other_instances_lines(self):  # Another copy of the app appended after we last read
+        mine, theirs = Journal(self.path), Journal(self.path)
+        table = StudentTable.load(self.path)
+        mine.replay(table)
+        theirs.replay(StudentTable.load(self.path))
+        theirs.write([Journal.add_line(CAROL)])
+        self.assertEqual(mine.compact(table), [(Journal.add_line(CAROL), False)])
+        self.assertEqual(list(StudentTable.load(self.path)), [ALICE, BOB, CAROL])
+        theirs.replay(StudentTable.load(self.path))
+        self.assertEqual(theirs.lost, set())  # Their edit is in the compacted file
+
+    def test_line_missed_by_compact_is_lost(self):  # Appended between our last read and the truncation
+        mine, theirs = Journal(self.path), Journal(self.path)
+        table = StudentTable.load(self.path)
+        mine.replay(table)
+        theirs.replay(StudentTable.load(self.path))
+        theirs.write([Journal.add_line(CAROL)])
+        size = mine._log_size
+        def late_write():
+            result = size()
+            theirs.write([Journal.delete_line(BOB["code"])])
+            return result
+        mine._log_size = late_write
+        mine.compact(table)
+        theirs.replay(StudentTable.load(self.path))
+        self.assertEqual(theirs.lost, {BOB["code"]})  # Their copy must save it again
+
+
+if __name__ == "__main__":
+    unittest.main()
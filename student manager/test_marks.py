@@ -0,0 +1,66 @@
+# MARKS FILE TESTS
+
+# Reading marks files with rows of more than one layout. Run with: python -m pytest "student manager"
+import contextlib  # Quiet command-line output
+import io  # Captured standard error
+import os  # Scratch file paths
+import tempfile  # Scratch marks files
+import unittest
+from unittest import mock  # A smaller layout sample
+import marks  # Sample size
+from marks import LoadReport, load_students  # Loader under test
+from snapshot import load_cached  # Snapshot path keeps the same report
+from transfer import main as transfer_main  # Command-line import
+
+GOOD = ["1001,Alice,10,12,14,70", "1002,Bob,5,6,7,40", "1003,Carol,20,20,20,99"]
+ODD = "1000,Odd,1,2,3,4,50"  # Four coursework marks in a three-mark file
+
+
+class MixedLayoutTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, "marks.txt")
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("\n".join(["4", ODD] + GOOD) + "\n")  # The odd row comes first
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_layout_comes_from_most_rows(self):
+        report = LoadReport(self.path)
+        students = load_students(self.path, report)
+        self.assertEqual([s["code"] for s in students], ["1001", "1002", "1003"])
+        self.assertEqual(report.cw_count, 3)
+        self.assertEqual(report.mixed, 1)
+        self.assertEqual(report.skipped, [(2, "expected 3 coursework marks, found 4", ODD)])
+
+    def test_layout_comes_from_the_start_of_the_file(self):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("\n".join(f"{2000 + k},Late,1,2,3,4,50" for k in range(5)) + "\n")  # Mostly four marks overall
+        report = LoadReport(self.path)
+        with mock.patch.object(marks, "LAYOUT_SAMPLE", 5):  # The count line, the odd row and the three good rows
+            self.assertEqual(len(load_students(self.path, report)), 3)
+        self.assertEqual(report.cw_count, 3)
+        self.assertEqual(report.mixed, 6)
+
+    def test_snapshot_remembers_mixed_rows(self):
+        load_cached(self.path, LoadReport(self.path))  # Parses the text and writes the snapshot
+        report = LoadReport(self.path)
+        self.assertEqual(len(load_cached(self.path, report)), 3)
+        self.assertEqual(report.mixed, 1)
+
+    def test_import_does_not_rewrite_mixed_file(self):
+        source = os.path.join(self.folder.name, "new.csv")
+        with open(source, "w", encoding="utf-8") as f:
+            f.write("1004,Dan,1,2,3,50\n")
+        with open(self.path, "rb") as f:
+            before = f.read()
+        with contextlib.redirect_stderr(io.StringIO()):
+            status = transfer_main(["import", source, "--into", self.path])
+        self.assertEqual(status, 2)
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), before)  # The odd row is still there
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+# RANK INDEX TESTS
+
+# Rank order, shared ranks and percentiles. Run with: python -m pytest "student manager"
+import unittest
+from metrics import Metrics  # Mark totals the ranking is keyed on
+from ranking import RankIndex  # Index under test
+from table import StudentTable  # Table being ranked
+
+EXAMS = [50, 90, 70, 90, 10]  # Same coursework for everyone, so the exam decides the order
+
+
+def student(k, exam):
+    return {"code": str(1001 + k), "name": f"Student {k}", "cw": [10, 10, 10], "exam": exam}
+
+
+class RankTest(unittest.TestCase):
+    def setUp(self):
+        self.table = StudentTable()
+        self.table.extend(student(k, exam) for k, exam in enumerate(EXAMS))
+        self.metrics = Metrics(self.table)
+        self.ranking = RankIndex(self.table, self.metrics)
+
+    def change(self, row, exam):  # Edit one student the way the GUI does
+        self.ranking.remove(row)
+        self.metrics.remove(row)
+        self.table.update(row, student(row, exam))
+        self.metrics.add(row)
+        self.ranking.add(row)
+
+    def test_orders_keep_file_order_for_ties(self):
+        self.assertEqual(self.ranking.ordered("desc"), [1, 3, 2, 0, 4])
+        self.assertEqual(self.ranking.ordered("asc"), [4, 0, 2, 1, 3])
+        self.assertEqual(self.ranking.top(2), [1, 3])
+        self.assertEqual(self.ranking.bottom(2), [4, 0])
+
+    def test_ties_share_a_rank(self):
+        self.assertEqual([self.ranking.rank(i) for i in range(5)], [4, 1, 3, 1, 5])
+
+    def test_percentiles_count_ties_half(self):
+        # Row 1 beats 3 of 5 and ties with 1: (3 + 2 / 2) / 5 = 80%
+        self.assertEqual([self.ranking.percentile(i) for i in range(5)], [30.0, 80.0, 50.0, 80.0, 10.0])
+        lone = StudentTable()
+        lone.add(student(0, 50))
+        self.assertEqual(RankIndex(lone, Metrics(lone)).percentile(0), 50.0)
+
+    def test_follows_edits(self):
+        self.change(4, 100)
+        self.assertEqual(self.ranking.ordered("desc"), [4, 1, 3, 2, 0])
+        self.assertEqual(self.ranking.percentile(4), 90.0)
+        self.ranking.remove(1)
+        self.metrics.remove(1)
+        self.table.delete(1)
+        self.assertEqual(self.ranking.ordered("desc"), [4, 3, 2, 0])
+        self.assertEqual(self.ranking.around(2, 1), [3, 2, 0])
+
+    def test_rebuilds_after_renumbering(self):
+        self.table.delete(0)
+        self.table.compact()  # Row ids shift down by one
+        self.assertEqual(self.ranking.ordered("desc"), [0, 2, 1, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
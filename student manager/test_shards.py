@@ -0,0 +1,46 @@
+# SHARDED STORAGE TESTS
+
+# Splitting a class list into shards and merging it back. Run with: python -m pytest "student manager"
+import argparse  # Usage errors from --codes
+import os  # Scratch folder paths
+import tempfile  # Scratch shard folder
+import unittest
+from grading import STANDARD  # Ranking scheme
+from shards import ShardSet, code_range  # Code under test
+
+STUDENTS = [{"code": str(code), "name": f"S{code}", "cw": [code % 20, 10, 5], "exam": code % 97}
+            for code in range(1000, 4000, 37)]
+
+
+class ShardSetTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.shards = ShardSet(os.path.join(self.folder.name, "shards"))
+        self.names = self.shards.split(STUDENTS)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_split_by_code_range(self):
+        self.assertEqual(self.names, ["codes_1000-1999.txt", "codes_2000-2999.txt", "codes_3000-3999.txt"])
+        self.assertEqual(self.shards.for_codes(2100, 2200), ["codes_2000-2999.txt"])
+
+    def test_merge_matches_one_sort(self):
+        key = lambda s: (s["exam"], s["code"])
+        self.assertEqual(list(self.shards.merged(key)), sorted(STUDENTS, key=key))
+        self.assertEqual(list(self.shards.merged(key, reverse=True)), sorted(STUDENTS, key=key, reverse=True))
+
+    def test_ranked_best_first(self):
+        percents = [STANDARD.percent(s) for s in self.shards.ranked(STANDARD)]
+        self.assertEqual(len(percents), len(STUDENTS))
+        self.assertEqual(percents, sorted(percents, reverse=True))
+
+    def test_code_range_option(self):
+        self.assertEqual(code_range("1000-1999"), (1000, 1999))
+        self.assertEqual(code_range("1234"), (1234, 1234))
+        with self.assertRaises(argparse.ArgumentTypeError):
+            code_range("abc")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+# COHORT STATISTICS TESTS
+
+# Class summary statistics against straightforward per-student sums. Run with: python -m pytest "student manager"
+import statistics  # Reference results
+import unittest
+from unittest import mock  # Pure-Python column path
+import stats  # Module under test
+from metrics import Metrics  # Cached totals the statistics read
+from stats import cohort_stats, format_stats
+from table import StudentTable  # Class being summarised
+
+
+def student(k):
+    return {"code": str(1000 + k), "name": f"Student {k}", "cw": [k % 21, (7 * k) % 21, (k * k) % 21],
+            "exam": (13 * k) % 101}
+
+
+class StatsTest(unittest.TestCase):
+    def setUp(self):
+        self.table = StudentTable()
+        self.table.extend(student(k) for k in range(60))
+        for i in (3, 10, 11):  # Deleted rows must not count
+            self.table.delete(i)
+        self.metrics = Metrics(self.table)
+        self.live = list(self.table)
+
+    def test_percentages_match_per_student_sums(self):
+        result = cohort_stats(self.table, self.metrics)
+        percents = [self.metrics.scheme.percent(s) for s in self.live]
+        q1, median, q3 = statistics.quantiles(percents, n=4, method="inclusive")
+        self.assertEqual(result["count"], 57)
+        self.assertAlmostEqual(result["mean"], statistics.fmean(percents), places=2)
+        self.assertAlmostEqual(result["std"], statistics.pstdev(percents), places=2)
+        self.assertEqual((result["min"], result["max"]), (min(percents), max(percents)))
+        for got, want in ((result["q1"], q1), (result["median"], median), (result["q3"], q3)):
+            self.assertAlmostEqual(got, want, places=2)
+        grades = [self.metrics.scheme.grade(s) for s in self.live]
+        self.assertEqual(result["grades"], {g: grades.count(g) for g in "ABCDF"})
+
+    def test_columns_with_and_without_numpy(self):
+        cw_totals = [sum(s["cw"]) for s in self.live]
+        exams = [s["exam"] for s in self.live]
+        want_means = [round(statistics.fmean(s["cw"][k] for s in self.live), 2) for k in range(3)]
+        want_corr = round(statistics.correlation(cw_totals, exams), 3)
+        for np in (stats.np, None):  # With NumPy (when installed) and without
+            with mock.patch.object(stats, "np", np):
+                result = cohort_stats(self.table, self.metrics)
+            self.assertEqual(result["cw_means"], want_means)
+            self.assertEqual(result["exam_mean"], round(statistics.fmean(exams), 2))
+            self.assertEqual(result["correlation"], want_corr)
+
+    def test_constant_marks_have_no_correlation(self):
+        table = StudentTable()
+        table.extend({"code": str(1000 + k), "name": "Same", "cw": [5, 5, 5], "exam": 10 * k} for k in range(5))
+        result = cohort_stats(table, Metrics(table))
+        self.assertIsNone(result["correlation"])
+        self.assertIn("correlation: n/a", format_stats(result))
+
+    def test_empty_class(self):
+        table = StudentTable()
+        self.assertIsNone(cohort_stats(table, Metrics(table)))
+        self.assertEqual(format_stats(None), "No students loaded.")
+
+
+if __name__ == "__main__":
+    unittest.main()
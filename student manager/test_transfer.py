@@ -0,0 +1,123 @@
+# IMPORT AND EXPORT TESTS
+
+# Command-line import into a marks file. Run with: python -m pytest "student manager"
+import contextlib  # Quiet command-line output
+import io  # Captured standard error
+import os  # Scratch file paths
+import tempfile  # Scratch marks files
+import unittest
+from unittest import mock  # Another program rewriting the marks file mid-import
+import transfer  # Module under test
+from codes import CodeAllocator  # Codes already in use
+from marks import LoadReport, load_students, save_students  # Shared data utilities
+from snapshot import load_cached  # Snapshot written after an import
+
+ALICE = {"code": "1001", "name": "Alice", "cw": [10, 12, 14], "exam": 70}
+BOB = {"code": "1002", "name": "Bob", "cw": [5, 6, 7], "exam": 40}
+
+
+class ImportTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, "marks.txt")
+        self.source = os.path.join(self.folder.name, "new.csv")
+        save_students([ALICE], self.path)
+        with open(self.source, "w", encoding="utf-8") as f:
+            f.write("1003,Carol,20,20,20,99\n")
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def run_import(self):  # (exit status, standard error)
+        err = io.StringIO()
+        with contextlib.redirect_stderr(err):
+            status = transfer.main(["import", self.source, "--into", self.path])
+        return status, err.getvalue()
+
+    def test_import_adds_students(self):
+        status, _ = self.run_import()
+        self.assertEqual(status, 0)
+        self.assertEqual([s["code"] for s in load_students(self.path)], ["1001", "1003"])
+
+    def test_rewrite_during_import_writes_nothing(self):
+        real = transfer.iter_import
+        def racing(*args, **kwargs):  # The marks file is replaced while the source is being read
+            yield from real(*args, **kwargs)
+            save_students([ALICE, BOB], self.path)
+        with mock.patch.object(transfer, "iter_import", racing):
+            status, err = self.run_import()
+        self.assertEqual(status, 2)
+        self.assertIn("nothing was imported", err)
+        self.assertEqual(load_students(self.path), [ALICE, BOB])
+        self.assertEqual(list(load_cached(self.path)), [ALICE, BOB])  # No snapshot claiming Carol is in the file
+
+
+class CheckTest(unittest.TestCase):
+    def test_names_that_would_split_the_line(self):
+        codes = CodeAllocator()
+        for name, reason in [("Smith, Jo", "a comma"), ("Jo\nSmith", "a line break"), ("Jo\rSmith", "a line break")]:
+            self.assertEqual(transfer.check_student(dict(ALICE, name=name), codes), f"name must not contain {reason}")
+        self.assertIsNone(transfer.check_student(ALICE, codes))
+
+
+class ValidationTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def rows(self, name, text, used=("1001",)):  # (accepted codes, [(line, reason)] for the rejected rows)
+        path = os.path.join(self.folder.name, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        report = LoadReport(path)
+        accepted = [s["code"] for batch in transfer.iter_import(path, CodeAllocator(used), report, size=2)
+                    for _, s in batch]
+        return accepted, [(line, reason) for line, reason, _ in report.skipped]
+
+    def test_csv_rows(self):
+        accepted, rejected = self.rows("new.csv", "\n".join([
+            "3",  # A count line like the marks file's
+            "1002,Bob,5,6,7,40",
+            "1001,Alice,10,12,14,70",  # Already in the marks file
+            "1003,Carol,21,0,0,50",  # Coursework out of 20
+            "1004,Dan,1,2,50",  # Too few fields
+            "1005,Eve,a,2,3,50",
+            "1002,Bob again,5,6,7,40",  # Repeats a code accepted above
+            "99,Fay,1,2,3,4",
+            '1006,"Gee, Ann",1,2,3,4',  # Quoted comma
+            "1007,Hal,1,2,3,4"]) + "\n")
+        self.assertEqual(accepted, ["1002", "1007"])
+        self.assertEqual([line for line, _ in rejected], [3, 4, 5, 6, 7, 8, 9])
+        self.assertEqual(rejected[0][1], "code already exists")
+        self.assertEqual(rejected[1][1], "marks out of range")
+        self.assertEqual(rejected[2][1], "expected 6 fields, found 5")
+        self.assertEqual(rejected[5][1], "code must be 1000-9999")
+        self.assertEqual(rejected[6][1], "name must not contain a comma")
+
+    def test_csv_header_picks_columns(self):
+        accepted, rejected = self.rows("new.csv", "name,exam,code,cw1,cw2,cw3\nBob,40,1002,5,6,7\nCarol,50,1003\n")
+        self.assertEqual(accepted, ["1002"])
+        self.assertEqual(rejected, [(3, "expected 6 fields, found 3")])
+
+    def test_jsonl_rows(self):
+        accepted, rejected = self.rows("new.jsonl", "\n".join([
+            '{"code": "1002", "name": "Bob", "cw": [5, 6, 7], "exam": 40}',
+            '{"code": "1003", "name": "Carol", "cw1": 1, "cw2": 2, "cw3": 3, "exam": 50}',
+            '{"code": "1004", "name": "Dan", "cw": [1, 2], "exam": 50}',
+            '{"code": "1005", "name": "Eve", "cw": [1, 2, 3]}',
+            '[1006, "Fay"]',
+            "not json"]) + "\n")
+        self.assertEqual(accepted, ["1002", "1003"])
+        self.assertEqual(rejected[:3], [(3, "expected 3 coursework marks"), (4, "missing field 'exam'"),
+                                        (5, "expected a JSON object")])
+        self.assertEqual(rejected[3][0], 6)
+
+    def test_unknown_extension(self):
+        with self.assertRaises(ValueError):
+            self.rows("new.xlsx", "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+# CACHED THUMBNAILS
+
+# Images resized once and saved as PNG beside the original, so later starts let Tk read them without PIL
+import os  # File times and folders
+import tempfile  # Fallback cache folder when the images folder is read-only
+
+CACHE_FOLDER = ".cache"  # Sub-folder of the image's folder that holds the resized copies
+
+
+def thumbnail_path(path, size):  # Where the resized copy of path lives
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(os.path.dirname(path), CACHE_FOLDER, f"{stem}_{size[0]}x{size[1]}.png")
+
+
+def _fresh(thumb, path):  # True if thumb exists and is at least as new as the original
+    try:
+        return os.path.getmtime(thumb) >= os.path.getmtime(path)
+    except OSError:
+        return False
+
+
+def cached_thumbnail(path, size):  # Path of a PNG of path resized to size; PIL is only used to (re)make it
+    thumb = thumbnail_path(path, size)
+    if _fresh(thumb, path):
+        return thumb
+    spare = os.path.join(tempfile.gettempdir(), "student-manager-" + os.path.basename(thumb))
+    if _fresh(spare, path):
+        return spare
+    from PIL import Image  # Imported here: the slow part of the first start only
+    img = Image.open(path).resize(size)
+    for target in (thumb, spare):
+        try:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            img.save(target + ".tmp", "PNG")
+            os.replace(target + ".tmp", target)  # A PNG cut short would still pass _fresh() on every later start
+            return target
+        except OSError:
+            continue  # Cannot write beside the logo: the temp copy is where the next start looks second
+    raise OSError(f"could not save a resized copy of {path}")
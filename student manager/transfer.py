@@ -0,0 +1,272 @@
+# BULK IMPORT AND EXPORT
+
+# Many students in or out at once: CSV or JSON Lines in; CSV, JSON Lines or a columnar file out.
+# Imported rows are checked with the same rules as the Add Student dialog, and rejected rows are reported.
+# Usage: python "student manager/transfer.py" import SOURCE [--into MARKS_FILE] [--rejects FILE]
+#        python "student manager/transfer.py" export OUTPUT [--from MARKS_FILE]
+import argparse  # Command-line options
+import csv  # CSV import, export and reject reports
+import json  # JSON Lines and columnar JSON
+import os  # File extensions
+import sys  # Standard streams and exit code
+from codes import CODE_MAX, CODE_MIN, CodeAllocator  # Student code range and free codes
+from grading import STANDARD, chosen_schemes, fit_scheme  # Mark limits, percentages and grades
+from journal import Journal  # Pending edits to fold in before a command-line import
+from marks import DATA_FILE, LoadReport  # Shared data utilities
+from snapshot import load_cached, write_snapshot  # Binary snapshot loading
+from table import StudentTable  # Columnar student store
+
+try:
+    import pyarrow as pa  # Optional: real Parquet files when pyarrow is installed
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None  # Columnar JSON still works without it
+
+BATCH_SIZE = 1000  # Students handed back per batch while importing
+
+
+def fields(cw_count):  # Columns an import needs, in marks-file order
+    return ["code", "name"] + [f"cw{k}" for k in range(1, cw_count + 1)] + ["exam"]
+
+
+# Reading
+def _int(value):  # Whole-number mark from a CSV cell or JSON value, or raise ValueError
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise ValueError("marks must be integers")
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError("marks must be integers") from None
+
+
+def _student(values):  # Student dictionary from the fields() values in order
+    code, name, *marks = values
+    marks = [_int(m) for m in marks]
+    return {"code": str(code).strip(), "name": str(name).strip(), "cw": marks[:-1], "exam": marks[-1]}
+
+
+def _csv_rows(path, cw_count):  # (line number, student or error, text) for each CSV row
+    need = fields(cw_count)  # Column names, or the layout of a headerless row
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        columns = None  # Field positions from a header row, if the file has one
+        first = True
+        for row in reader:
+            lineno, text = reader.line_num, ",".join(row)
+            if not any(x.strip() for x in row):  # Ignore blank lines
+                continue
+            if first:  # First row may be column names, or a marks file's student count
+                first = False
+                names = [x.strip().lower() for x in row]
+                if "code" in names:
+                    missing = [n for n in need if n not in names]
+                    if missing:
+                        raise ValueError(f"{path}: header is missing {', '.join(missing)}")
+                    columns = [names.index(n) for n in need]
+                    continue
+                if len(row) == 1 and row[0].strip().isdigit():
+                    continue
+            try:
+                if columns is not None:
+                    if len(row) <= max(columns):
+                        raise ValueError(f"expected {max(columns) + 1} fields, found {len(row)}")
+                    values = [row[k] for k in columns]
+                elif len(row) != len(need):  # Same layout as the marks file
+                    raise ValueError(f"expected {len(need)} fields, found {len(row)}")
+                else:
+                    values = row
+                yield lineno, _student(values), text
+            except ValueError as e:
+                yield lineno, e, text
+
+
+def _jsonl_rows(path, cw_count):  # (line number, student or error, text) for each JSON Lines object
+    with open(path, encoding="utf-8-sig") as f:
+        for lineno, ln in enumerate(f, 1):
+            text = ln.strip()
+            if not text:
+                continue
+            try:
+                obj = json.loads(text)
+                if not isinstance(obj, dict):
+                    raise ValueError("expected a JSON object")
+                cw = obj["cw"] if "cw" in obj else [obj[f"cw{k}"] for k in range(1, cw_count + 1)]
+                if not isinstance(cw, list) or len(cw) != cw_count:
+                    raise ValueError(f"expected {cw_count} coursework marks")
+                yield lineno, _student([obj["code"], obj["name"], *cw, obj["exam"]]), text
+            except KeyError as e:
+                yield lineno, ValueError(f"missing field {e}"), text
+            except ValueError as e:  # json.JSONDecodeError is a ValueError too
+                yield lineno, e, text
+
+
+READERS = {".csv": _csv_rows, ".txt": _csv_rows, ".jsonl": _jsonl_rows, ".ndjson": _jsonl_rows}
+
+
+def check_student(s, codes, scheme=STANDARD):  # Why AddDialog would refuse this student, or None if it is fine
+    if not codes.in_range(s["code"]):
+        return f"code must be {CODE_MIN}-{CODE_MAX}"
+    problem = scheme.check(s)  # Number of marks and each mark's range
+    if problem:
+        return problem
+    for ch, what in ((",", "a comma"), ("\n", "a line break"), ("\r", "a line break")):
+        if ch in s["name"]:  # Would split the line in the marks file
+            return f"name must not contain {what}"
+    if not codes.is_free(s["code"]):
+        return "code already exists"
+    return None
+
+
+def iter_import(path, codes, report=None, size=BATCH_SIZE, scheme=STANDARD):  # Yield lists of (line, student) that pass
+    # codes holds the codes already in use; accepted codes are taken from it so repeats in the file are caught.
+    # Rejected rows go into report.skipped as (line number, reason, text).
+    reader = READERS.get(os.path.splitext(path)[1].lower())
+    if reader is None:
+        raise ValueError(f"{path}: import reads {', '.join(sorted(READERS))} files")
+    if report is None:
+        report = LoadReport(path)
+    batch = []
+    for lineno, s, text in reader(path, scheme.cw_count):
+        problem = str(s) if isinstance(s, ValueError) else check_student(s, codes, scheme)
+        if problem:
+            report.skipped.append((lineno, problem, text))
+            continue
+        codes.take(s["code"])
+        report.loaded += 1
+        batch.append((lineno, s))
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def write_rejects(skipped, path):  # CSV of rejected rows: line, reason, original text
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["line", "reason", "text"])
+        writer.writerows(skipped)
+
+
+# Writing
+def columns(table, scheme=STANDARD):  # {field: values} for the live rows, percentage and grade graded in bulk
+    codes, names, cw, exam = table.live_columns()
+    cols = {"code": list(codes), "name": list(names)}
+    for k, col in enumerate(cw, 1):
+        cols[f"cw{k}"] = col.tolist()
+    cols["exam"] = exam.tolist()
+    _, cols["percent"], cols["grade"] = scheme.grade_columns(cw, exam)
+    return cols
+
+
+def export_csv(cols, path):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(cols)
+        writer.writerows(zip(*cols.values()))
+
+
+def export_jsonl(cols, path):  # One object per student, the same shape import reads back
+    with open(path, "w", encoding="utf-8") as f:
+        for values in zip(*cols.values()):
+            f.write(json.dumps(dict(zip(cols, values))) + "\n")
+
+
+def export_columns(cols, path):  # Columnar JSON: one array per field, loads straight into a data frame
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"rows": len(cols["code"]), "columns": cols}, f)
+        f.write("\n")
+
+
+def export_parquet(cols, path):
+    if pa is None:
+        raise ValueError("Parquet export needs the pyarrow package (save as .json for a columnar file without it)")
+    pq.write_table(pa.table(cols), path)
+
+
+EXPORTERS = {".csv": export_csv, ".jsonl": export_jsonl, ".json": export_columns, ".parquet": export_parquet}
+
+
+def export_table(table, path, scheme=STANDARD):  # Write the live rows in the format the file extension names
+    exporter = EXPORTERS.get(os.path.splitext(path)[1].lower())
+    if exporter is None:
+        raise ValueError(f"{path}: export writes {', '.join(sorted(EXPORTERS))} files")
+    exporter(columns(table, scheme), path)
+    return len(table)
+
+
+def main(argv=None):  # Returns the process exit code (1 if any row was rejected)
+    parser = argparse.ArgumentParser(description="Import or export student records in bulk.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    imp = sub.add_parser("import", help="add the students in a CSV or JSON Lines file to the marks file")
+    imp.add_argument("source")
+    imp.add_argument("--into", default=DATA_FILE, help="marks file to add to")
+    imp.add_argument("--rejects", help="save rejected rows to this CSV file")
+    exp = sub.add_parser("export", help="write every student to a .csv, .jsonl, .json (columnar) or .parquet file")
+    exp.add_argument("output")
+    exp.add_argument("--from", dest="source", default=DATA_FILE, help="marks file to export")
+    for p in (imp, exp):
+        p.add_argument("--scheme", help="grading scheme from schemes.json (default: the configured one)")
+    args = parser.parse_args(argv)
+
+    try:
+        schemes, name = chosen_schemes(args.scheme)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    if args.command == "export":
+        table = load_cached(args.source)
+        Journal(args.source).replay(table)  # Include edits not yet folded into the file
+        try:
+            scheme, note = fit_scheme(schemes, name, len(table.cw), bool(args.scheme))
+            if note:
+                print(note, file=sys.stderr)
+            print(f"Exported {export_table(table, args.output, scheme)} students to {args.output}", file=sys.stderr)
+        except ValueError as e:  # Scheme does not fit, unknown extension, or Parquet without pyarrow
+            print(e, file=sys.stderr)
+            return 2
+        return 0
+
+    loaded = LoadReport(args.into)
+    table = load_cached(args.into, loaded)
+    if loaded.mixed:  # Rewriting the file from this table would delete those rows
+        print(f"{args.into}: {loaded.mixed} lines have a different number of coursework marks; "
+              "fix them before importing", file=sys.stderr)
+        return 2
+    journal = Journal(args.into)
+    journal.replay(table)
+    codes = CodeAllocator(table.codes[i] for i in table.row_ids())
+    scheme = schemes[name]  # An empty file takes the chosen scheme's layout
+    if len(table):
+        try:
+            scheme, note = fit_scheme(schemes, name, len(table.cw), bool(args.scheme))
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 2
+        if note:
+            print(note, file=sys.stderr)
+    if not len(table) and len(table.cw) != scheme.cw_count:  # Empty file: take the scheme's layout
+        table = StudentTable(scheme.cw_count)
+    report = LoadReport(args.source)
+    try:
+        for batch in iter_import(args.source, codes, report, scheme=scheme):
+            table.extend(s for _, s in batch)
+    except (OSError, ValueError) as e:  # Missing file, unknown extension or a bad header: nothing is written
+        print(e, file=sys.stderr)
+        return 2
+    if report.loaded:
+        if journal.compact(table) is None:  # One rewrite of the marks file for the whole import
+            print(f"{args.into} was rewritten by another program during the import; nothing was imported, "
+                  "run it again", file=sys.stderr)
+            return 2
+        write_snapshot(table, args.into)  # Only once the file holds exactly these rows
+    print(f"Imported {report.loaded} students, rejected {len(report.skipped)}", file=sys.stderr)
+    for lineno, reason, text in report.skipped[:20]:
+        print(f"  line {lineno}: {reason}: {text}", file=sys.stderr)
+    if args.rejects:
+        write_rejects(report.skipped, args.rejects)
+    return 1 if report.skipped else 0
+
+
+if __name__ == "__main__":  # Run program if file executed directly
+    sys.exit(main())
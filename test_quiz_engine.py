@@ -0,0 +1,119 @@
+# QUIZ ENGINE TESTS
+
+# Question rounds and the question timer, without opening a window. Run with: python -m pytest test_quiz_engine.py
+import ast  # Reading a question back as an expression
+import operator  # Python's own arithmetic, to check the engine's
+import random  # Seeded question sources
+import unittest
+from unittest import mock  # Fake clock
+import quiz_engine  # Module under test
+from quiz_engine import DIFFICULTY, POWERS, QuestionTimer, make_round
+
+BINOPS = {ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul, ast.Pow: operator.pow}
+
+
+def value(node):  # Value of a parsed question, refusing any division that is not whole
+    if isinstance(node, ast.Constant):
+        return node.value
+    a, b = value(node.left), value(node.right)
+    if isinstance(node.op, ast.Div):
+        assert a % b == 0, f"{a} / {b} is not whole"
+        return a // b
+    return BINOPS[type(node.op)](a, b)
+
+
+def work_out(text):  # Answer to a question's text, the ordinary way
+    expr = text.removesuffix(" = ?").replace("×", "*").replace("÷", "/")
+    for digit, shown in POWERS.items():
+        expr = expr.replace(shown, f"**{digit}")
+    return value(ast.parse(expr, mode="eval").body)
+
+
+class RoundTest(unittest.TestCase):
+    def test_answers_are_whole_and_correct(self):
+        rng = random.Random(1)
+        for level in DIFFICULTY:
+            for _ in range(20):
+                for text, answer in make_round(level, rng):
+                    self.assertIsInstance(answer, int)
+                    self.assertEqual(work_out(text), answer, text)
+
+    def test_rounds_have_no_repeats(self):
+        rng = random.Random(2)
+        for level in DIFFICULTY:
+            questions = [text for text, _ in make_round(level, rng)]
+            self.assertEqual(len(questions), 10)
+            self.assertEqual(len(set(questions)), 10)
+
+    def test_small_profile_gives_a_short_round(self):
+        with mock.patch.dict(DIFFICULTY, {"Tiny": {"ops": {"+": (1, 2)}, "steps": 1, "time": 5}}):
+            questions = make_round("Tiny", random.Random(3))
+        self.assertEqual(sorted(text for text, _ in questions), ["1 + 1 = ?", "1 + 2 = ?", "2 + 2 = ?"])
+
+    def test_same_seed_same_round(self):
+        self.assertEqual(make_round("Advanced", random.Random(5)), make_round("Advanced", random.Random(5)))
+
+
+class FakeWindow:  # Records after() calls instead of running an event loop
+    def __init__(self):
+        self.calls = {}  # after id -> (delay in ms, callback)
+        self.count = 0
+
+    def after(self, ms, fn):
+        self.count += 1
+        self.calls[self.count] = (ms, fn)
+        return self.count
+
+    def after_cancel(self, after_id):
+        del self.calls[after_id]
+
+    def run_next(self):  # Run the one pending callback
+        (after_id, (_, fn)), = self.calls.items()
+        del self.calls[after_id]
+        fn()
+
+
+class TimerTest(unittest.TestCase):
+    def setUp(self):
+        self.now = 100.0
+        patcher = mock.patch.object(quiz_engine.time, "monotonic", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.window = FakeWindow()
+        self.ticks, self.expired = [], []
+        self.timer = QuestionTimer(self.window, self.ticks.append, lambda: self.expired.append(self.now))
+
+    def test_counts_down_once_per_second(self):
+        self.timer.start(3)
+        self.assertEqual(self.ticks, [3])
+        self.assertEqual(self.window.calls[1][0], 1001)  # Wakes just after 2 seconds are left
+        self.now += 1.001
+        self.window.run_next()
+        self.now += 2
+        self.window.run_next()
+        self.assertEqual(self.ticks, [3, 2, 0])  # A late tick skips straight to what the clock says
+        self.assertEqual(self.expired, [103.001])
+        self.assertEqual(self.window.calls, {})
+
+    def test_pause_does_not_count(self):
+        self.timer.start(10)
+        self.now += 4
+        self.timer.pause()
+        self.assertEqual(self.window.calls, {})  # Nothing scheduled while paused
+        self.now += 60
+        self.timer.resume()
+        self.assertEqual(self.ticks, [10, 6])
+        self.now += 1
+        self.assertAlmostEqual(self.timer.stop(), 5.0)
+        self.assertIsNone(self.timer.deadline)
+        self.assertEqual(self.window.calls, {})
+
+    def test_restart_cancels_the_old_countdown(self):
+        self.timer.start(5)
+        self.timer.start(7)
+        self.assertEqual(len(self.window.calls), 1)
+        self.assertEqual(self.ticks, [5, 7])
+
+
+if __name__ == "__main__":
+    unittest.main()